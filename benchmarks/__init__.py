@@ -0,0 +1,8 @@
+import sys, os
+
+PROJECT_PATH = os.getcwd()
+SOURCE_PATH = os.path.join(
+    PROJECT_PATH,"src"
+)
+
+sys.path.append(SOURCE_PATH)
\ No newline at end of file
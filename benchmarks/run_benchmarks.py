@@ -0,0 +1,269 @@
+"""Benchmarks das funções do src com tabelas de atletas sintéticas em várias escalas.
+
+Cada caso mede o tempo (o melhor de algumas repetições) e o pico de memória alocada (tracemalloc) de uma
+função pública do src, com tabelas de BASE_ROWS vezes cada escala. Os resultados podem ser gravados como
+baseline e comparados com ela nas execuções seguintes: um caso mais lento que o baseline além da tolerância
+é reportado como regressão (código de saída 1).
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.run_benchmarks --scales 10 100 1000
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --cases predict_missing statistics_by_age
+"""
+import os
+import sys
+import json
+import time
+import doctest
+import argparse
+import tempfile
+import tracemalloc
+import matplotlib
+import pandas as pd
+from dataclasses import dataclass
+from contextlib import contextmanager
+
+matplotlib.use('Agg')
+
+from benchmarks.synthetic_athletes import synthetic_athletes, write_synthetic_data
+from data_cleaner import medals_to_int, convert_athletes_df_to_paralympics_format, aggregate_medals_by_event_team
+from data_predictor import predict_missing
+from womens_participation import create_dataframes
+from age_analysis import statistics_by_age, highest_age_aplitude_sports, create_boxplot_top_3_esportes_outliers
+from group_statistics import grouped_statistics
+from quantile_sketch import sketch_frame
+from coeficient_functions import r2, r2_matrix, r2_by_group, corr, corr_matrix, categorical_association
+from density import density_grid
+from attributes_report import attributes_report
+
+BASE_ROWS = 1000
+DEFAULT_SCALES = (10, 100)
+DEFAULT_BASELINE = os.path.join('benchmarks', 'baseline.json')
+RESULT_COLUMNS = ['case', 'rows', 'seconds', 'peak_mb', 'baseline_seconds', 'ratio', 'status']
+
+
+@dataclass
+class BenchmarkCase:
+    """Caso de benchmark: uma função do src e a preparação dos seus argumentos.
+
+    Args:
+        name (str): Nome do caso.
+        function (callable): Função medida.
+        setup (callable): Recebe os dados da escala (dicionário) e retorna a tupla (args, kwargs) de uma chamada.
+            É executada antes de cada repetição, fora da medição (ex.: cópias de DataFrames alterados pela função).
+        in_data_directory (bool, optional): Se True, a função roda no diretório com os CSVs sintéticos
+            (funções que leem data/*.csv). Defaults to False.
+    """
+    name: str
+    function: callable
+    setup: callable
+    in_data_directory: bool = False
+
+
+def _complete(data: dict) -> pd.DataFrame:
+    return data['clean'].dropna(subset=['Age', 'Height', 'Weight'])
+
+
+CASES = [
+    BenchmarkCase('medals_to_int', medals_to_int, lambda data: ((data['athletes'],), {})),
+    BenchmarkCase('convert_athletes_df_to_paralympics_format', convert_athletes_df_to_paralympics_format, lambda data: ((data['athletes'],), {})),
+    BenchmarkCase('aggregate_medals_by_event_team', aggregate_medals_by_event_team, lambda data: ((data['athletes'],), {})),
+    BenchmarkCase('predict_missing', predict_missing, lambda data: ((data['clean'].copy(),), {})),
+    BenchmarkCase('create_dataframes', create_dataframes, lambda data: ((), {}), in_data_directory=True),
+    BenchmarkCase('statistics_by_age', statistics_by_age, lambda data: ((data['clean'],), {})),
+    BenchmarkCase('highest_age_aplitude_sports', highest_age_aplitude_sports, lambda data: ((data['clean'],), {})),
+    BenchmarkCase('grouped_statistics', grouped_statistics, lambda data: ((data['clean'], ['Sport', 'Sex', 'Year'], 'Age'), {})),
+    BenchmarkCase('sketch_frame', sketch_frame, lambda data: ((data['clean'],), {'seed': 0})),
+    BenchmarkCase('r2', r2, lambda data: ((_complete(data), 'Sport', 'Height'), {})),
+    BenchmarkCase('r2_matrix', r2_matrix, lambda data: ((data['clean'], ['Sport', 'Sex', 'NOC'], ['Age', 'Height', 'Weight']), {})),
+    BenchmarkCase('r2_by_group', r2_by_group, lambda data: ((data['clean'], 'NOC', 'Sport', ['Age', 'Height', 'Weight']), {})),
+    BenchmarkCase('corr', corr, lambda data: ((_complete(data), 'Year', 'Height'), {})),
+    BenchmarkCase('corr_matrix', corr_matrix, lambda data: ((data['clean'], ['Year', 'Age', 'Height', 'Weight']), {})),
+    BenchmarkCase('categorical_association', categorical_association, lambda data: ((data['athletes'], ['Sex', 'Team', 'NOC', 'Games', 'Season', 'City', 'Sport', 'Event', 'Medal']), {})),
+    BenchmarkCase('attributes_report', attributes_report, lambda data: ((data['clean'],), {})),
+    BenchmarkCase('density_grid', density_grid, lambda data: ((data['clean'], 'Year', 'Height'), {})),
+    BenchmarkCase('create_boxplot_top_3_esportes_outliers', create_boxplot_top_3_esportes_outliers, lambda data: ((data['clean'],), {})),
+]
+
+
+def scale_data(rows: int, directory: str, seed: int = 0) -> dict:
+    """Gera os dados sintéticos de uma escala: a tabela bruta, a tabela com medalhas inteiras e os CSVs.
+
+    Args:
+        rows (int): Quantidade de linhas da tabela de atletas.
+        directory (str): Diretório onde os CSVs são gravados (em directory/data).
+        seed (int, optional): Semente do gerador. Defaults to 0.
+
+    Returns:
+        dict: Dados com as chaves 'athletes', 'clean' e 'directory'.
+    """
+    athletes = synthetic_athletes(rows, seed)
+    write_synthetic_data(directory, rows, seed)
+    return {'athletes': athletes, 'clean': medals_to_int(athletes), 'directory': directory}
+
+
+@contextmanager
+def _working_directory(directory: str):
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _call(case: BenchmarkCase, data: dict) -> float:
+    args, kwargs = case.setup(data)
+    directory = data['directory'] if case.in_data_directory else os.getcwd()
+    with _working_directory(directory):
+        start = time.perf_counter()
+        case.function(*args, **kwargs)
+        return time.perf_counter() - start
+
+
+def measure(case: BenchmarkCase, data: dict, repeat: int = 3, memory: bool = True) -> dict:
+    """Mede o tempo e o pico de memória de um caso.
+
+    O tempo é o menor de `repeat` execuções (execuções de mais de 5s não são repetidas). A memória é medida
+    em uma execução separada, porque o tracemalloc deixa o código mais lento.
+
+    Args:
+        case (BenchmarkCase): Caso medido.
+        data (dict): Dados da escala, gerados por scale_data.
+        repeat (int, optional): Quantidade de repetições. Defaults to 3.
+        memory (bool, optional): Se True, mede o pico de memória alocada. Defaults to True.
+
+    Returns:
+        dict: 'seconds' e 'peak_mb' (None sem a medição de memória).
+    """
+    timings = [_call(case, data)]
+    while len(timings) < repeat and sum(timings) < 5:
+        timings.append(_call(case, data))
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            _call(case, data)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_mb': peak_mb}
+
+
+def compare_with_baseline(results: pd.DataFrame, baseline: dict, tolerance: float = 1.5, min_seconds: float = 0.05) -> pd.DataFrame:
+    """Compara os tempos com o baseline e marca as regressões.
+
+    Um caso é regressão quando fica mais de `tolerance` vezes mais lento que o baseline e a diferença passa
+    de `min_seconds` (para ignorar o ruído dos casos muito rápidos).
+
+    Args:
+        results (pd.DataFrame): Resultados com as colunas 'case', 'rows' e 'seconds'.
+        baseline (dict): Baseline no formato de to_baseline.
+        tolerance (float, optional): Razão máxima entre o tempo e o baseline. Defaults to 1.5.
+        min_seconds (float, optional): Diferença mínima, em segundos, para uma regressão. Defaults to 0.05.
+
+    Returns:
+        pd.DataFrame: Resultados com as colunas RESULT_COLUMNS; status 'ok', 'regression', 'faster' ou 'new'.
+
+    Example:
+    ----------
+    >>> results = pd.DataFrame({'case': ['r2', 'corr', 'r2'], 'rows': [1000, 1000, 10000], 'seconds': [0.5, 0.05, 0.4], 'peak_mb': [1.0, 1.0, 2.0]})
+    >>> baseline = {'r2@1000': {'seconds': 0.2}, 'corr@1000': {'seconds': 0.2}}
+    >>> compare_with_baseline(results, baseline)['status'].tolist()
+    ['regression', 'faster', 'new']
+    """
+    results = results.copy()
+    keys = results['case'] + '@' + results['rows'].astype(str)
+    results['baseline_seconds'] = [baseline.get(key, {}).get('seconds') for key in keys]
+    results['baseline_seconds'] = results['baseline_seconds'].astype(float)
+    results['ratio'] = results['seconds'] / results['baseline_seconds']
+
+    difference = results['seconds'] - results['baseline_seconds']
+    results['status'] = 'ok'
+    results.loc[(results['ratio'] > tolerance) & (difference > min_seconds), 'status'] = 'regression'
+    results.loc[(results['ratio'] < 1 / tolerance) & (-difference > min_seconds), 'status'] = 'faster'
+    results.loc[results['baseline_seconds'].isna(), 'status'] = 'new'
+    return results[RESULT_COLUMNS]
+
+
+def to_baseline(results: pd.DataFrame) -> dict:
+    """Converte os resultados no formato do baseline: {'<caso>@<linhas>': {'seconds': ..., 'peak_mb': ...}}.
+
+    Args:
+        results (pd.DataFrame): Resultados com as colunas 'case', 'rows', 'seconds' e 'peak_mb'.
+
+    Returns:
+        dict: Baseline.
+
+    Example:
+    ----------
+    >>> to_baseline(pd.DataFrame({'case': ['r2'], 'rows': [1000], 'seconds': [0.5], 'peak_mb': [None]}))
+    {'r2@1000': {'seconds': 0.5, 'peak_mb': None}}
+    """
+    return {f'{row.case}@{row.rows}': {'seconds': row.seconds, 'peak_mb': None if pd.isna(row.peak_mb) else row.peak_mb}
+            for row in results.itertuples()}
+
+
+def run_benchmarks(cases: list, scales: tuple = DEFAULT_SCALES, repeat: int = 3, memory: bool = True, seed: int = 0) -> pd.DataFrame:
+    """Executa os casos em todas as escalas.
+
+    Args:
+        cases (list): Lista de BenchmarkCase.
+        scales (tuple, optional): Multiplicadores de BASE_ROWS. Defaults to DEFAULT_SCALES.
+        repeat (int, optional): Repetições de cada medição. Defaults to 3.
+        memory (bool, optional): Se True, mede o pico de memória. Defaults to True.
+        seed (int, optional): Semente dos dados sintéticos. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Uma linha por caso e escala, com as colunas 'case', 'rows', 'seconds' e 'peak_mb'.
+    """
+    rows = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            data = scale_data(BASE_ROWS * scale, directory, seed)
+            for case in cases:
+                measurement = measure(case, data, repeat, memory)
+                rows.append({'case': case.name, 'rows': BASE_ROWS * scale, **measurement})
+                print(f"{case.name:<42} {BASE_ROWS * scale:>9} rows {measurement['seconds']:>9.4f}s", file=sys.stderr)
+    return pd.DataFrame(rows, columns=['case', 'rows', 'seconds', 'peak_mb'])
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks das funções do src com dados sintéticos.')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES), help=f'Multiplicadores de {BASE_ROWS} linhas.')
+    parser.add_argument('--cases', nargs='+', help='Casos executados (padrão: todos).')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='Não mede o pico de memória.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Grava os resultados como o novo baseline.')
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--output', help='Arquivo JSON com os resultados.')
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.cases is None or case.name in args.cases]
+    results = run_benchmarks(cases, tuple(args.scales), args.repeat, not args.no_memory)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+    report = compare_with_baseline(results, baseline, args.tolerance)
+    print(report.to_string(index=False, float_format=lambda value: f'{value:.4f}'))
+
+    if args.output:
+        report.to_json(args.output, orient='records', indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump({**baseline, **to_baseline(results)}, file, indent=1, sort_keys=True)
+
+    regressions = report[report['status'] == 'regression']
+    if len(regressions):
+        print(f'{len(regressions)} regression(s): ' + ', '.join(regressions['case'] + '@' + regressions['rows'].astype(str)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Módulo com o gerador de dados sintéticos para os benchmarks.
+
+Gera tabelas com o mesmo esquema do athlete_events.csv (e das tabelas das paralimpíadas) e distribuições
+parecidas com as do dataset original: proporção de NaN em Age/Height/Weight, mistura de esportes, estações
+e sexos, esparsidade das medalhas e concentração dos atletas nos maiores NOCs. A geração é vetorizada e
+determinística (semente fixa), para que os tempos sejam comparáveis entre execuções.
+"""
+import os
+import doctest
+import numpy as np
+import pandas as pd
+
+ATHLETE_COLUMNS = ['ID', 'Name', 'Sex', 'Age', 'Height', 'Weight', 'Team', 'NOC', 'Games', 'Year', 'Season', 'City', 'Sport', 'Event', 'Medal']
+PARALYMPICS_COLUMNS = ['Year', 'Host_City', 'Host_Country', 'Country', 'Country_Code', 'Gold', 'Silver', 'Bronze', 'M_Total', 'Men', 'Women', 'P_Total']
+
+# Proporções observadas no athlete_events.csv (271.116 linhas)
+NAN_RATES = {'Age': 0.035, 'Height': 0.222, 'Weight': 0.232}
+MEDAL_RATE = 0.147
+MALE_RATE = 0.725
+
+# Linhas de cada esporte no dataset original (os demais esportes têm menos de 1.000 linhas)
+SPORT_ROWS = {
+    'Athletics': 38624, 'Gymnastics': 26707, 'Swimming': 23195, 'Shooting': 11448, 'Cycling': 10859, 'Fencing': 10735,
+    'Rowing': 10595, 'Cross Country Skiing': 9133, 'Alpine Skiing': 8829, 'Wrestling': 7154, 'Football': 6745,
+    'Sailing': 6586, 'Equestrianism': 6344, 'Canoeing': 6171, 'Boxing': 6047, 'Speed Skating': 5613, 'Ice Hockey': 5516,
+    'Hockey': 5417, 'Biathlon': 4893, 'Basketball': 4536, 'Weightlifting': 3937, 'Water Polo': 3846, 'Judo': 3801,
+    'Handball': 3665, 'Art Competitions': 3578, 'Volleyball': 3404, 'Bobsleigh': 3058, 'Luge': 3026, 'Figure Skating': 2298,
+    'Diving': 2842, 'Archery': 2334, 'Ski Jumping': 2401, 'Tennis': 2862, 'Table Tennis': 1955, 'Nordic Combined': 1344,
+    'Short Track Speed Skating': 1534, 'Badminton': 1457, 'Synchronized Swimming': 909, 'Modern Pentathlon': 1677,
+    'Freestyle Skiing': 937, 'Snowboarding': 936, 'Taekwondo': 600, 'Baseball': 894, 'Beach Volleyball': 564,
+    'Softball': 478, 'Triathlon': 529, 'Rhythmic Gymnastics': 658, 'Curling': 463, 'Rugby Sevens': 299, 'Trampolining': 152,
+    'Golf': 247, 'Rugby': 162, 'Skeleton': 199, 'Tug-Of-War': 170, 'Lacrosse': 60, 'Polo': 95, 'Motorboating': 7,
+}
+WINTER_SPORTS = {
+    'Speed Skating', 'Cross Country Skiing', 'Ice Hockey', 'Biathlon', 'Alpine Skiing', 'Luge', 'Bobsleigh', 'Figure Skating',
+    'Nordic Combined', 'Freestyle Skiing', 'Ski Jumping', 'Curling', 'Snowboarding', 'Short Track Speed Skating', 'Skeleton',
+}
+
+# Maiores NOCs do dataset original, com a quantidade de linhas; a cauda é formada por NOCs sintéticos
+NOC_ROWS = {
+    'USA': ('United States', 18853), 'FRA': ('France', 12758), 'GBR': ('Great Britain', 12256), 'ITA': ('Italy', 10715),
+    'GER': ('Germany', 9830), 'CAN': ('Canada', 9733), 'JPN': ('Japan', 8444), 'SWE': ('Sweden', 8339),
+    'AUS': ('Australia', 7638), 'HUN': ('Hungary', 6607), 'POL': ('Poland', 6207), 'SUI': ('Switzerland', 5932),
+    'NED': ('Netherlands', 5839), 'URS': ('Soviet Union', 5685), 'FIN': ('Finland', 5535), 'ESP': ('Spain', 5287),
+    'CHN': ('China', 5169), 'NOR': ('Norway', 5136), 'AUT': ('Austria', 5082), 'RUS': ('Russia', 5037),
+    'TCH': ('Czechoslovakia', 4584), 'KOR': ('South Korea', 4527), 'ROU': ('Romania', 4467), 'BRA': ('Brazil', 3848),
+    'ARG': ('Argentina', 3297), 'BEL': ('Belgium', 3181), 'MEX': ('Mexico', 2988), 'DEN': ('Denmark', 2886),
+    'NZL': ('New Zealand', 2628), 'BUL': ('Bulgaria', 2601), 'GRE': ('Greece', 2519), 'CUB': ('Cuba', 1967),
+    'RSA': ('South Africa', 1941), 'IND': ('India', 1400), 'KEN': ('Kenya', 888), 'NGR': ('Nigeria', 1021),
+}
+TAIL_NOCS = 194
+TAIL_ROWS = 40000
+
+# Anos das olimpíadas de verão e de inverno (sem as edições canceladas pelas guerras)
+SUMMER_YEARS = [year for year in range(1896, 2017, 4) if year not in (1916, 1940, 1944)] + [1906]
+WINTER_YEARS = [year for year in range(1924, 1993, 4) if year not in (1940, 1944)] + list(range(1994, 2015, 4))
+
+
+def _choice(rng: np.random.Generator, options: list, weights: np.ndarray, size: int) -> np.ndarray:
+    weights = np.asarray(weights, dtype=float)
+    return np.asarray(options, dtype=object)[rng.choice(len(options), size=size, p=weights / weights.sum())]
+
+
+def _years(rng: np.random.Generator, seasons: np.ndarray) -> np.ndarray:
+    years = np.empty(len(seasons), dtype=np.int64)
+    for season, options in (('Summer', SUMMER_YEARS), ('Winter', WINTER_YEARS)):
+        rows = np.flatnonzero(seasons == season)
+        options = np.sort(options)
+        # A participação cresce ao longo do tempo: o peso de cada edição aumenta com o ano
+        weights = (options - options.min() + 8.0) ** 1.5
+        years[rows] = rng.choice(options, size=len(rows), p=weights / weights.sum())
+    return years
+
+
+def synthetic_athletes(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Gera uma tabela de atletas com o esquema e as distribuições do athlete_events.csv.
+
+    Args:
+        n_rows (int): Quantidade de linhas.
+        seed (int, optional): Semente do gerador. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas ATHLETE_COLUMNS ('Medal' com 'Gold', 'Silver', 'Bronze' ou NaN).
+
+    Example:
+    ----------
+    >>> df = synthetic_athletes(20000, seed=1)
+    >>> df.columns.tolist() == ATHLETE_COLUMNS, df.equals(synthetic_athletes(20000, seed=1))
+    (True, True)
+    >>> [abs(observed - expected) < 0.01 for observed, expected in [(df['Height'].isna().mean(), NAN_RATES['Height']),
+    ...     (df['Medal'].notna().mean(), MEDAL_RATE), ((df['Sex'] == 'M').mean(), MALE_RATE)]]
+    [True, True, True]
+    """
+    rng = np.random.default_rng(seed)
+
+    # Sexo, NOC e esporte são do atleta; cada atleta aparece em cerca de 1,7 linhas (várias provas ou edições)
+    n_athletes = max(1, int(n_rows / 1.7))
+    athlete_male = rng.random(n_athletes) < MALE_RATE
+    athlete_sport = _choice(rng, list(SPORT_ROWS), list(SPORT_ROWS.values()), n_athletes)
+    noc_codes = list(NOC_ROWS) + [f'N{index:02d}' for index in range(TAIL_NOCS)]
+    noc_teams = [team for team, _ in NOC_ROWS.values()] + [f'Country {index}' for index in range(TAIL_NOCS)]
+    noc_weights = np.asarray([rows for _, rows in NOC_ROWS.values()] + [TAIL_ROWS / TAIL_NOCS] * TAIL_NOCS)
+    athlete_noc = rng.choice(len(noc_codes), size=n_athletes, p=noc_weights / noc_weights.sum())
+
+    athlete = rng.integers(0, n_athletes, n_rows)
+    ids = athlete + 1
+    male, sports, noc_index = athlete_male[athlete], athlete_sport[athlete], athlete_noc[athlete]
+    sex = np.where(male, 'M', 'F').astype(object)
+    seasons = np.where(np.isin(sports, list(WINTER_SPORTS)), 'Winter', 'Summer').astype(object)
+    years = _years(rng, seasons)
+
+    # Idade inteira; altura e peso dependem do sexo
+    age = np.clip(np.round(rng.gamma(16.0, 1.6, n_rows)), 10, 97)
+    height = np.round(np.where(male, rng.normal(179, 9.5, n_rows), rng.normal(168, 8.5, n_rows)))
+    weight = np.round(np.where(male, rng.normal(76, 13.5, n_rows), rng.normal(60, 9.5, n_rows)) * 2) / 2
+    attributes = {'Age': age, 'Height': np.clip(height, 127, 226), 'Weight': np.clip(weight, 25, 214)}
+    for column, rate in NAN_RATES.items():
+        attributes[column][rng.random(n_rows) < rate] = np.nan
+
+    medal = np.full(n_rows, np.nan, dtype=object)
+    medalists = rng.random(n_rows) < MEDAL_RATE
+    medal[medalists] = _choice(rng, ['Gold', 'Silver', 'Bronze'], [1, 1, 1.02], int(medalists.sum()))
+
+    event_number = rng.integers(1, 9, n_rows)
+    year_text, event_text = years.astype(str).astype(object), event_number.astype(str).astype(object)
+    games = year_text + ' ' + seasons
+
+    return pd.DataFrame({
+        'ID': ids,
+        'Name': 'Athlete ' + ids.astype(str).astype(object),
+        'Sex': sex,
+        'Age': attributes['Age'],
+        'Height': attributes['Height'],
+        'Weight': attributes['Weight'],
+        'Team': np.asarray(noc_teams, dtype=object)[noc_index],
+        'NOC': np.asarray(noc_codes, dtype=object)[noc_index],
+        'Games': games,
+        'Year': years,
+        'Season': seasons,
+        'City': 'City ' + games,
+        'Sport': sports,
+        'Event': sports + np.where(male, " Men's ", " Women's ").astype(object) + 'Event ' + event_text,
+        'Medal': medal,
+    }, columns=ATHLETE_COLUMNS)
+
+
+def synthetic_paralympics(n_rows: int, season: str = 'Summer', seed: int = 0) -> pd.DataFrame:
+    """Gera uma tabela de medalhas por país das paralimpíadas (esquema de summer_paralympics.csv).
+
+    Args:
+        n_rows (int): Quantidade de linhas (país e edição).
+        season (str, optional): 'Summer' ou 'Winter'. Defaults to 'Summer'.
+        seed (int, optional): Semente do gerador. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas PARALYMPICS_COLUMNS.
+
+    Example:
+    ----------
+    >>> df = synthetic_paralympics(100)
+    >>> df.columns.tolist() == PARALYMPICS_COLUMNS, bool((df['M_Total'] == df[['Gold', 'Silver', 'Bronze']].sum(axis=1)).all())
+    (True, True)
+    """
+    rng = np.random.default_rng(seed)
+    years = list(range(1960, 2017, 4) if season == 'Summer' else range(1976, 2015, 4))
+    codes = list(NOC_ROWS) + [f'N{index:02d}' for index in range(TAIL_NOCS)]
+    countries = [team for team, _ in NOC_ROWS.values()] + [f'Country {index}' for index in range(TAIL_NOCS)]
+
+    year = rng.choice(years, n_rows)
+    country = rng.integers(0, len(codes), n_rows)
+    medals = rng.poisson(3, (n_rows, 3)) * (rng.random((n_rows, 1)) < 0.6)
+    men, women = rng.poisson(20, n_rows), rng.poisson(8, n_rows)
+
+    return pd.DataFrame({
+        'Year': year,
+        'Host_City': 'City ' + year.astype(str).astype(object),
+        'Host_Country': 'Host ' + year.astype(str).astype(object),
+        'Country': np.asarray(countries, dtype=object)[country],
+        'Country_Code': np.asarray(codes, dtype=object)[country],
+        'Gold': medals[:, 0], 'Silver': medals[:, 1], 'Bronze': medals[:, 2],
+        'M_Total': medals.sum(axis=1),
+        'Men': men, 'Women': women, 'P_Total': men + women,
+    }, columns=PARALYMPICS_COLUMNS)
+
+
+def synthetic_medal_athletes(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Gera uma tabela de medalhistas paralímpicos no formato do modified_medal_athlete.csv.
+
+    Args:
+        n_rows (int): Quantidade de linhas.
+        seed (int, optional): Semente do gerador. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas 'Games_year', 'Npc_new', 'Athlete_name', 'Event', 'Sex' e 'Medal' (1 a 3).
+
+    Example:
+    ----------
+    >>> sorted(synthetic_medal_athletes(100)['Medal'].unique().tolist())
+    [1, 2, 3]
+    """
+    rng = np.random.default_rng(seed)
+    codes = list(NOC_ROWS) + [f'N{index:02d}' for index in range(TAIL_NOCS)]
+    male = rng.random(n_rows) < 0.65
+    athletes = rng.integers(0, max(2, n_rows // 2), n_rows)
+
+    return pd.DataFrame({
+        'Games_year': rng.choice(list(range(1960, 2017, 4)), n_rows),
+        'Npc_new': np.asarray(codes, dtype=object)[rng.integers(0, len(codes), n_rows)],
+        'Athlete_name': 'Para Athlete ' + athletes.astype(str).astype(object),
+        'Event': np.where(male, "Men's Event", "Women's Event").astype(object),
+        'Sex': np.where(male, 'M', 'F').astype(object),
+        'Medal': rng.integers(1, 4, n_rows),
+    })
+
+
+def write_synthetic_data(directory: str, n_rows: int, seed: int = 0) -> str:
+    """Grava os CSVs sintéticos com os nomes usados pelas análises (data/athlete_events.csv etc.).
+
+    As tabelas das paralimpíadas têm um décimo das linhas da tabela de atletas.
+
+    Args:
+        directory (str): Diretório raiz; os arquivos são gravados em directory/data.
+        n_rows (int): Quantidade de linhas da tabela de atletas.
+        seed (int, optional): Semente do gerador. Defaults to 0.
+
+    Returns:
+        str: Diretório dos arquivos gravados.
+    """
+    data_directory = os.path.join(directory, 'data')
+    os.makedirs(data_directory, exist_ok=True)
+
+    paralympic_rows = max(10, n_rows // 10)
+    synthetic_athletes(n_rows, seed).to_csv(os.path.join(data_directory, 'athlete_events.csv'), index=False)
+    synthetic_medal_athletes(paralympic_rows, seed).to_csv(os.path.join(data_directory, 'modified_medal_athlete.csv'))
+    synthetic_paralympics(paralympic_rows, 'Summer', seed).to_csv(os.path.join(data_directory, 'summer_paralympics.csv'), index=False)
+    synthetic_paralympics(paralympic_rows, 'Winter', seed + 1).to_csv(os.path.join(data_directory, 'winter_paralympics.csv'), index=False)
+    return data_directory
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
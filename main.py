@@ -6,105 +6,150 @@ from src import womens_participation_graphs as wpg
 from src import womens_participation as wp
 from src import physical_attributes_analysis as pa
 from src import olympics_paralympics_pib_analysis as opp
+from src import checkpoint as ck
+from src import render_pool as rp
+from src import build_manifest as bm
+from src import instrumentation as ins
+from src import chart_spec as cs
+from src import attributes_report as ar
+from src import data_loader as dl
+from src import world_geometry as wg
 import pandas as pd
+import time
+import sys
+import os
 
-try:
-    # Criação dos DataFrames para Análise
-    athletes_df = pd.read_csv('data/athlete_events.csv')
-    noc_df = pd.read_csv('data/noc_regions.csv').rename(columns={'region': 'Country'})
-    modified_medal_athlete_df = pd.read_csv('data/modified_medal_athlete.csv')
-    summer_paralympics_df = pd.read_csv('data/summer_paralympics.csv')
-    winter_paralympics_df = pd.read_csv('data/winter_paralympics.csv')
-    urbanization_df = pd.read_csv('data/urbanization.csv')
-    gdp_df = pd.read_csv("data/gdp/gdp.csv").drop(columns=['Code', 'Unnamed: 65'])
-
-    # Limpeza Inicial dos DataFrames
-    dc.validade_athletes_columns(athletes_df) # Verifica se o DataFrame de Atletas possui todas as colunas necessárias
-    clean_athletes_df = dc.medals_to_int(athletes_df)
-    clean_athletes_df = dp.predict_missing(clean_athletes_df)
-    urbanization_df.columns = ['Year', 'Economy_Code', 'Country', 'Pop_Absolute', 'Pop_Missing', 'Urban_Pop_Percent', 'Urban_Pop_Percent_Missing']
-    urbanization_df = urbanization_df[['Year', 'Country', 'Pop_Absolute', 'Urban_Pop_Percent']]
-    urbanization_df = dc.urbanization_rename_countries(urbanization_df) # Renomear países para padrão do DataFrame de Atletas
-    wp.clean_paralympic_atletes_dataset()
-    olymp_df, olymp_countries_df, paralymp_df, paralymp_countries_df = wp.create_dataframes()
-
-    # Análise de Densidade de Medalhas por População Urbana em 2016: Henrique
-    data_2016 = mu.prepare_2016_medalist_urbanization_analysis(clean_athletes_df, urbanization_df, noc_df)
-    scatterplot_2016 = mu.create_scatterplot_2016_medalist_urbanization(data_2016)
-    scatterplot_2016.figure.savefig('graphs/urban_medal_density.png', dpi=500, bbox_inches='tight')
-    # Visualização Geográfica do crescimento de medalhas por país e do crescimento urbano de um país: Henrique
-    data_map_visualization = mu.prepare_map_visualization_data(clean_athletes_df, urbanization_df, noc_df)
-    map_visualization = mu.create_map_visualization(data_map_visualization)
-    map_visualization.savefig('graphs/geographic_growth.png', dpi=500, bbox_inches='tight')
-    map_visualization.close()
-    
-    # Análise Idades: Jaime
-    top_3_boxplot_outliers = aa.create_boxplot_top_3_esportes_outliers(clean_athletes_df)
-    top_3_boxplot_outliers.savefig('graphs/bloxplot_top_3_highest_age_aplitude.png', format='png', dpi=300)
-    top_3_boxplot_outliers.close()
-    
-    top_3_boxplot_most_awarded = aa.create_boxplot_top_3_esportes_most_awarded(clean_athletes_df)
-    top_3_boxplot_most_awarded.savefig('graphs/boxplot_top_3_most_awarded.png', format='png', dpi=300)
-    top_3_boxplot_most_awarded.close()
-    
-    boxplot_age_medal_status_brazil = aa.create_boxplot_age_medal_status_brazil(clean_athletes_df)
-    boxplot_age_medal_status_brazil.savefig('graphs/boxplot_age_awarded_and_non_awarded_brazil.png', format='png', dpi=300)
-    boxplot_age_medal_status_brazil.close()
-
-    #Análise Participação Feminina: Walléria
-    table_stds = wpg.create_table_of_stds()
-    table_stds.savefig('graphs/female_participation/table_stds_olympics_and_paralympics_bra.png', format='png', dpi=300)
-    table_stds.close()
-
-    scatterplot_paralymp_score_bra_df = wpg.filter_paralymp_score_bra()
-    scatterplot_paralymp_score_bra = wpg.plot_scatter_graph(scatterplot_paralymp_score_bra_df, 'Year', 'F_Medal', 'M_Medal', 'Scatter Plot Paralympics: Men\'s Score X Women\'s Score (Brazil)', 'Score')
-    scatterplot_paralymp_score_bra.savefig('graphs/scatterplot_paralymp_score_bra.png', format='png', dpi=300)
-
-    scatterplot_paralymp_score_global_df = wpg.filter_paralymp_score_global()
-    scatterplot_paralymp_score_global = wpg.plot_scatter_graph(scatterplot_paralymp_score_global_df, 'Year', 'F_Athletes', 'M_Athletes', 'Scatter Plot Paralympics: Men\'s Score X Women\'s Score (Global)', 'Score')
-    scatterplot_paralymp_score_global.savefig('graphs/scatterplot_paralymp_score_global.png', format='png', dpi=300)
-
-    scatterplot_olymp_score_global_df = wpg.filter_olympic_score_global()
-    scatterplot_olymp_score_global = wpg.plot_scatter_graph(scatterplot_olymp_score_global_df, 'Year', 'F_Athletes', 'M_Athletes', 'Scatter Plot Olympics: Men\'s Score X Women\'s Score (Global)', 'Score')
-    scatterplot_olymp_score_global.savefig('graphs/scatterplot_olymp_score_global.png', format='png', dpi=300)
-
-    scatterplot_olymp_score_bra_df = wpg.filter_olympic_score_bra()
-    scatterplot_olymp_score_bra = wpg.plot_scatter_graph(scatterplot_olymp_score_bra_df, 'Year', 'F_Athletes', 'M_Athletes', 'Scatter Plot Olympics: Men\'s Score X Women\'s Score (Brazil)', 'Score')
-    scatterplot_olymp_score_bra.savefig('graphs/scatterplot_olymp_score_bra.png', format='png', dpi=300)
-    
-    # Análise dos Atributos Físicos dos Atletas: Carlos
-    pa.attributes_sports_analysis(clean_athletes_df)
-    pa.attributes_years_analysis(clean_athletes_df)
-    
-    # Análise PIB x Medalhas: Luís Filipe
-    combined_df = opp.prepare_data_for_analysis(athletes_df, summer_paralympics_df, winter_paralympics_df, gdp_df, noc_df)
-
-    olympics_paralympics_correlation_matrix = opp.prepare_olympics_paralympics_analysis(combined_df)
-    heatmap_olympics_paralympics_pib = opp.create_heatmap(olympics_paralympics_correlation_matrix, 
-                                                          "Correlation Heatmap Between Total Olympic and Paralympic Medals")
-    heatmap_olympics_paralympics_pib.savefig("graphs/medals_gdp_correlation_graphs/heatmap_olympics_paralympics_medals.png", dpi=300)
-    heatmap_olympics_paralympics_pib.close()
-
-    total_medals_gdp_correlation_matrix = opp.prepare_total_medals_gdp_analysis(combined_df)
-    heatmap_total_medals_gdp = opp.create_heatmap(total_medals_gdp_correlation_matrix, 
-                                                  "Correlation Heatmap Between Total Medals (Olympic and Paralympic) and GDP")
-    heatmap_total_medals_gdp.savefig("graphs/medals_gdp_correlation_graphs/heatmap_total_medals_gdp.png", dpi=300)
-    heatmap_total_medals_gdp.close()
-
-    medals_gdp_correlation_matrix = opp.prepare_medals_categories_gdp_analysis(combined_df)
-    heatmap_medals_categories_gdp = opp.create_heatmap(medals_gdp_correlation_matrix,
-                                                        "Correlation Heatmap Between the Types of Medals Won in the Olympics and Paralympics")
-    heatmap_medals_categories_gdp.savefig("graphs/medals_gdp_correlation_graphs/heatmap_medals_categories_gdp.png", dpi=300)
-    heatmap_medals_categories_gdp.close()
-
-    prepared_df = opp.prepare_2016_olympics_paralympics_pib_analysis(combined_df)
-    scatterplot_opp_2016 = opp.create_scatterplot_olympics_paralympics_pib_2016(prepared_df)
-    scatterplot_opp_2016.savefig("graphs/medals_gdp_correlation_graphs/scatterplot_olympics_paralympics_pib_2016.png", dpi=300)
-    scatterplot_opp_2016.close()
-
-    scatterplot_opp_2016_approximate = opp.create_scatterplot_olympics_paralympics_pib_2016(prepared_df, xlim=(0, 120), ylim=(0,120), zlim=(0, 4000))
-    scatterplot_opp_2016_approximate.savefig("graphs/medals_gdp_correlation_graphs/scatterplot_olympics_paralympics_pib_2016_approximate.png")
-    scatterplot_opp_2016_approximate.close()
-
-except FileNotFoundError:
-    print("File not found, check if the path is correct.")
+
+def main() -> None:
+    # Checkpoints dos DataFrames intermediários são opcionais: python main.py --checkpoints
+    checkpoint_writer = ck.CheckpointWriter(dl.data_path('df_checkpoints')) if '--checkpoints' in sys.argv else None
+    # Cache dos dados e specs dos gráficos, para regerá-los com chart_spec.render_spec: python main.py --chart-cache
+    chart_cache = cs.FrameCache(dl.data_path('chart_cache')) if '--chart-cache' in sys.argv else None
+    # Instrumentação de todas as funções do src (tempo, CPU, memória e linhas por etapa): python main.py --profile
+    # Com ela, as figuras são renderizadas no processo principal, para que o savefig e a leitura do shapefile entrem no trace
+    profiler = ins.Profiler() if '--profile' in sys.argv else None
+    if profiler is not None:
+        ins.instrument_package(os.path.dirname(ins.__file__), profiler)
+    read_csv = profiler.instrument(pd.read_csv, 'pandas.read_csv') if profiler is not None else pd.read_csv
+
+    try:
+        # Criação dos DataFrames para Análise (diretório dos dados configurável: DATA_ROOT=<diretório> python main.py)
+        athletes_df = read_csv(dl.data_path('athlete_events.csv'))
+        noc_df = read_csv(dl.data_path('noc_regions.csv')).rename(columns={'region': 'Country'})
+        modified_medal_athlete_df = read_csv(dl.data_path('modified_medal_athlete.csv'))
+        summer_paralympics_df = read_csv(dl.data_path('summer_paralympics.csv'))
+        winter_paralympics_df = read_csv(dl.data_path('winter_paralympics.csv'))
+        urbanization_df = read_csv(dl.data_path('urbanization.csv'))
+        gdp_df = read_csv(dl.data_path('gdp', 'gdp.csv')).drop(columns=['Code', 'Unnamed: 65'])
+
+        # Limpeza Inicial dos DataFrames
+        dc.validade_athletes_columns(athletes_df) # Verifica se o DataFrame de Atletas possui todas as colunas necessárias
+        clean_athletes_df = dc.medals_to_int(athletes_df)
+        clean_athletes_df = dp.predict_missing(clean_athletes_df)
+        urbanization_df.columns = ['Year', 'Economy_Code', 'Country', 'Pop_Absolute', 'Pop_Missing', 'Urban_Pop_Percent', 'Urban_Pop_Percent_Missing']
+        urbanization_df = urbanization_df[['Year', 'Country', 'Pop_Absolute', 'Urban_Pop_Percent']]
+        urbanization_df = dc.urbanization_rename_countries(urbanization_df) # Renomear países para padrão do DataFrame de Atletas
+        wp.clean_paralympic_atletes_dataset()
+        # DataFrames da participação feminina, lidos uma vez e compartilhados com os gráficos do womens_participation_graphs
+        olymp_df, olymp_countries_df, paralymp_df, paralymp_countries_df = wpg.womens_dataframes()
+
+        # Preparação dos dados dos gráficos; as figuras são criadas e salvas em paralelo pelo render_pool
+        data_2016 = mu.prepare_2016_medalist_urbanization_analysis(clean_athletes_df, urbanization_df, noc_df)
+        data_map_visualization = mu.prepare_map_visualization_data(clean_athletes_df, urbanization_df, noc_df, checkpoint_writer)
+        combined_df = opp.prepare_data_for_analysis(athletes_df, summer_paralympics_df, winter_paralympics_df, gdp_df, noc_df)
+        prepared_df = opp.prepare_2016_olympics_paralympics_pib_analysis(combined_df)
+
+        # Só as colunas usadas pelos gráficos de idade, selecionadas uma vez: cada figura envia o seu DataFrame ao pool
+        age_df = clean_athletes_df.filter(items=aa.FIGURE_COLUMNS)
+
+        figure_specs = [
+            # Análise de Densidade de Medalhas por População Urbana em 2016: Henrique
+            rp.FigureSpec(mu.create_scatterplot_2016_medalist_urbanization, 'graphs/urban_medal_density.png', (data_2016,),
+                          savefig={'dpi': 500, 'bbox_inches': 'tight'}),
+            # Visualização Geográfica do crescimento de medalhas por país e do crescimento urbano de um país: Henrique
+            # (com checkpoints, o mapa é criado no processo principal, que tem o escritor dos checkpoints;
+            # o shapefile das geometrias é lido pelo world_geometry e entra no manifesto como input)
+            rp.FigureSpec(mu.create_map_visualization, 'graphs/geographic_growth.png', (data_map_visualization, checkpoint_writer),
+                          savefig={'dpi': 500, 'bbox_inches': 'tight'}, inline=checkpoint_writer is not None, inputs=(wg.world_shapefile(),)),
+
+            # Análise Idades: Jaime
+            rp.FigureSpec(aa.create_boxplot_top_3_esportes_outliers, 'graphs/bloxplot_top_3_highest_age_aplitude.png', (age_df,),
+                          savefig={'format': 'png', 'dpi': 300}),
+            rp.FigureSpec(aa.create_boxplot_top_3_esportes_most_awarded, 'graphs/boxplot_top_3_most_awarded.png', (age_df,),
+                          savefig={'format': 'png', 'dpi': 300}),
+            rp.FigureSpec(aa.create_boxplot_age_medal_status_brazil, 'graphs/boxplot_age_awarded_and_non_awarded_brazil.png', (age_df,),
+                          savefig={'format': 'png', 'dpi': 300}),
+
+            #Análise Participação Feminina: Walléria
+            # (a tabela lê os DataFrames globais do módulo: os CSVs de origem entram no manifesto como inputs)
+            rp.FigureSpec(wpg.create_table_of_stds, 'graphs/female_participation/table_stds_olympics_and_paralympics_bra.png',
+                          savefig={'format': 'png', 'dpi': 300}, inputs=tuple(wp.dataframes_files())),
+            rp.FigureSpec(wpg.plot_scatter_graph, 'graphs/scatterplot_paralymp_score_bra.png',
+                          (wpg.filter_paralymp_score_bra(), 'Year', 'F_Medal', 'M_Medal', 'Scatter Plot Paralympics: Men\'s Score X Women\'s Score (Brazil)', 'Score'),
+                          savefig={'format': 'png', 'dpi': 300}),
+            rp.FigureSpec(wpg.plot_scatter_graph, 'graphs/scatterplot_paralymp_score_global.png',
+                          (wpg.filter_paralymp_score_global(), 'Year', 'F_Athletes', 'M_Athletes', 'Scatter Plot Paralympics: Men\'s Score X Women\'s Score (Global)', 'Score'),
+                          savefig={'format': 'png', 'dpi': 300}),
+            rp.FigureSpec(wpg.plot_scatter_graph, 'graphs/scatterplot_olymp_score_global.png',
+                          (wpg.filter_olympic_score_global(), 'Year', 'F_Athletes', 'M_Athletes', 'Scatter Plot Olympics: Men\'s Score X Women\'s Score (Global)', 'Score'),
+                          savefig={'format': 'png', 'dpi': 300}),
+            rp.FigureSpec(wpg.plot_scatter_graph, 'graphs/scatterplot_olymp_score_bra.png',
+                          (wpg.filter_olympic_score_bra(), 'Year', 'F_Athletes', 'M_Athletes', 'Scatter Plot Olympics: Men\'s Score X Women\'s Score (Brazil)', 'Score'),
+                          savefig={'format': 'png', 'dpi': 300}),
+
+            # Análise dos Atributos Físicos dos Atletas: Carlos
+            *[rp.FigureSpec(function, path, args) for path, function, args in pa.attributes_sports_figures(clean_athletes_df)],
+            # (os gráficos de densidade podem ser salvos em svg, com os dados rasterizados: python main.py --vector)
+            *[rp.FigureSpec(function, path, args, kwargs) for path, function, args, kwargs in pa.attributes_years_figures(clean_athletes_df, vector='--vector' in sys.argv)],
+
+            # Análise PIB x Medalhas: Luís Filipe
+            rp.FigureSpec(opp.create_heatmap, 'graphs/medals_gdp_correlation_graphs/heatmap_olympics_paralympics_medals.png',
+                          (opp.prepare_olympics_paralympics_analysis(combined_df), "Correlation Heatmap Between Total Olympic and Paralympic Medals"),
+                          savefig={'dpi': 300}),
+            rp.FigureSpec(opp.create_heatmap, 'graphs/medals_gdp_correlation_graphs/heatmap_total_medals_gdp.png',
+                          (opp.prepare_total_medals_gdp_analysis(combined_df), "Correlation Heatmap Between Total Medals (Olympic and Paralympic) and GDP"),
+                          savefig={'dpi': 300}),
+            rp.FigureSpec(opp.create_heatmap, 'graphs/medals_gdp_correlation_graphs/heatmap_medals_categories_gdp.png',
+                          (opp.prepare_medals_categories_gdp_analysis(combined_df), "Correlation Heatmap Between the Types of Medals Won in the Olympics and Paralympics"),
+                          savefig={'dpi': 300}),
+            rp.FigureSpec(opp.create_scatterplot_olympics_paralympics_pib_2016, 'graphs/medals_gdp_correlation_graphs/scatterplot_olympics_paralympics_pib_2016.png',
+                          (prepared_df,), savefig={'dpi': 300}),
+            rp.FigureSpec(opp.create_scatterplot_olympics_paralympics_pib_2016, 'graphs/medals_gdp_correlation_graphs/scatterplot_olympics_paralympics_pib_2016_approximate.png',
+                          (prepared_df,), {'xlim': (0, 120), 'ylim': (0, 120), 'zlim': (0, 4000)}),
+        ]
+
+        # Relatório dos atributos físicos de todos os países e esportes (tabela e boxplots por NOC): python main.py --attributes-report
+        if '--attributes-report' in sys.argv:
+            figure_specs += ar.prepare_attributes_report(clean_athletes_df)[1]
+
+        if chart_cache is not None:
+            cs.attach_cache(figure_specs, chart_cache)
+
+        # Renderização em paralelo só das figuras desatualizadas (como no make), com o relatório de tempo de cada uma
+        # Para regenerar todas as figuras: python main.py --force
+        start = time.perf_counter()
+        with ins.stage(profiler, 'render_figures'):
+            report, skipped = bm.build_figures(figure_specs, bm.BuildManifest('graphs/.build_manifest.json'), force='--force' in sys.argv,
+                                               max_workers=1 if profiler is not None else None)
+        print(rp.format_timing_report(report, time.perf_counter() - start))
+        if skipped:
+            print(f'{len(skipped)} figures up to date, skipped (use --force to regenerate)')
+
+    except FileNotFoundError:
+        print("File not found, check if the path is correct.")
+    finally:
+        # Garante que os checkpoints pendentes sejam escritos antes de encerrar
+        if checkpoint_writer is not None:
+            for name, error in checkpoint_writer.close(warn=False):
+                print(f'Checkpoint {name} was not written: {error!r}')
+        # Trace JSON (chrome://tracing, Perfetto) e perfil folded (flamegraph.pl, speedscope) da execução
+        if profiler is not None:
+            trace_path, folded_path = profiler.save(dl.data_path('profile'))
+            print(profiler.summary().head(15).to_string())
+            print(f'Profile written to {trace_path} and {folded_path}')
+
+
+# O pool de processos do render_pool reimporta este módulo nos processos filhos (no Windows e no macOS),
+# então a análise só roda quando o arquivo é executado diretamente
+if __name__ == "__main__":
+    main()
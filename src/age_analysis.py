@@ -1,17 +1,67 @@
 """Modulo com as funções da hipotese de Idades"""
 import pandas as pd
 from data_cleaner import *
+from group_statistics import grouped_statistics, iqr_outliers, top_groups
+from quantile_sketch import GroupedQuantileSketch
+from summary_boxplot import grouped_box_summaries
+from figures import create_figure
+from chart_spec import ChartSpec, FrameCache, chart
+from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import seaborn as sns 
 import doctest
 
+# Colunas usadas pelos gráficos de idade (as demais não precisam ser enviadas aos processos do render_pool)
+FIGURE_COLUMNS = ['NOC', 'Sport', 'Age', 'Medal', 'is_medalist']
 
-def statistics_by_age(df: pd.DataFrame) -> dict:
+
+def age_summary(df: pd.DataFrame, sketches: GroupedQuantileSketch = None) -> pd.DataFrame:
+    """Calcula as estatísticas da coluna 'Age' por esporte, a partir das linhas ou dos sketches.
+
+    Args:
+        df (pd.DataFrame): O DataFrame com os dados esportivos (ignorado quando há sketches).
+        sketches (GroupedQuantileSketch, optional): Sketches da coluna 'Age' agrupados com 'Sport'. Defaults to None.
+
+    Returns:
+        pd.DataFrame: Estatísticas indexadas pelo esporte, com as colunas de grouped_statistics.
+
+    Example
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo', 'Judo', 'Golf'], 'Sex': ['M', 'F', 'M'], 'Year': [2016] * 3, 'Age': [20, 30, 40]})
+    >>> sketches = GroupedQuantileSketch()
+    >>> sketches.update(df)
+    >>> age_summary(df)['median'].equals(age_summary(None, sketches)['median'])
+    True
+    """
+    if sketches is not None:
+        return sketches.rollup(['Sport']).statistics()
+    return grouped_statistics(df, 'Sport', 'Age')
+
+
+def age_outlier_counts(df: pd.DataFrame, sketches: GroupedQuantileSketch = None) -> pd.Series:
+    """Conta as idades fora dos limites (Q1 - 1.5*IQR, Q3 + 1.5*IQR) de cada esporte, a partir das linhas ou dos sketches.
+
+    Args:
+        df (pd.DataFrame): O DataFrame com os dados esportivos (ignorado quando há sketches).
+        sketches (GroupedQuantileSketch, optional): Sketches da coluna 'Age' agrupados com 'Sport'. Defaults to None.
+
+    Returns:
+        pd.Series: Quantidade de outliers por esporte (estimada, no caso dos sketches).
+    """
+    if sketches is not None:
+        return sketches.rollup(['Sport']).outlier_counts()
+    contagem_extremos, _ = iqr_outliers(df, 'Sport', 'Age')
+    return contagem_extremos
+
+
+def statistics_by_age(df: pd.DataFrame, sketches: GroupedQuantileSketch = None) -> dict:
     """Função que agrupa o DataFrame pela coluna 'Sport' e calcula mediana, 1º quartil (Q1) e 3º quartil (Q3)
     apenas para a coluna 'Age'.
     
     Args:
         df (pd.DataFrame): O DataFrame com os dados esportivos.
+        sketches (GroupedQuantileSketch, optional): Sketches da coluna 'Age' (agrupados com 'Sport'); quando dados,
+            as estatísticas são calculadas a partir deles, sem usar as linhas de df. Defaults to None.
     
     Returns:
         dict: Um dicionário contendo as estatísticas da coluna 'Age' para cada esporte.
@@ -26,55 +76,42 @@ def statistics_by_age(df: pd.DataFrame) -> dict:
     >>> statistics_by_age(df)
     {'Basketball': {'mediana': 40.0, '1º quartil': 37.5, '3º quartil': 42.5, 'minimo': 35, 'maximo': 45, 'media': 40.0, 'desvio_padrao': 7.0710678118654755, 'variancia': 50.0, 'limite inferior': 30, 'limite superior': 50}, 'Soccer': {'mediana': 20.5, '1º quartil': 20.25, '3º quartil': 20.75, 'minimo': 20, 'maximo': 21, 'media': 20.5, 'desvio_padrao': 0.7071067811865476, 'variancia': 0.5, 'limite inferior': 20, 'limite superior': 22}, 'Tennis': {'mediana': 22.0, '1º quartil': 20.5, '3º quartil': 23.5, 'minimo': 19, 'maximo': 25, 'media': 22.0, 'desvio_padrao': 4.242640687119285, 'variancia': 18.0, 'limite inferior': 16, 'limite superior': 28}}
     """
-    # Inicializando um dicionário para armazenar os resultados
-    estatisticas = {}
-    
     try:
-        # Agrupando o DataFrame pela coluna 'Sport'
-        grouped = df.groupby('Sport')
-
-        # Iterando por cada grupo (esporte)
-        for sport, group in grouped:
-            estatisticas[sport] = {}
-            
-            # Selecionando a coluna 'Age'
-            idade = group['Age']
-
-            # Dados estatísticos da coluna 'Age' para aquele esporte 
-            estatisticas[sport]['mediana'] = idade.median()
-            estatisticas[sport]['1º quartil'] = idade.quantile(0.25)
-            estatisticas[sport]['3º quartil'] = idade.quantile(0.75)
-            estatisticas[sport]['minimo'] = idade.min()
-            estatisticas[sport]['maximo'] = idade.max()
-            estatisticas[sport]['media'] = idade.mean()
-            estatisticas[sport]['desvio_padrao'] = idade.std()
-            estatisticas[sport]['variancia'] = idade.var()
-            
-            #  Calculando os limites inferiores e superiores com base da idade
-            interquartil = idade.quantile(0.75) - idade.quantile(0.25)
-            limite_inferior = idade.quantile(0.25) - interquartil*1.5
-            limite_superior = idade.quantile(0.75) + interquartil*1.5
-            
-            # Por serem variáveis discretas
-            estatisticas[sport]['limite inferior'] = round(limite_inferior)
-            estatisticas[sport]['limite superior'] = round(limite_superior) 
-            
+        # Todas as estatísticas da coluna 'Age' para todos os esportes em uma única passada
+        resumo = age_summary(df, sketches)
     except KeyError:
             print(
             f"The given dataframe doesn't have all needeed columns, consider replacing it")
             
             quit()
     else:
+        estatisticas = {}
+        for sport, linha in resumo.to_dict(orient='index').items():
+            estatisticas[sport] = {
+                'mediana': linha['median'],
+                '1º quartil': linha['q1'],
+                '3º quartil': linha['q3'],
+                'minimo': linha['min'],
+                'maximo': linha['max'],
+                'media': linha['mean'],
+                'desvio_padrao': linha['std'],
+                'variancia': linha['var'],
+                # Por serem variáveis discretas
+                'limite inferior': round(linha['lower_fence']),
+                'limite superior': round(linha['upper_fence']),
+            }
         return estatisticas
 
 
-def highest_age_aplitude_sports(df: pd.DataFrame) -> dict:
+def highest_age_aplitude_sports(df: pd.DataFrame, sketches: GroupedQuantileSketch = None) -> dict:
     """
     Função que verifica quais esportes têm atletas com idades menores que o 1º quartil
     ou maiores que o 3º quartil e retorna uma lista desses esportes.
     
     Args:
         df (pd.DataFrame): O DataFrame com os dados esportivos.
+        sketches (GroupedQuantileSketch, optional): Sketches da coluna 'Age' (agrupados com 'Sport'); quando dados,
+            as contagens são estimadas a partir deles. Defaults to None.
     
     Returns:
         dict: dicionario com os  esportes que possuem atletas com idades extremas.
@@ -96,31 +133,9 @@ def highest_age_aplitude_sports(df: pd.DataFrame) -> dict:
     >>> highest_age_aplitude_sports(df)
     {'Boxing': 2, 'Soccer': 2, 'Tennis': 1}
     """
-    # Inicializando o dicionario para armazenar esportes com idades extremas
-    esportes_extremos = {}
-    
-    # Agrupando o DataFrame pela coluna 'Sport'
     try:
-        grouped = df.groupby('Sport')
-        
-        # Iterando por cada grupo (esporte)
-        for sport, group in grouped:
-            # Selecionando a coluna 'Age'
-            idade = group['Age']
-            
-            # Calculando 1º quartil (Q1) e 3º quartil (Q3)
-            q1 = idade.quantile(0.25)
-            q3 = idade.quantile(0.75)
-            interquartil = q3 - q1
-            limite_inferior= q1 -1.5*interquartil
-            limite_superior = q3+ 1.5*interquartil
-            
-            # Verificando se há idades fora do intervalo (menor que Q1 ou maior que Q3)
-    
-            contagem_extremos = ((idade < limite_inferior) | (idade > limite_superior)).sum()
-            
-            if contagem_extremos > 0:
-                esportes_extremos[sport] = contagem_extremos
+        # Quantidade de idades fora dos limites (Q1 - 1.5*IQR, Q3 + 1.5*IQR) de cada esporte, em uma única passada
+        contagem_extremos = age_outlier_counts(df, sketches)
     
     except KeyError:
             print(
@@ -128,17 +143,20 @@ def highest_age_aplitude_sports(df: pd.DataFrame) -> dict:
             
             quit()
     else:
-        return esportes_extremos
+        contagem_extremos = contagem_extremos[contagem_extremos > 0]
+        return {sport: int(contagem) for sport, contagem in contagem_extremos.items()}
 
 
-def create_boxplot_sport_with_the_most_outliers(df: pd.DataFrame) -> plt:
+def create_boxplot_sport_with_the_most_outliers(df: pd.DataFrame, sketches: GroupedQuantileSketch = None, cache: FrameCache = None) -> Figure:
     """Função que gera um boxplot com o esporte que possui mais atletas com idades extremas.
     
     Args:
         df (pd.DataFrame): O DataFrame com os dados esportivos limpos.
+        sketches (GroupedQuantileSketch, optional): Sketches da coluna 'Age' usados na escolha do esporte. Defaults to None.
+        cache (FrameCache, optional): Cache onde os resumos e o spec do gráfico são guardados ('age_sport_most_outliers'). Defaults to None.
         
     Returns:
-        plt: Um objeto do tipo matplotlib.pyplot com o boxplot
+        Figure: A figura do matplotlib com o boxplot
     
     Example
     ----------
@@ -150,26 +168,23 @@ def create_boxplot_sport_with_the_most_outliers(df: pd.DataFrame) -> plt:
     ...    'Age': [80, 20, 19, 19, 18], 
     ...    'Sport': ['Volleybol', 'Volleybol', 'Volleybol', 'Volleybol', 'Volleybol']})       
     >>> plot = create_boxplot_sport_with_the_most_outliers(data)
-    >>> plot.__class__.__name__ == "module"
+    >>> plot.__class__.__name__ == "Figure"
     True
 
     """
     try:
-        esportes_extremos = highest_age_aplitude_sports(df)
+        esportes_extremos = highest_age_aplitude_sports(df, sketches)
         # Analisando o esporte com mais valores extremos
         maior_esporte = max(esportes_extremos, key=esportes_extremos.get)
         quantidade = esportes_extremos[maior_esporte]
         
         df_maioresporte = df[df['Sport'] == maior_esporte]
 
-        plt.figure()
-        boxplot = sns.boxplot(x='Sport', y='Age', data=df_maioresporte)
-        boxplot.set_yscale('linear')
-        plt.title('Age Boxplot by Sport')
-        plt.xlabel('Sport')
-        plt.ylabel('Age')
+        # Boxplot desenhado a partir do resumo do esporte (quartis, bigodes e outliers)
+        resumos = grouped_box_summaries(df_maioresporte, 'Sport', 'Age', order=[maior_esporte], stats=age_summary(df_maioresporte, sketches))
+        spec = ChartSpec('age_sport_most_outliers', 'boxplot', title='Age Boxplot by Sport', xlabel='Sport', ylabel='Age', yscale='linear')
 
-        return plt
+        return chart(spec, pd.DataFrame(resumos), cache)
     except KeyError:
         print(
             f"The given dataframe doesn't have all needeed columns, consider replacing it")
@@ -180,14 +195,16 @@ def create_boxplot_sport_with_the_most_outliers(df: pd.DataFrame) -> plt:
         quit()
 
 
-def create_boxplot_top_3_esportes_outliers(df: pd.DataFrame)-> plt:
+def create_boxplot_top_3_esportes_outliers(df: pd.DataFrame, sketches: GroupedQuantileSketch = None, cache: FrameCache = None) -> Figure:
     """Função que gera um boxplot com as idades dos  3 esportes que possuem mais atletas com idades extremas.
 
     Args:
         df (pd.DataFrame): O DataFrame com os dados esportivos limpos.
+        sketches (GroupedQuantileSketch, optional): Sketches da coluna 'Age' usados na escolha dos esportes. Defaults to None.
+        cache (FrameCache, optional): Cache onde os resumos e o spec do gráfico são guardados ('age_top_3_outliers'). Defaults to None.
         
     Returns:
-        plt: Um objeto do tipo matplotlib.pyplot com o boxplot
+        Figure: A figura do matplotlib com o boxplot
     
     Example
     ----------
@@ -202,29 +219,23 @@ def create_boxplot_top_3_esportes_outliers(df: pd.DataFrame)-> plt:
     ...             19, 30, 55, 41]
     ... })
     >>> plot = create_boxplot_top_3_esportes_outliers(data)
-    >>> plot.__class__.__name__ == "module"
+    >>> plot.__class__.__name__ == "Figure"
     True
     """
     try:
-        esportes_extremos = highest_age_aplitude_sports(df)
+        contagem_extremos = age_outlier_counts(df, sketches)
         #  Top 3 esportes com mais outliers de idade
-        top_3_extremos =  sorted(esportes_extremos.items(), key=lambda item: item[1], reverse=True)[:3]
-        nomes_top_3 = [esporte for esporte, _ in top_3_extremos]    
+        nomes_top_3 = top_groups(contagem_extremos, 3)
 
         df_top_3_extremos =  df[df['Sport'].isin(nomes_top_3)]
         
-        # Criando o boxplot com os 3 esportes com mais outliers
-        plt.figure()
-        boxplots = sns.boxplot(x='Sport', y='Age', data=df_top_3_extremos)
-        boxplots.set_yscale('linear')
-
+        # Criando o boxplot com os 3 esportes com mais outliers, a partir dos resumos de cada esporte
+        resumos = grouped_box_summaries(df_top_3_extremos, 'Sport', 'Age', order=nomes_top_3, stats=age_summary(df_top_3_extremos, sketches))
 
-        # Adicionando título e rótulos
-        plt.title('Age Boxplot by Sport')
-        plt.xlabel('Sport')
-        plt.ylabel('Age')
+        # Título e rótulos
+        spec = ChartSpec('age_top_3_outliers', 'boxplot', title='Age Boxplot by Sport', xlabel='Sport', ylabel='Age', yscale='linear')
         
-        return plt
+        return chart(spec, pd.DataFrame(resumos), cache)
     except KeyError:
         print(
             f"The given dataframe doesn't have all needeed columns, consider replacing it")
@@ -234,15 +245,16 @@ def create_boxplot_top_3_esportes_outliers(df: pd.DataFrame)-> plt:
         quit()
 
 
-def create_boxplot_top_3_esportes_most_awarded(df: pd.DataFrame) -> plt:
+def create_boxplot_top_3_esportes_most_awarded(df: pd.DataFrame, cache: FrameCache = None) -> Figure:
     """Função que gera um boxplot  de idade com os  3 esportes
     mais premiados pro brasileiros.
     
     Args:
         df (pd.DataFrame): O DataFrame com os dados esportivos limpos.
+        cache (FrameCache, optional): Cache onde os resumos e o spec do gráfico são guardados ('age_top_3_most_awarded'). Defaults to None.
 
     Returns:
-        plt: Um objeto do tipo matplotlib.pyplot com o boxplot
+        Figure: A figura do matplotlib com o boxplot
     
     Example
     ----------
@@ -254,29 +266,27 @@ def create_boxplot_top_3_esportes_most_awarded(df: pd.DataFrame) -> plt:
     ...     'Age': [22, 24, 20, 23, 27, 26, 28, 25, 22, 24]
     ... })
     >>> plot = create_boxplot_top_3_esportes_most_awarded(df_example)
-    >>> plot.__class__.__name__ == "module"
+    >>> plot.__class__.__name__ == "Figure"
     True
     """
     try:
         #  Filtrando os atletas brasileiros
         atletas_brasileiros =  df[df['NOC'] == 'BRA']
         
-        medalhas_br_por_esporte = atletas_brasileiros.groupby('Sport')['Medal'].sum()
+        # Quantidade de medalhas (atletas premiados) por esporte, sem pesar o tipo da medalha
+        medalhas_br_por_esporte = medalist_mask(atletas_brasileiros).groupby(atletas_brasileiros['Sport']).sum()
         top_3_esportes = medalhas_br_por_esporte.sort_values(ascending=False).head(3)
         nome_dos_3_esportes_mais_premiados = top_3_esportes.index.tolist()
         
         df_top_3_mais =  atletas_brasileiros[atletas_brasileiros['Sport'].isin(nome_dos_3_esportes_mais_premiados)]
         
-        # Criando o boxplot com os 3 esportes com mais outliers
-        plt.figure()
-        sns.boxplot(x='Sport', y='Age', data=df_top_3_mais)
+        # Criando o boxplot com os 3 esportes mais premiados, a partir dos resumos de cada esporte
+        resumos = grouped_box_summaries(df_top_3_mais, 'Sport', 'Age', order=nome_dos_3_esportes_mais_premiados)
 
-        # Adicionando título e rótulos
-        plt.title('Boxplot of Ages of the Most Awarded Sports by Brazil')
-        plt.xlabel('Sport')
-        plt.ylabel('Age')
+        # Título e rótulos
+        spec = ChartSpec('age_top_3_most_awarded', 'boxplot', title='Boxplot of Ages of the Most Awarded Sports by Brazil', xlabel='Sport', ylabel='Age')
 
-        return plt
+        return chart(spec, pd.DataFrame(resumos), cache)
     except KeyError:
         print(
             f"The given dataframe doesn't have all needeed columns, consider replacing it")
@@ -284,15 +294,16 @@ def create_boxplot_top_3_esportes_most_awarded(df: pd.DataFrame) -> plt:
         quit()
         
 
-def create_boxplot_age_medal_status_brazil(df: pd.DataFrame) -> plt:
+def create_boxplot_age_medal_status_brazil(df: pd.DataFrame, cache: FrameCache = None) -> Figure:
     """Cria um boxplot de idade com as categorias atletas brasileiros premiados 
     e atletas brasileiros não premiados
     
     Args:
         df (pd.DataFrame): O DataFrame com os dados esportivos limpos.
+        cache (FrameCache, optional): Cache onde os resumos e o spec do gráfico são guardados ('age_medal_status_brazil'). Defaults to None.
 
     Returns:
-        plt: Um objeto do tipo matplotlib.pyplot com o boxplot
+        Figure: A figura do matplotlib com o boxplot
     
     Example
     ----------
@@ -303,31 +314,25 @@ def create_boxplot_age_medal_status_brazil(df: pd.DataFrame) -> plt:
     ...     'Age': [22, 24, 20, 23, 27, 26, 28, 25]
     ... })
     >>> plot = create_boxplot_age_medal_status_brazil(df_example)
-    >>> plot.__class__.__name__ == "module"
+    >>> plot.__class__.__name__ == "Figure"
     True
-        
-    Returns:
-        plt: Um objeto do tipo matplotlib.pyplot com o boxplot
     """
     try:   
-    #  Criando coluna que informa se o atleta foi premiado ou não
-        df.loc[:, 'Medal'] = df['Medal'].apply(lambda x: 1 if x in [1, 2, 3] else 0)
-
         #  Filtrando os atletas brasileiros
         atletas_brasileiros =  df[df['NOC'] == 'BRA']
         
+        #  Informação se o atleta foi premiado ou não (sem alterar o DataFrame recebido)
+        premiados = medalist_mask(atletas_brasileiros).astype(int)
+        
         # Criando os boxplots com as idades dos medalhistas e não medalhistas
-        plt.figure()
-        sns.boxplot(x='Medal', y='Age', data=atletas_brasileiros)
+        resumos = grouped_box_summaries(atletas_brasileiros.assign(Awarded=premiados), 'Awarded', 'Age',
+                                        order=[0, 1], labels={0: 'Not Awarded', 1: 'Awarded'})
 
-        # Adicionando título e rótulos
-        plt.title('Boxplot of Ages of Awarded and Non-Awarded Brazilian Athletes')
-        plt.xlabel('Was Awarded')
-        plt.xticks([0, 1], ['Not Awarded', 'Awarded'])
-        plt.ylabel('Age')
+        # Título e rótulos
+        spec = ChartSpec('age_medal_status_brazil', 'boxplot', title='Boxplot of Ages of Awarded and Non-Awarded Brazilian Athletes',
+                         xlabel='Was Awarded', ylabel='Age')
 
-        # Exibindo o gráfico
-        return plt
+        return chart(spec, pd.DataFrame(resumos), cache)
         
     except KeyError:
         print(
@@ -336,7 +341,7 @@ def create_boxplot_age_medal_status_brazil(df: pd.DataFrame) -> plt:
         quit()    
     
 
-def create_boxplot_age_by_medals_athletes_in_brazil(df: pd.DataFrame) -> plt:
+def create_boxplot_age_by_medals_athletes_in_brazil(df: pd.DataFrame) -> Figure:
     """Cria um boxplot com as idades dos atletas premiados pelo brasil e 
     categoriza por tipo de medalha 
 
@@ -344,7 +349,7 @@ def create_boxplot_age_by_medals_athletes_in_brazil(df: pd.DataFrame) -> plt:
         df (pd.DataFrame): dataframe limpo
 
     Returns:
-        plt:  Um objeto do tipo matplotlib.pyplot com o boxplot
+        Figure: A figura do matplotlib com o boxplot
     
     Example
     ----------
@@ -355,22 +360,22 @@ def create_boxplot_age_by_medals_athletes_in_brazil(df: pd.DataFrame) -> plt:
     ...     'Age': [22, 24, 20, 23, 27, 26, 28]
     ... })
     >>> plot = create_boxplot_age_by_medals_athletes_in_brazil(df_example)
-    >>> plot.__class__.__name__ == "module"
+    >>> plot.__class__.__name__ == "Figure"
     True
     """
     
     try:
         #  Filtrando os atletas brasileiros
         atletas_brasileiros =  df[df['NOC'] == 'BRA']
-        plt.figure()
-        sns.boxplot(x='Medal', y='Age', data=atletas_brasileiros)
+        fig, ax = create_figure()
+        sns.boxplot(x='Medal', y='Age', data=atletas_brasileiros, ax=ax)
 
         # Adicionando título e rótulos
-        plt.title('Age Boxplot of Brazilian Athletes by Medals')
-        plt.xlabel('Medal')
-        plt.ylabel('Age')
+        ax.set_title('Age Boxplot of Brazilian Athletes by Medals')
+        ax.set_xlabel('Medal')
+        ax.set_ylabel('Age')
 
-        return plt
+        return fig
     
 
     except KeyError:
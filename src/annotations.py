@@ -0,0 +1,146 @@
+"""Módulo com a camada de anotação dos gráficos: seleção dos pontos a rotular e posicionamento dos rótulos.
+
+Os conjuntos de rótulos (top k, bottom k, países específicos) são combinados sem repetição e posicionados
+a partir de arrays do NumPy, evitando sobreposição entre os rótulos.
+"""
+import doctest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# Deslocamentos candidatos (em múltiplos da altura e da largura do rótulo), na ordem de preferência
+_CANDIDATE_OFFSETS = np.array([[0, 0], [0, 1], [0, -1], [-1, 0], [-1, 1], [-1, -1], [0, 2], [0, -2]])
+
+
+def top_k(data: pd.DataFrame, column: str, k: int, largest: bool = True) -> np.ndarray:
+    """Retorna as posições das k linhas com maiores (ou menores) valores de uma coluna, ignorando NaN.
+
+    Args:
+        data (pd.DataFrame): DataFrame com os dados.
+        column (str): Coluna usada na ordenação.
+        k (int): Quantidade de linhas.
+        largest (bool, optional): Se True, pega os maiores valores; senão, os menores. Defaults to True.
+
+    Returns:
+        np.ndarray: Posições (iloc) das linhas selecionadas, em ordem de valor.
+
+    Example:
+    ----------
+    >>> data = pd.DataFrame({'Medalists': [3, 50, np.nan, 10]})
+    >>> top_k(data, 'Medalists', 2).tolist()
+    [1, 3]
+    >>> top_k(data, 'Medalists', 2, largest=False).tolist()
+    [0, 3]
+    """
+    values = data[column].to_numpy(dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    order = np.argsort(-values[valid] if largest else values[valid], kind='stable')
+    return valid[order[:k]]
+
+
+def merge_label_sets(label_sets: list) -> tuple:
+    """Combina conjuntos de rótulos, mantendo cada ponto uma única vez.
+
+    Quando um ponto aparece em mais de um conjunto, vale o estilo do último conjunto (o que seria desenhado por cima).
+
+    Args:
+        label_sets (list): Lista de tuplas (posições, cor, tamanho da fonte).
+
+    Returns:
+        tuple: Arrays com as posições, as cores e os tamanhos de fonte dos rótulos, ordenados pela posição.
+
+    Example:
+    ----------
+    >>> positions, colors, sizes = merge_label_sets([(np.array([0, 1]), 'green', 7), (np.array([1, 2]), 'red', 6)])
+    >>> positions.tolist(), colors.tolist(), sizes.tolist()
+    ([0, 1, 2], ['green', 'red', 'red'], [7, 6, 6])
+    """
+    if not label_sets:
+        return np.array([], dtype=int), np.array([], dtype=object), np.array([], dtype=float)
+
+    positions = np.concatenate([np.asarray(rows, dtype=int) for rows, _, _ in label_sets])
+    colors = np.concatenate([np.full(len(rows), color, dtype=object) for rows, color, _ in label_sets])
+    sizes = np.concatenate([np.full(len(rows), size) for rows, _, size in label_sets])
+
+    # Última ocorrência de cada posição
+    unique, last = np.unique(positions[::-1], return_index=True)
+    last = len(positions) - 1 - last
+    return unique, colors[last], sizes[last]
+
+
+def _overlaps(box: np.ndarray, boxes: np.ndarray) -> bool:
+    return bool(np.any((box[0] < boxes[:, 2]) & (boxes[:, 0] < box[2]) & (box[1] < boxes[:, 3]) & (boxes[:, 1] < box[3])))
+
+
+def place_labels(points: np.ndarray, widths: np.ndarray, heights: np.ndarray) -> np.ndarray:
+    """Escolhe, para cada rótulo, o primeiro deslocamento candidato que não sobrepõe os rótulos já posicionados.
+
+    Args:
+        points (np.ndarray): Coordenadas (em pixels) dos pontos, com formato (n, 2).
+        widths (np.ndarray): Larguras estimadas dos rótulos, em pixels.
+        heights (np.ndarray): Alturas estimadas dos rótulos, em pixels.
+
+    Returns:
+        np.ndarray: Deslocamentos (em pixels) de cada rótulo em relação ao seu ponto, com formato (n, 2).
+
+    Example:
+    ----------
+    >>> points = np.array([[0.0, 0.0], [1.0, 1.0]])
+    >>> place_labels(points, np.array([10.0, 10.0]), np.array([5.0, 5.0])).tolist()
+    [[0.0, 0.0], [0.0, 5.0]]
+    """
+    offsets = np.zeros_like(points, dtype=float)
+    placed = np.empty((len(points), 4))
+    for i, (point, width, height) in enumerate(zip(points, widths, heights)):
+        candidates = _CANDIDATE_OFFSETS * np.array([width, height])
+        for candidate in candidates:
+            x0, y0 = point + candidate
+            box = np.array([x0, y0, x0 + width, y0 + height])
+            if not _overlaps(box, placed[:i]):
+                break
+        else:
+            # Sem posição livre: mantém o rótulo sobre o ponto
+            candidate = candidates[0]
+            x0, y0 = point
+            box = np.array([x0, y0, x0 + width, y0 + height])
+        offsets[i] = candidate
+        placed[i] = box
+    return offsets
+
+
+def annotate_points(ax: plt.Axes, x: np.ndarray, y: np.ndarray, labels: np.ndarray, colors: np.ndarray, font_sizes: np.ndarray, weight: str = 'bold', avoid_overlap: bool = True) -> list:
+    """Escreve os rótulos dos pontos no gráfico, evitando sobreposição entre eles.
+
+    Args:
+        ax (plt.Axes): Eixo do gráfico, já com as escalas definidas.
+        x (np.ndarray): Coordenadas x dos pontos (em unidades dos dados).
+        y (np.ndarray): Coordenadas y dos pontos (em unidades dos dados).
+        labels (np.ndarray): Textos dos rótulos.
+        colors (np.ndarray): Cores dos rótulos.
+        font_sizes (np.ndarray): Tamanhos de fonte dos rótulos.
+        weight (str, optional): Peso da fonte. Defaults to 'bold'.
+        avoid_overlap (bool, optional): Se False, os rótulos ficam sobre os pontos. Defaults to True.
+
+    Returns:
+        list: Objetos de texto criados.
+    """
+    labels = np.asarray(labels, dtype=str)
+    font_sizes = np.asarray(font_sizes, dtype=float)
+    ax.autoscale_view()
+    points = ax.transData.transform(np.column_stack([x, y]).astype(float))
+
+    # Tamanho aproximado dos rótulos em pixels, a partir do tamanho da fonte em pontos
+    pixels_per_point = ax.figure.dpi / 72
+    heights = font_sizes * pixels_per_point
+    widths = 0.6 * heights * np.char.str_len(labels)
+    offsets = place_labels(points, widths, heights) if avoid_overlap else np.zeros_like(points)
+    offsets = offsets / pixels_per_point
+
+    return [
+        ax.annotate(label, (x_i, y_i), xytext=offset, textcoords='offset points', color=color, weight=weight, fontsize=size)
+        for label, x_i, y_i, offset, color, size in zip(labels, x, y, offsets, colors, font_sizes)
+    ]
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
@@ -0,0 +1,209 @@
+"""Módulo com o relatório dos atributos físicos para listas arbitrárias de países (NOC), esportes e atributos.
+
+A tabela de atletas é particionada uma única vez por (NOC, Sport) com o índice do groupby. As associações de
+todas as partições (R2 entre a medalha e cada atributo e correlação entre o ano e cada atributo) saem de uma
+única passada vetorizada; os boxplots de cada partição são descritos como figuras independentes, renderizadas
+no pool de processos do render_pool. Assim, um relatório com todos os países custa pouco mais que um só.
+"""
+import os
+import doctest
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from chart_spec import ChartSpec, FrameCache, chart
+from summary_boxplot import grouped_box_summaries
+from data_cleaner import medalist_mask
+from coeficient_functions import r2_by_group, corr_by_group
+from render_pool import FigureSpec
+from build_manifest import BuildManifest, build_figures
+
+ATTRIBUTES = ['Age', 'Height', 'Weight']
+REPORT_COLUMNS = ['NOC', 'Sport', 'attribute', 'qtd', 'r2_medal', 'corr_year']
+
+
+def create_medal_boxplot(df: pd.DataFrame, sport: str, attribute: str, noc: str = None, cache: FrameCache = None) -> Figure:
+    """Cria o boxplot de um atributo fisico dos atletas premiados e nao premiados, a partir dos resumos (quartis, bigodes e outliers).
+
+    Args:
+        df (pd.DataFrame): DataFrame com os atletas do esporte, com a coluna 'is_medalist' ou 'Medal'.
+        sport (str): Nome do esporte, usado no titulo.
+        attribute (str): Atributo fisico, ex.: 'Height' ou 'Weight'.
+        noc (str, optional): País dos atletas, usado no titulo e no nome do grafico. Defaults to None.
+        cache (FrameCache, optional): Cache onde os resumos e o spec sao guardados ('<sport>_<attribute>'). Defaults to None.
+
+    Returns:
+        Figure: Figura do matplotlib com o boxplot.
+    """
+    name, title = f'{sport}_{attribute}', f'{sport} - {attribute}'
+    if noc is not None:
+        name, title = f'{noc}_{name}', f'{title} ({noc})'
+    # Uma caixa para os nao premiados e outra para os premiados (qualquer medalha), sem alterar o DataFrame recebido
+    awarded = df.assign(Awarded=medalist_mask(df).astype(int))
+    summaries = grouped_box_summaries(awarded, 'Awarded', attribute, order=[0, 1], labels={0: 'Not Awarded', 1: 'Awarded'})
+    spec = ChartSpec(name, 'boxplot', title=title, xlabel='Was Awarded', ylabel=attribute)
+    return chart(spec, pd.DataFrame(summaries), cache)
+
+
+def _selection(df: pd.DataFrame, nocs: list, sports: list) -> np.ndarray:
+    rows = np.ones(len(df), dtype=bool)
+    if nocs is not None:
+        rows &= df['NOC'].isin(nocs).to_numpy()
+    if sports is not None:
+        rows &= df['Sport'].isin(sports).to_numpy()
+    return rows
+
+
+def select_athletes(df: pd.DataFrame, nocs: list = None, sports: list = None) -> pd.DataFrame:
+    """Filtra os atletas dos países e esportes pedidos.
+
+    Args:
+        df (pd.DataFrame): DataFrame dos atletas.
+        nocs (list, optional): Países (NOC). Defaults to None (todos).
+        sports (list, optional): Esportes. Defaults to None (todos).
+
+    Returns:
+        pd.DataFrame: Atletas selecionados.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'NOC': ['BRA', 'USA', 'BRA'], 'Sport': ['Judo', 'Judo', 'Golf']})
+    >>> select_athletes(df, nocs=['BRA']).index.tolist()
+    [0, 2]
+    """
+    rows = _selection(df, nocs, sports)
+    return df if rows.all() else df[rows]
+
+
+def partition_athletes(df: pd.DataFrame, nocs: list = None, sports: list = None) -> dict:
+    """Particiona os atletas por (NOC, Sport) com uma única passada do groupby.
+
+    Args:
+        df (pd.DataFrame): DataFrame dos atletas.
+        nocs (list, optional): Países (NOC). Defaults to None (todos).
+        sports (list, optional): Esportes. Defaults to None (todos).
+
+    Returns:
+        dict: Posições das linhas (em df) de cada partição (NOC, Sport), em ordem.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'NOC': ['BRA', 'USA', 'BRA'], 'Sport': ['Judo', 'Judo', 'Judo']})
+    >>> {key: positions.tolist() for key, positions in partition_athletes(df).items()}
+    {('BRA', 'Judo'): [0, 2], ('USA', 'Judo'): [1]}
+    """
+    rows = np.flatnonzero(_selection(df, nocs, sports))
+    indices = df.iloc[rows].groupby(['NOC', 'Sport'], sort=True).indices
+    return {key: rows[positions] for key, positions in indices.items()}
+
+
+def attributes_report(df: pd.DataFrame, nocs: list = None, sports: list = None, attributes: list = ATTRIBUTES) -> pd.DataFrame:
+    """Calcula, para cada (NOC, Sport, atributo), o R2 entre a medalha e o atributo e a correlação entre o ano e o atributo.
+
+    Args:
+        df (pd.DataFrame): DataFrame dos atletas, com a medalha já convertida (medals_to_int).
+        nocs (list, optional): Países (NOC). Defaults to None (todos).
+        sports (list, optional): Esportes. Defaults to None (todos).
+        attributes (list, optional): Atributos físicos. Defaults to ATTRIBUTES.
+
+    Returns:
+        pd.DataFrame: Uma linha por partição e atributo, com as colunas de REPORT_COLUMNS ('qtd' são as linhas com o atributo).
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'NOC': ['BRA'] * 4, 'Sport': ['Judo'] * 4, 'Medal': [0, 0, 3, 3],
+    ...                    'Year': [2000, 2004, 2008, 2012], 'Height': [170, 172, 180, 182]})
+    >>> attributes_report(df, attributes=['Height']).round(4).values.tolist()
+    [['BRA', 'Judo', 'Height', 4, 0.9615, 0.9648]]
+    """
+    df = select_athletes(df, nocs, sports)
+    r2_medal = r2_by_group(df, ['NOC', 'Sport'], 'Medal', attributes, False)
+    corr_year = corr_by_group(df, ['NOC', 'Sport'], 'Year', attributes, False)
+
+    report = r2_medal.rename(columns={'quanti': 'attribute', 'r2': 'r2_medal'})
+    report['corr_year'] = corr_year['corr'].to_numpy()
+    return report[REPORT_COLUMNS]
+
+
+def attributes_report_figures(df: pd.DataFrame, nocs: list = None, sports: list = None, attributes: list = ['Height', 'Weight'],
+                              directory: str = 'graphs/attributes_report', min_rows: int = 10) -> list:
+    """Lista os boxplots por medalha de cada (NOC, Sport, atributo), sem renderiza-los.
+
+    Cada figura recebe só as linhas e colunas da sua partição, para ser enviada barata a outro processo.
+
+    Args:
+        df (pd.DataFrame): DataFrame dos atletas, com a medalha já convertida (medals_to_int).
+        nocs (list, optional): Países (NOC). Defaults to None (todos).
+        sports (list, optional): Esportes. Defaults to None (todos).
+        attributes (list, optional): Atributos físicos. Defaults to ['Height', 'Weight'].
+        directory (str, optional): Pasta das figuras, com uma subpasta por país. Defaults to 'graphs/attributes_report'.
+        min_rows (int, optional): Quantidade mínima de atletas da partição para gerar os gráficos. Defaults to 10.
+
+    Returns:
+        list: Tuplas (caminho do arquivo, funcao que cria a figura, argumentos da funcao).
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'NOC': ['BRA'] * 10 + ['USA'], 'Sport': ['Judo'] * 11, 'Medal': [0, 3] * 5 + [1],
+    ...                    'Height': range(170, 181), 'Weight': range(60, 71)})
+    >>> [path for path, _, _ in attributes_report_figures(df)]
+    ['graphs/attributes_report/BRA/Judo_Height.png', 'graphs/attributes_report/BRA/Judo_Weight.png']
+    """
+    figures = []
+    for (noc, sport), positions in partition_athletes(df, nocs, sports).items():
+        if len(positions) < min_rows:
+            continue
+        partition = df.iloc[positions]
+        for attribute in attributes:
+            figures.append((os.path.join(directory, noc, f'{sport}_{attribute}.png'), create_medal_boxplot,
+                            (partition[['Medal', attribute]], sport, attribute, noc)))
+    return figures
+
+
+def prepare_attributes_report(df: pd.DataFrame, nocs: list = None, sports: list = None, attributes: list = ATTRIBUTES,
+                              directory: str = 'graphs/attributes_report') -> tuple:
+    """Grava a tabela de associações do relatório (CSV) e descreve os boxplots das partições, sem renderiza-los.
+
+    Args:
+        df (pd.DataFrame): DataFrame dos atletas, com a medalha já convertida (medals_to_int).
+        nocs (list, optional): Países (NOC). Defaults to None (todos).
+        sports (list, optional): Esportes. Defaults to None (todos).
+        attributes (list, optional): Atributos físicos da tabela e dos boxplots. Defaults to ATTRIBUTES.
+        directory (str, optional): Pasta do relatório. Defaults to 'graphs/attributes_report'.
+
+    Returns:
+        tuple: Tabela de associações (attributes_report) e a lista de FigureSpec dos boxplots.
+    """
+    report = attributes_report(df, nocs, sports, attributes)
+    os.makedirs(directory, exist_ok=True)
+    report.to_csv(os.path.join(directory, 'attributes_report.csv'), index=False)
+
+    specs = [FigureSpec(function, path, args) for path, function, args in attributes_report_figures(df, nocs, sports, attributes, directory)]
+    return report, specs
+
+
+def run_attributes_report(df: pd.DataFrame, nocs: list = None, sports: list = None, attributes: list = ATTRIBUTES,
+                          directory: str = 'graphs/attributes_report', force: bool = False, max_workers: int = None) -> tuple:
+    """Gera o relatório completo: a tabela de associações (CSV) e os boxplots das partições, em paralelo.
+
+    Só as figuras desatualizadas são renderizadas (manifesto em '<directory>/.build_manifest.json').
+
+    Args:
+        df (pd.DataFrame): DataFrame dos atletas, com a medalha já convertida (medals_to_int).
+        nocs (list, optional): Países (NOC). Defaults to None (todos).
+        sports (list, optional): Esportes. Defaults to None (todos).
+        attributes (list, optional): Atributos físicos. Defaults to ATTRIBUTES.
+        directory (str, optional): Pasta do relatório. Defaults to 'graphs/attributes_report'.
+        force (bool, optional): Se True, regenera todas as figuras. Defaults to False.
+        max_workers (int, optional): Número de processos do render_pool. Defaults to None (número de CPUs).
+
+    Returns:
+        tuple: Tabela de associações (attributes_report), relatório de tempos das figuras renderizadas e
+            a lista das figuras puladas por estarem atualizadas.
+    """
+    report, specs = prepare_attributes_report(df, nocs, sports, attributes, directory)
+    timing, skipped = build_figures(specs, BuildManifest(os.path.join(directory, '.build_manifest.json')), force, max_workers)
+    return report, timing, skipped
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
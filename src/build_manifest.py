@@ -0,0 +1,314 @@
+"""Módulo com o manifesto de build das figuras: regenera só os gráficos cujas entradas mudaram.
+
+Para cada arquivo de saída, o manifesto guarda uma impressão digital (hash) formada pelos dados de entrada
+(hash das linhas dos DataFrames e dos arquivos declarados em FigureSpec.inputs), pelo código-fonte do módulo da
+função que cria a figura e dos módulos do src que ele importa, e pelos parâmetros (argumentos, xlim/ylim/zlim, dpi
+do savefig...). Como no make, uma figura cujo arquivo existe e cuja impressão digital não mudou é pulada.
+
+Figuras sem dados nos argumentos e sem inputs (a função lê dados globais do módulo) não têm como ser rastreadas
+e são sempre renderizadas, como as figuras sem arquivo de saída.
+"""
+import os
+import sys
+import json
+import inspect
+import hashlib
+import doctest
+import numpy as np
+import pandas as pd
+from render_pool import FigureSpec, REPORT_COLUMNS, render_figures
+
+
+def _update_hash(digest, value, memo: dict) -> None:
+    # Tipos simples entram pelo repr, que é estável entre execuções
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        digest.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        # O mesmo DataFrame costuma ser usado por várias figuras: o hash das linhas é calculado uma vez por objeto
+        if id(value) not in memo:
+            memo[id(value)] = (value, data_fingerprint(value))
+        digest.update(f'data:{memo[id(value)][1]};'.encode())
+    elif isinstance(value, dict):
+        digest.update(b'dict{')
+        for key in sorted(value, key=repr):
+            _update_hash(digest, key, memo)
+            _update_hash(digest, value[key], memo)
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}['.encode())
+        for item in value:
+            _update_hash(digest, item, memo)
+        digest.update(b']')
+    elif callable(value):
+        digest.update(f'callable:{source_fingerprint(value)};'.encode())
+    else:
+        # Objetos sem representação estável (ex.: o escritor de checkpoints, o cache dos gráficos) não alteram a figura
+        digest.update(f'object:{type(value).__module__}.{type(value).__qualname__};'.encode())
+
+
+def data_fingerprint(data) -> str:
+    """Calcula o hash do conteúdo de um DataFrame, Series ou array (valores, índice, colunas e tipos).
+
+    Args:
+        data (pd.DataFrame | pd.Series | np.ndarray): Dados de entrada.
+
+    Returns:
+        str: Hash hexadecimal dos dados.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Year': [2012, 2016], 'Medal': [17, 19]})
+    >>> data_fingerprint(df) == data_fingerprint(df.copy()), data_fingerprint(df) == data_fingerprint(df.assign(Medal=[17, 20]))
+    (True, False)
+    """
+    digest = hashlib.sha256()
+    if isinstance(data, np.ndarray):
+        digest.update(f'{data.dtype}{data.shape}'.encode())
+        if data.dtype == object:
+            data = pd.Series(data.ravel())
+        else:
+            digest.update(np.ascontiguousarray(data).tobytes())
+            return digest.hexdigest()
+
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in data.dtypes.items()]).encode())
+    else:
+        digest.update(f'{data.name}:{data.dtype}'.encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _module_file(module) -> str:
+    path = getattr(module, '__file__', None)
+    return os.path.abspath(path) if path is not None and path.endswith('.py') else None
+
+
+def source_modules(module) -> list:
+    """Lista os arquivos do módulo e dos módulos do mesmo diretório que ele importa, direta ou indiretamente.
+
+    Os imports são obtidos dos objetos globais do módulo (módulos importados e funções ou classes importadas
+    com from ... import), então os módulos de bibliotecas externas ficam de fora.
+
+    Args:
+        module (module): Módulo da função que cria a figura.
+
+    Returns:
+        list: Caminhos absolutos dos arquivos .py, ordenados.
+
+    Example:
+    ----------
+    >>> import render_pool
+    >>> sorted(os.path.basename(path) for path in source_modules(render_pool))
+    ['figures.py', 'render_pool.py']
+    """
+    root = _module_file(module)
+    if root is None:
+        return []
+    directory = os.path.dirname(root)
+
+    files, pending = {root: module}, [module]
+    while pending:
+        for value in list(vars(pending.pop()).values()):
+            imported = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+            path = _module_file(imported)
+            if path is not None and path not in files and os.path.dirname(path) == directory:
+                files[path] = imported
+                pending.append(imported)
+    return sorted(files)
+
+
+def source_fingerprint(function) -> str:
+    """Calcula o hash do código-fonte do módulo de uma função e dos módulos do src que ele importa.
+
+    Os módulos inteiros entram no hash, para que mudanças nas funções auxiliares (do mesmo módulo ou dos módulos
+    que desenham as figuras, como chart_spec e summary_boxplot) também invalidem as figuras.
+
+    Args:
+        function (callable): Função que cria a figura.
+
+    Returns:
+        str: Hash hexadecimal do código-fonte (ou do nome da função, se o código não estiver disponível).
+    """
+    paths = source_modules(inspect.getmodule(function))
+    if not paths:
+        return hashlib.sha256(getattr(function, '__qualname__', repr(type(function))).encode()).hexdigest()
+
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as file:
+            digest.update(os.path.basename(path).encode() + b':' + hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    """Calcula a impressão digital de um arquivo de entrada pelo tamanho e pela data de modificação, como no make.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        str: Impressão digital do arquivo ('missing' se ele não existir).
+    """
+    if not os.path.exists(path):
+        return 'missing'
+    stat = os.stat(path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def _has_data(value) -> bool:
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return True
+    if isinstance(value, dict):
+        return any(_has_data(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_data(item) for item in value)
+    return False
+
+
+def is_tracked(spec: FigureSpec) -> bool:
+    """Verifica se as entradas de uma figura são conhecidas pelo manifesto: arquivo de saída e dados nos argumentos ou em inputs.
+
+    Args:
+        spec (FigureSpec): Especificação da figura.
+
+    Returns:
+        bool: True se a figura pode ser pulada quando estiver atualizada.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Medal': [1, 2]})
+    >>> is_tracked(FigureSpec(data_fingerprint, 'a.png', (df,))), is_tracked(FigureSpec(data_fingerprint, 'a.png'))
+    (True, False)
+    >>> is_tracked(FigureSpec(data_fingerprint, 'a.png', inputs=('data/athlete_events.csv',)))
+    True
+    """
+    return spec.path is not None and (bool(spec.inputs) or _has_data([spec.args, spec.kwargs]))
+
+
+def spec_fingerprint(spec: FigureSpec, memo: dict = None) -> str:
+    """Calcula a impressão digital de uma figura: dados de entrada, arquivos de entrada, código da função e parâmetros.
+
+    Args:
+        spec (FigureSpec): Especificação da figura.
+        memo (dict, optional): Hashes já calculados dos DataFrames, compartilhados entre as figuras. Defaults to None.
+
+    Returns:
+        str: Hash hexadecimal da figura.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Medal': [1, 2]})
+    >>> spec = FigureSpec(data_fingerprint, 'a.png', (df,), savefig={'dpi': 300})
+    >>> spec_fingerprint(spec) == spec_fingerprint(FigureSpec(data_fingerprint, 'a.png', (df.copy(),), savefig={'dpi': 300}))
+    True
+    >>> spec_fingerprint(spec) == spec_fingerprint(FigureSpec(data_fingerprint, 'a.png', (df,), savefig={'dpi': 500}))
+    False
+    """
+    memo = memo if memo is not None else {}
+    digest = hashlib.sha256()
+    _update_hash(digest, f'{spec.function.__module__}.{spec.function.__qualname__}', memo)
+    _update_hash(digest, spec.function, memo)
+    _update_hash(digest, [spec.args, spec.kwargs, spec.savefig], memo)
+    _update_hash(digest, [(path, file_fingerprint(path)) for path in spec.inputs], memo)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Manifesto com a impressão digital de cada arquivo de saída gerado.
+
+    Args:
+        path (str): Arquivo JSON do manifesto.
+
+    Example:
+    ----------
+    >>> import tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> output = os.path.join(directory, 'a.png')
+    >>> open(output, 'w').close()
+    >>> manifest = BuildManifest(os.path.join(directory, 'manifest.json'))
+    >>> manifest.record(output, 'abc')
+    >>> manifest.save()
+    >>> BuildManifest(manifest.path).is_current(output, 'abc'), BuildManifest(manifest.path).is_current(output, 'abd')
+    (True, False)
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.entries = json.load(file)
+
+    def is_current(self, output: str, fingerprint: str) -> bool:
+        """Verifica se o arquivo de saída existe e foi gerado com a mesma impressão digital.
+
+        Args:
+            output (str): Caminho do arquivo de saída.
+            fingerprint (str): Impressão digital atual da figura.
+
+        Returns:
+            bool: True se a figura não precisa ser regenerada.
+        """
+        return output is not None and self.entries.get(output) == fingerprint and os.path.exists(output)
+
+    def record(self, output: str, fingerprint: str) -> None:
+        """Registra a impressão digital de um arquivo de saída gerado.
+
+        Args:
+            output (str): Caminho do arquivo de saída.
+            fingerprint (str): Impressão digital da figura.
+        """
+        self.entries[output] = fingerprint
+
+    def save(self) -> None:
+        """Grava o manifesto; a escrita é feita em um arquivo temporário, para não corromper o manifesto anterior."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+def build_figures(specs: list, manifest: BuildManifest, force: bool = False, max_workers: int = None) -> tuple:
+    """Renderiza só as figuras desatualizadas e atualiza o manifesto.
+
+    Figuras sem arquivo de saída (a própria função salva os arquivos) ou sem entradas rastreáveis (is_tracked)
+    são sempre renderizadas.
+
+    Args:
+        specs (list): Lista de FigureSpec.
+        manifest (BuildManifest): Manifesto das figuras já geradas.
+        force (bool, optional): Se True, regenera todas as figuras. Defaults to False.
+        max_workers (int, optional): Número de processos do render_pool. Defaults to None.
+
+    Returns:
+        tuple: Relatório de tempos das figuras renderizadas (formato de render_pool.render_figures)
+            e a lista dos arquivos pulados por estarem atualizados.
+
+    Example:
+    ----------
+    >>> import tempfile
+    >>> report, skipped = build_figures([], BuildManifest(os.path.join(tempfile.mkdtemp(), 'manifest.json')))
+    >>> report.columns.tolist() == REPORT_COLUMNS, skipped
+    (True, [])
+    """
+    memo = {}
+    fingerprints = [spec_fingerprint(spec, memo) for spec in specs]
+    current = [not force and is_tracked(spec) and manifest.is_current(spec.path, fingerprint)
+               for spec, fingerprint in zip(specs, fingerprints)]
+
+    pending = [(spec, fingerprint) for spec, fingerprint, is_current in zip(specs, fingerprints, current) if not is_current]
+    skipped = [spec.path for spec, is_current in zip(specs, current) if is_current]
+
+    report = render_figures([spec for spec, _ in pending], max_workers)
+
+    for spec, fingerprint in pending:
+        if spec.path is not None:
+            manifest.record(spec.path, fingerprint)
+    manifest.save()
+    return report, skipped
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
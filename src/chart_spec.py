@@ -0,0 +1,391 @@
+"""Módulo com a camada declarativa dos gráficos: especificações serializáveis e o cache dos dados.
+
+Um gráfico é descrito por um ChartSpec (tipo de gráfico, DataFrame de origem, codificações das camadas,
+títulos, rótulos e limites) e desenhado por render_spec a partir de um FrameCache, que guarda os DataFrames
+intermediários já calculados pelas funções de análise. Mudar o título, as cores ou os limites de um gráfico
+é só alterar o spec (spec.replace(...)) e renderizar de novo: nenhum groupby é refeito.
+
+Com um diretório, o FrameCache também persiste os DataFrames (pickle) e os specs (JSON) em disco, permitindo
+regerar os gráficos em outra execução.
+"""
+import os
+import re
+import json
+import inspect
+import doctest
+import dataclasses
+import numpy as np
+import pandas as pd
+import seaborn as sns
+import matplotlib.pyplot as plt
+from dataclasses import dataclass, field
+from matplotlib.figure import Figure
+from checkpoint import checkpoint_path, load_checkpoint
+from figures import create_figure
+from annotations import annotate_points
+from summary_boxplot import summary_boxplot
+
+
+@dataclass
+class ChartSpec:
+    """Descrição serializável de um gráfico.
+
+    Args:
+        name (str): Nome do gráfico, usado como chave no cache.
+        kind (str): Tipo do gráfico: 'scatter', 'density', 'boxplot', 'heatmap', 'table' ou 'scatter3d'.
+        source (str, optional): Chave do DataFrame de origem no cache. Defaults to None (o próprio name).
+        layers (list, optional): Camadas do gráfico; cada uma é um dicionário de codificações (ex.: 'x', 'y')
+            e estilos (ex.: 'color', 'label') repassados à função de desenho. Defaults to [].
+        title (str, optional): Título do gráfico. Defaults to None.
+        xlabel (str, optional): Rótulo do eixo x. Defaults to None.
+        ylabel (str, optional): Rótulo do eixo y. Defaults to None.
+        xlim (tuple, optional): Limites do eixo x. Defaults to None.
+        ylim (tuple, optional): Limites do eixo y. Defaults to None.
+        xscale (str, optional): Escala do eixo x, ex.: 'log'. Defaults to None.
+        yscale (str, optional): Escala do eixo y. Defaults to None.
+        figsize (tuple, optional): Tamanho da figura. Defaults to None.
+        title_size (float, optional): Tamanho da fonte do título. Defaults to None.
+        legend (dict, optional): Argumentos da legenda (ex.: {'loc': 'upper left'}); None não desenha legenda. Defaults to None.
+        theme (dict, optional): Argumentos do sns.set_theme, aplicados só enquanto a figura é criada e desenhada
+            (color_codes é False por padrão, pois altera as cores do matplotlib fora do rcParams). Defaults to None.
+        options (dict, optional): Opções específicas do tipo de gráfico. Defaults to {}.
+
+    Example:
+    ----------
+    >>> spec = ChartSpec('idades', 'boxplot', title='Idades', ylim=(10, 60))
+    >>> ChartSpec.from_json(spec.to_json()) == spec.replace(ylim=[10, 60])
+    True
+    """
+    name: str
+    kind: str
+    source: str = None
+    layers: list = field(default_factory=list)
+    title: str = None
+    xlabel: str = None
+    ylabel: str = None
+    xlim: tuple = None
+    ylim: tuple = None
+    xscale: str = None
+    yscale: str = None
+    figsize: tuple = None
+    title_size: float = None
+    legend: dict = None
+    theme: dict = None
+    options: dict = field(default_factory=dict)
+
+    @property
+    def frame_key(self) -> str:
+        """str: Chave do DataFrame de origem no cache."""
+        return self.source if self.source is not None else self.name
+
+    def replace(self, **changes) -> 'ChartSpec':
+        """Retorna uma cópia do spec com os campos alterados, ex.: spec.replace(title='Novo título')."""
+        return dataclasses.replace(self, **changes)
+
+    def to_dict(self) -> dict:
+        """Converte o spec em um dicionário com tipos simples."""
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ChartSpec':
+        """Cria um spec a partir de um dicionário gerado por to_dict."""
+        return cls(**data)
+
+    def to_json(self) -> str:
+        """Serializa o spec em JSON."""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'ChartSpec':
+        """Cria um spec a partir do JSON gerado por to_json."""
+        return cls.from_dict(json.loads(text))
+
+
+class FrameCache:
+    """Cache dos DataFrames intermediários e dos specs dos gráficos.
+
+    Args:
+        directory (str, optional): Diretório para persistir o cache; None mantém tudo só em memória. Defaults to None.
+
+    Example:
+    ----------
+    >>> cache = FrameCache()
+    >>> cache.put('medalhas', pd.DataFrame({'Year': [2016], 'Medal': [3]}))
+    >>> 'medalhas' in cache, cache.get('medalhas')['Medal'].tolist()
+    (True, [3])
+    """
+    def __init__(self, directory: str = None) -> None:
+        self.directory = directory
+        self._frames = {}
+        self._specs = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _spec_path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.json')
+
+    def put(self, key: str, frame: pd.DataFrame) -> None:
+        """Guarda um DataFrame no cache (e em disco, se houver diretório).
+
+        Args:
+            key (str): Chave do DataFrame.
+            frame (pd.DataFrame): DataFrame a ser guardado.
+        """
+        self._frames[key] = frame
+        if self.directory is not None:
+            frame.to_pickle(checkpoint_path(self.directory, key))
+
+    def get(self, key: str) -> pd.DataFrame:
+        """Retorna um DataFrame do cache, lendo-o do disco se necessário.
+
+        Args:
+            key (str): Chave do DataFrame.
+
+        Returns:
+            pd.DataFrame: DataFrame guardado.
+
+        Raises:
+            KeyError: Se a chave não estiver no cache.
+        """
+        if key not in self._frames:
+            if self.directory is None or not os.path.exists(checkpoint_path(self.directory, key)):
+                raise KeyError(key)
+            self._frames[key] = load_checkpoint(self.directory, key)
+        return self._frames[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._frames or (self.directory is not None and os.path.exists(checkpoint_path(self.directory, key)))
+
+    def put_spec(self, spec: ChartSpec) -> None:
+        """Guarda o spec de um gráfico, pelo seu nome.
+
+        Args:
+            spec (ChartSpec): Spec do gráfico.
+        """
+        self._specs[spec.name] = spec
+        if self.directory is not None:
+            with open(self._spec_path(spec.name), 'w', encoding='utf-8') as file:
+                file.write(spec.to_json())
+
+    def get_spec(self, name: str) -> ChartSpec:
+        """Retorna o spec de um gráfico guardado no cache.
+
+        Args:
+            name (str): Nome do gráfico.
+
+        Returns:
+            ChartSpec: Spec do gráfico.
+
+        Raises:
+            KeyError: Se o gráfico não estiver no cache.
+        """
+        if name not in self._specs:
+            if self.directory is None or not os.path.exists(self._spec_path(name)):
+                raise KeyError(name)
+            with open(self._spec_path(name), encoding='utf-8') as file:
+                self._specs[name] = ChartSpec.from_json(file.read())
+        return self._specs[name]
+
+
+def chart_name(text: str) -> str:
+    """Gera um nome de gráfico (chave do cache e nome de arquivo) a partir de um texto, ex.: o título.
+
+    Args:
+        text (str): Texto de origem.
+
+    Returns:
+        str: Nome em minúsculas, só com letras, números e '_'.
+
+    Example:
+    ----------
+    >>> chart_name("Scatter Plot: Men's Score X Women's Score (Brazil)")
+    'scatter_plot_men_s_score_x_women_s_score_brazil'
+    """
+    return re.sub(r'[^0-9a-z]+', '_', text.lower()).strip('_')
+
+
+# Funções de desenho de cada tipo de gráfico e os argumentos dos eixos que elas exigem
+_RENDERERS = {}
+
+
+def register_renderer(kind: str, subplot_kw: dict = None):
+    """Registra a função que desenha um tipo de gráfico, com assinatura (ax, frame, spec).
+
+    Args:
+        kind (str): Tipo do gráfico.
+        subplot_kw (dict, optional): Argumentos da criação do eixo, ex.: {'projection': '3d'}. Defaults to None.
+    """
+    def decorator(function):
+        _RENDERERS[kind] = (function, subplot_kw)
+        return function
+    return decorator
+
+
+def _apply_axes(ax, spec: ChartSpec) -> None:
+    if spec.xscale is not None:
+        ax.set_xscale(spec.xscale)
+    if spec.yscale is not None:
+        ax.set_yscale(spec.yscale)
+    if spec.xlim is not None:
+        ax.set_xlim(spec.xlim)
+    if spec.ylim is not None:
+        ax.set_ylim(spec.ylim)
+    if spec.xlabel is not None:
+        ax.set_xlabel(spec.xlabel)
+    if spec.ylabel is not None:
+        ax.set_ylabel(spec.ylabel)
+    if spec.title is not None:
+        ax.set_title(spec.title, fontsize=spec.title_size)
+    if spec.legend is not None:
+        ax.legend(**spec.legend)
+
+
+@register_renderer('scatter')
+def _render_scatter(ax, frame: pd.DataFrame, spec: ChartSpec) -> None:
+    for layer in spec.layers:
+        layer = dict(layer)
+        text, text_color, text_size = layer.pop('text', None), layer.pop('text_color', None), layer.pop('text_size', None)
+        sns.scatterplot(data=frame, ax=ax, **layer)
+
+        if text is not None:
+            # Rótulos só nas linhas com texto, depois das escalas definidas (o posicionamento é feito em pixels)
+            _apply_axes(ax, spec)
+            labeled = frame[frame[text].notna()]
+            annotate_points(ax, labeled[layer['x']].to_numpy(), labeled[layer['y']].to_numpy(), labeled[text].to_numpy(),
+                            labeled[text_color].to_numpy(), labeled[text_size].to_numpy())
+
+
+@register_renderer('density')
+def _render_density(ax, frame: pd.DataFrame, spec: ChartSpec) -> None:
+    # O DataFrame é a grade de contagens de density.density_grid; os limites das células vêm das opções
+    options = dict(spec.options)
+    xedges, yedges = options.pop('xedges'), options.pop('yedges')
+    colorbar = options.pop('colorbar', None)
+
+    # Células vazias ficam transparentes (também evita log(0) com norm='log')
+    counts = np.ma.masked_less_equal(frame.to_numpy(dtype=float), 0)
+    mesh = ax.pcolormesh(xedges, yedges, counts, **options)
+    if colorbar is not None:
+        ax.figure.colorbar(mesh, ax=ax, label=colorbar)
+
+
+@register_renderer('boxplot')
+def _render_boxplot(ax, frame: pd.DataFrame, spec: ChartSpec) -> None:
+    # Cada linha do DataFrame é o resumo de uma caixa (formato de summary_boxplot.box_summaries)
+    summary_boxplot(frame.to_dict(orient='records'), ax=ax, **spec.options)
+
+
+@register_renderer('heatmap')
+def _render_heatmap(ax, frame: pd.DataFrame, spec: ChartSpec) -> None:
+    sns.heatmap(frame, ax=ax, **spec.options)
+
+
+@register_renderer('table')
+def _render_table(ax, frame: pd.DataFrame, spec: ChartSpec) -> None:
+    ax.axis('tight')
+    ax.axis('off')
+    table = ax.table(cellText=frame.values, colLabels=frame.columns, cellLoc='center', loc='center')
+    table.auto_set_font_size(False)
+    table.set_fontsize(spec.options.get('fontsize', 12))
+    table.scale(*spec.options.get('scale', (1.2, 1.2)))
+
+
+@register_renderer('scatter3d', subplot_kw={'projection': '3d'})
+def _render_scatter3d(ax, frame: pd.DataFrame, spec: ChartSpec) -> None:
+    for layer in spec.layers:
+        layer = dict(layer)
+        ax.scatter(frame[layer.pop('x')], frame[layer.pop('y')], frame[layer.pop('z')], **layer)
+
+    options = spec.options
+    if 'zlabel' in options:
+        ax.set_zlabel(options['zlabel'])
+    if options.get('zlim') is not None:
+        ax.set_zlim(options['zlim'])
+    if 'view' in options:
+        ax.view_init(**options['view'])
+    if 'facecolor' in options:
+        ax.set_facecolor(options['facecolor'])
+
+
+def render_spec(spec: ChartSpec, cache: FrameCache) -> Figure:
+    """Desenha um gráfico a partir do seu spec e do DataFrame guardado no cache.
+
+    Args:
+        spec (ChartSpec): Spec do gráfico.
+        cache (FrameCache): Cache com o DataFrame de origem.
+
+    Returns:
+        Figure: Figura do matplotlib com o gráfico.
+
+    Raises:
+        ValueError: Se o tipo do gráfico não tiver função de desenho registrada.
+
+    Example:
+    ----------
+    >>> cache = FrameCache()
+    >>> cache.put('anos', pd.DataFrame({'Year': [2012, 2016], 'Medal': [17, 19]}))
+    >>> spec = ChartSpec('medalhas', 'scatter', source='anos', layers=[{'x': 'Year', 'y': 'Medal'}], title='Medalhas')
+    >>> render_spec(spec.replace(title='Medalhas do Brasil'), cache).axes[0].get_title()
+    'Medalhas do Brasil'
+    """
+    if spec.kind not in _RENDERERS:
+        raise ValueError(f'Unknown chart kind: {spec.kind}')
+    renderer, subplot_kw = _RENDERERS[spec.kind]
+
+    # O tema vale só para esta figura: o rcParams do processo é restaurado ao sair do contexto
+    with plt.rc_context():
+        if spec.theme is not None:
+            sns.set_theme(**{'color_codes': False, **spec.theme})
+        fig, ax = create_figure(figsize=spec.figsize, subplot_kw=subplot_kw)
+        renderer(ax, cache.get(spec.frame_key), spec)
+        _apply_axes(ax, spec)
+    return fig
+
+
+def chart(spec: ChartSpec, frame: pd.DataFrame, cache: FrameCache = None) -> Figure:
+    """Guarda o DataFrame e o spec de um gráfico no cache e o desenha.
+
+    É o ponto de saída das funções de gráfico das análises: depois de calcular os dados, elas descrevem o
+    gráfico com um spec e chamam chart. Com o cache, o gráfico pode ser regerado depois só com render_spec.
+
+    Args:
+        spec (ChartSpec): Spec do gráfico.
+        frame (pd.DataFrame): DataFrame de origem, já calculado.
+        cache (FrameCache, optional): Cache onde o DataFrame e o spec são guardados. Defaults to None (cache temporário).
+
+    Returns:
+        Figure: Figura do matplotlib com o gráfico.
+    """
+    cache = cache if cache is not None else FrameCache()
+    cache.put(spec.frame_key, frame)
+    cache.put_spec(spec)
+    return render_spec(spec, cache)
+
+
+def attach_cache(figure_specs: list, cache: FrameCache) -> list:
+    """Passa o cache, como argumento nomeado, às figuras cujas funções têm o parâmetro cache.
+
+    Os argumentos posicionais das figuras não devem incluir o cache: ele é sempre adicionado aos argumentos nomeados.
+
+    Args:
+        figure_specs (list): Figuras a renderizar (render_pool.FigureSpec).
+        cache (FrameCache): Cache dos dados e specs dos gráficos.
+
+    Returns:
+        list: As mesmas figuras, com o cache nos argumentos nomeados das que o aceitam.
+
+    Example:
+    ----------
+    >>> from render_pool import FigureSpec
+    >>> specs = attach_cache([FigureSpec(chart, args=(ChartSpec('a', 'table'), pd.DataFrame())), FigureSpec(create_figure)], FrameCache())
+    >>> ['cache' in spec.kwargs for spec in specs]
+    [True, False]
+    """
+    for spec in figure_specs:
+        if 'cache' in inspect.signature(spec.function).parameters:
+            spec.kwargs = {**spec.kwargs, 'cache': cache}
+    return figure_specs
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
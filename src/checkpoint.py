@@ -0,0 +1,127 @@
+"""Módulo com o escritor assíncrono de checkpoints dos DataFrames intermediários das análises.
+
+Os checkpoints são opcionais: as funções de análise só escrevem quando recebem um CheckpointWriter.
+Os DataFrames são serializados em formato binário (pickle do pandas) por uma thread em segundo plano,
+sem bloquear o cálculo das análises.
+"""
+import os
+import queue
+import warnings
+import threading
+import doctest
+import pandas as pd
+
+
+class CheckpointWriter:
+    """Escritor de checkpoints que serializa DataFrames em uma thread em segundo plano.
+
+    Args:
+        directory (str): Diretório onde os checkpoints serão salvos.
+
+    Example:
+    ----------
+    >>> import tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> writer = CheckpointWriter(directory)
+    >>> writer.save(pd.DataFrame({'Year': [2016], 'Medal': [3]}), 'exemplo')
+    >>> writer.close()
+    []
+    >>> load_checkpoint(directory, 'exemplo')['Medal'].tolist()
+    [3]
+    """
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.errors = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name='checkpoint-writer', daemon=True)
+        self._thread.start()
+
+    def save(self, df: pd.DataFrame, name: str) -> None:
+        """Agenda a escrita de um checkpoint e retorna imediatamente.
+
+        Uma cópia do DataFrame é enfileirada, para que alterações posteriores do chamador não afetem o checkpoint.
+
+        Args:
+            df (pd.DataFrame): DataFrame a ser salvo.
+            name (str): Nome do checkpoint (sem extensão).
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError('The checkpoint writer is closed')
+        self._queue.put((df.copy(), name))
+
+    def flush(self) -> None:
+        """Bloqueia até que todos os checkpoints agendados tenham sido escritos."""
+        self._queue.join()
+
+    def close(self, warn: bool = True) -> list:
+        """Escreve os checkpoints pendentes e encerra a thread de escrita.
+
+        Args:
+            warn (bool, optional): Se True, emite um RuntimeWarning para cada checkpoint que falhou. Defaults to True.
+
+        Returns:
+            list: Tuplas (nome do checkpoint, exceção) dos checkpoints que não puderam ser escritos.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            if warn:
+                for name, error in self.errors:
+                    warnings.warn(f'Checkpoint {name!r} was not written: {error!r}', RuntimeWarning, stacklevel=2)
+        return self.errors
+
+    def _worker(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                df, name = item
+                df.to_pickle(checkpoint_path(self.directory, name))
+            except Exception as error:
+                # Um checkpoint com erro não deve derrubar a análise
+                self.errors.append((item[1], error))
+            finally:
+                self._queue.task_done()
+
+    def __enter__(self) -> 'CheckpointWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def checkpoint_path(directory: str, name: str) -> str:
+    """Retorna o caminho do arquivo de um checkpoint.
+
+    Args:
+        directory (str): Diretório dos checkpoints.
+        name (str): Nome do checkpoint.
+
+    Returns:
+        str: Caminho do arquivo binário do checkpoint.
+
+    Example:
+    ----------
+    >>> checkpoint_path('data/df_checkpoints', 'athletes_agregados').replace(os.sep, '/')
+    'data/df_checkpoints/athletes_agregados.pkl'
+    """
+    return os.path.join(directory, f'{name}.pkl')
+
+
+def load_checkpoint(directory: str, name: str) -> pd.DataFrame:
+    """Carrega um checkpoint salvo por um CheckpointWriter.
+
+    Args:
+        directory (str): Diretório dos checkpoints.
+        name (str): Nome do checkpoint.
+
+    Returns:
+        pd.DataFrame: DataFrame salvo no checkpoint.
+    """
+    return pd.read_pickle(checkpoint_path(directory, name))
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
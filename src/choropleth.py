@@ -0,0 +1,192 @@
+"""Módulo com o renderizador de mapas coropléticos em lote.
+
+As geometrias dos países são convertidas uma única vez em caminhos (Path) do matplotlib; cada mapa
+apenas recolore essa coleção com os valores de um indicador. O atlas de vários indicadores/anos é
+renderizado em paralelo em um pool de processos, e cada processo recebe os caminhos já prontos.
+"""
+import os
+import functools
+import doctest
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import matplotlib
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+from shapely.geometry.polygon import orient
+from world_geometry import load_world_geometry, world_shapefile
+from figures import create_figure, save_figure
+
+
+def _polygon_path(polygon) -> Path:
+    # Buracos com orientação oposta à borda externa, para o preenchimento nonzero do matplotlib
+    polygon = orient(polygon)
+    rings = [polygon.exterior, *polygon.interiors]
+    return Path.make_compound_path(*[Path(np.asarray(ring.coords)[:, :2], closed=True) for ring in rings])
+
+
+def geometry_path(geometry) -> Path:
+    """Converte uma geometria (Polygon ou MultiPolygon) em um único Path do matplotlib.
+
+    Args:
+        geometry: Geometria do shapely.
+
+    Returns:
+        Path: Caminho composto com todos os anéis da geometria.
+
+    Example:
+    ----------
+    >>> from shapely.geometry import box
+    >>> geometry_path(box(0, 0, 1, 1)).get_extents().bounds
+    (0.0, 0.0, 1.0, 1.0)
+    """
+    if geometry is None or geometry.is_empty:
+        return Path(np.empty((0, 2)))
+    if geometry.geom_type == 'Polygon':
+        return _polygon_path(geometry)
+    return Path.make_compound_path(*[_polygon_path(polygon) for polygon in geometry.geoms])
+
+
+class ChoroplethRenderer:
+    """Renderizador que reaproveita os caminhos das geometrias para desenhar vários mapas.
+
+    Args:
+        world (gpd.GeoDataFrame): Geometrias indexadas pela chave do país.
+    """
+    def __init__(self, world: gpd.GeoDataFrame) -> None:
+        self.index = world.index
+        self.paths = [geometry_path(geometry) for geometry in world.geometry]
+        self.bounds = world.total_bounds
+
+        # Mesma proporção usada pelo GeoPandas em coordenadas geográficas
+        if world.crs is not None and world.crs.is_geographic:
+            self.aspect = 1 / np.cos(np.radians((self.bounds[1] + self.bounds[3]) / 2))
+        else:
+            self.aspect = 'equal'
+
+    def plot(self, values: pd.Series, ax: plt.Axes, cmap: str = 'Blues', missing_color: str = 'lightgrey', linewidth: float = 0.25, edgecolor: str = 'black', vmin: float = None, vmax: float = None) -> PathCollection:
+        """Desenha o mapa com as geometrias coloridas pelos valores dados.
+
+        Args:
+            values (pd.Series): Valores indexados pela chave do país; países ausentes ou NaN usam missing_color.
+            ax (plt.Axes): Eixo onde o mapa será desenhado.
+            cmap (str, optional): Mapa de cores. Defaults to 'Blues'.
+            missing_color (str, optional): Cor dos países sem valor. Defaults to 'lightgrey'.
+            linewidth (float, optional): Espessura das bordas. Defaults to 0.25.
+            edgecolor (str, optional): Cor das bordas. Defaults to 'black'.
+            vmin (float, optional): Valor mínimo da escala de cores. Defaults to None (mínimo dos valores).
+            vmax (float, optional): Valor máximo da escala de cores. Defaults to None (máximo dos valores).
+
+        Returns:
+            PathCollection: Coleção desenhada no eixo.
+        """
+        array = pd.to_numeric(values.reindex(self.index), errors='coerce').to_numpy(dtype=float)
+        collection = PathCollection(self.paths, linewidths=linewidth, edgecolors=edgecolor)
+        collection.set_array(np.ma.masked_invalid(array))
+        collection.set_cmap(matplotlib.colormaps[cmap].with_extremes(bad=missing_color))
+        collection.set_clim(vmin, vmax)
+
+        ax.add_collection(collection, autolim=False)
+        ax.set_xlim(self.bounds[0], self.bounds[2])
+        ax.set_ylim(self.bounds[1], self.bounds[3])
+        ax.set_aspect(self.aspect)
+        return collection
+
+
+def world_renderer(shapefile: str = None, crs: str = None, tolerance: float = 0.0, cache_dir: str = None) -> ChoroplethRenderer:
+    """Retorna o renderizador das geometrias do mundo, criado uma única vez por processo.
+
+    Args:
+        shapefile (str, optional): Caminho do shapefile. Defaults to None (world_geometry.world_shapefile()).
+        crs (str, optional): Sistema de coordenadas das geometrias. Defaults to None.
+        tolerance (float, optional): Tolerância da simplificação. Defaults to 0.0.
+        cache_dir (str, optional): Diretório do cache em disco das geometrias. Defaults to None (world_geometry.world_cache_dir()).
+
+    Returns:
+        ChoroplethRenderer: Renderizador com os caminhos das geometrias.
+    """
+    # O caminho padrão depende do diretório dos dados: o renderizador é guardado pelo caminho resolvido
+    return _world_renderer(shapefile if shapefile is not None else world_shapefile(), crs, tolerance, cache_dir)
+
+
+@functools.lru_cache(maxsize=None)
+def _world_renderer(shapefile: str, crs: str, tolerance: float, cache_dir: str) -> ChoroplethRenderer:
+    return ChoroplethRenderer(load_world_geometry(shapefile, crs, tolerance, cache_dir))
+
+
+def indicator_by_year(data: pd.DataFrame, value_column: str, key: str = 'Country', by: str = 'Year') -> pd.DataFrame:
+    """Organiza um indicador em formato largo, com uma coluna por ano, para renderizar um atlas.
+
+    Args:
+        data (pd.DataFrame): DataFrame com as colunas key, by e value_column.
+        value_column (str): Coluna do indicador.
+        key (str, optional): Coluna com a chave do país. Defaults to 'Country'.
+        by (str, optional): Coluna que separa os mapas. Defaults to 'Year'.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado pela chave do país, com colunas '<value_column>_<by>'.
+
+    Example:
+    ----------
+    >>> data = pd.DataFrame({'Country': ['Brazil', 'Brazil', 'Chile'], 'Year': [2012, 2016, 2016], 'Medal': [17, 19, 0]})
+    >>> indicator_by_year(data, 'Medal').columns.tolist()
+    ['Medal_2012', 'Medal_2016']
+    """
+    wide = data.pivot_table(index=key, columns=by, values=value_column, aggfunc='sum')
+    wide.columns = [f'{value_column}_{column}' for column in wide.columns]
+    return wide
+
+
+# Renderizador de cada processo do pool, recebido uma única vez na inicialização
+_worker_renderer = None
+
+
+def _init_atlas_worker(renderer: ChoroplethRenderer) -> None:
+    global _worker_renderer
+    matplotlib.use('Agg')
+    _worker_renderer = renderer
+
+
+def _draw_map(renderer: ChoroplethRenderer, column: str, values: pd.Series, path: str, cmap: str, dpi: int, figsize: tuple) -> str:
+    fig, ax = create_figure(figsize=figsize)
+    renderer.plot(values, ax=ax, cmap=cmap)
+    ax.set_title(column)
+    return save_figure(fig, path, dpi=dpi, bbox_inches='tight')
+
+
+def _render_map(*task) -> str:
+    return _draw_map(_worker_renderer, *task)
+
+
+def render_atlas(indicators: pd.DataFrame, output_dir: str, renderer: ChoroplethRenderer = None, cmap: str = 'Blues', dpi: int = 150, figsize: tuple = (10, 5), max_workers: int = None) -> list:
+    """Renderiza um mapa (PNG) para cada coluna de indicadores, em paralelo.
+
+    Args:
+        indicators (pd.DataFrame): DataFrame indexado pela chave do país, com uma coluna por mapa.
+        output_dir (str): Diretório onde os PNGs serão salvos, com o nome de cada coluna.
+        renderer (ChoroplethRenderer, optional): Renderizador das geometrias. Defaults to None (world_renderer()).
+        cmap (str, optional): Mapa de cores. Defaults to 'Blues'.
+        dpi (int, optional): Resolução dos PNGs. Defaults to 150.
+        figsize (tuple, optional): Tamanho das figuras. Defaults to (10, 5).
+        max_workers (int, optional): Número de processos; 1 renderiza no processo atual. Defaults to None (número de CPUs).
+
+    Returns:
+        list: Caminhos dos PNGs gerados, na ordem das colunas.
+    """
+    renderer = renderer if renderer is not None else world_renderer()
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(column, indicators[column], os.path.join(output_dir, f'{column}.png'), cmap, dpi, figsize) for column in indicators.columns]
+
+    if not tasks:
+        return []
+    if max_workers == 1:
+        return [_draw_map(renderer, *task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_atlas_worker, initargs=(renderer,)) as executor:
+        return list(executor.map(_render_map, *zip(*tasks)))
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
@@ -3,7 +3,6 @@ import numpy as np
 import pandas as pd
 import doctest
 import math
-from sklearn.feature_selection import SelectKBest, chi2
 
 
 def r2(df: pd.DataFrame, quali: str, quanti: str, is_sample: bool = True) -> float:
@@ -59,6 +58,78 @@ def r2(df: pd.DataFrame, quali: str, quanti: str, is_sample: bool = True) -> flo
     return r2
 
 
+def _numeric_values(df: pd.DataFrame, columns: list) -> np.ndarray:
+    # Valida as colunas e converte para uma matriz float64; NaN sao permitidos, textos nao
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise KeyError(f'Columns {missing} aren\'t on the columns')
+    values = df[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    if (np.isnan(values) & df[columns].notna().to_numpy()).any():
+        raise ValueError('Quanti columns have non-numeric values')
+    return values
+
+
+def r2_matrix(df: pd.DataFrame, qualis: list, quantis: list, is_sample: bool = True) -> pd.DataFrame:
+    """ Funcao que calcula o coeficiente R2 (eta quadrado) para todos os pares de variaveis qualitativas e quantitativas
+
+    Para cada variavel qualitativa, as contagens, somas e somas dos quadrados de todas as colunas quantitativas sao
+    agregadas por categoria em uma unica passada (np.bincount), com os valores centralizados na media da coluna para
+    evitar perda de precisao. Valores ausentes sao ignorados par a par: cada coeficiente usa as linhas com a coluna
+    quantitativa preenchida e, nos grupos, as linhas com a categoria preenchida.
+
+    Args:
+        df (pd.DataFrame): Dataframe com todos os dados
+        qualis (list): Colunas com as variaveis qualitativas
+        quantis (list): Colunas com as variaveis quantitativas
+        is_sample (bool, optional): Informacao se os dados sao de uma amostra ou nao (de uma populacao). Defaults to True.
+
+    Returns:
+        pd.DataFrame: Coeficientes R2, com as variaveis qualitativas nas linhas e as quantitativas nas colunas
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'qualitativa': ['A', 'A', 'B', 'B', 'C', 'C'],
+    ...     'outra': ['X', 'Y', 'X', 'Y', 'X', 'Y'],
+    ...     'quantitativa': [1, 2, 3, 4, 5, 6],
+    ...     'dobro': [2, 4, 6, 8, 10, np.nan]
+    ... })
+    >>> r2_matrix(df, ['qualitativa', 'outra'], ['quantitativa', 'dobro']).round(4)
+                 quantitativa  dobro
+    qualitativa        0.8571   0.84
+    outra             -0.1429  -0.28
+    """
+    ddof = int(is_sample)
+    values = _numeric_values(df, list(quantis))
+    valid = ~np.isnan(values)
+
+    # Variancia geral de cada coluna, com os valores centralizados na media
+    count = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centered = np.where(valid, values - np.nansum(values, axis=0) / count, 0.0)
+        var_geral = (centered ** 2).sum(axis=0) / (count - ddof)
+
+    result = np.empty((len(qualis), len(quantis)))
+    for row, quali in enumerate(qualis):
+        if quali not in df.columns:
+            raise KeyError(f'Column {quali} isn\'t on the columns')
+        codes, categories = pd.factorize(df[quali])
+        keep = codes >= 0
+        for column in range(len(quantis)):
+            rows = keep & valid[:, column]
+            qtd = np.bincount(codes[rows], minlength=len(categories)).astype(np.float64)
+            soma = np.bincount(codes[rows], weights=centered[rows, column], minlength=len(categories))
+            soma_quadrados = np.bincount(codes[rows], weights=centered[rows, column] ** 2, minlength=len(categories))
+
+            # Variancia de cada categoria; categorias com poucos valores para a variancia sao ignoradas (como no r2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                var = (soma_quadrados - soma ** 2 / qtd) / (qtd - ddof)
+                var_ponderada = np.sum(np.where(qtd > ddof, var * qtd, 0.0)) / qtd.sum()
+                result[row, column] = 1 - var_ponderada / var_geral[column]
+
+    return pd.DataFrame(result, index=list(qualis), columns=list(quantis))
+
+
 def corr(df: pd.DataFrame, quanti_1: str, quanti_2: str, is_sample: bool = True) -> float:
     """ Funcao que calcula o coeficiente de correlacao, que quantifica a associacao entre duas variaveis quantitativas
 
@@ -78,30 +149,511 @@ def corr(df: pd.DataFrame, quanti_1: str, quanti_2: str, is_sample: bool = True)
     ...     'y': [2, 4, 6, 8, 10]
     ... })
     >>> corr(df, 'x', 'y')
-    0.9999999999999998
+    1.0
 
     >>> df2 = pd.DataFrame({
     ...     'a': [1, 2, 3, 4, 5],
     ...     'b': [5, 4, 3, 2, 1]
     ... })
     >>> corr(df2, 'a', 'b')
-    -0.9999999999999998
+    -1.0
     """
-    is_sample = int(is_sample)
-    # Calcula a covariancia das variaveis e os desvios padrao
-    quanti_1_center = df[quanti_1] - df[quanti_1].mean()
-    quanti_2_center = df[quanti_2] - df[quanti_2].mean()
+    # Coeficiente do par na matriz de correlacao (linhas com algum valor ausente no par sao ignoradas)
+    return corr_matrix(df, [quanti_1, quanti_2], is_sample).iloc[0, 1]
+
+
+
+def corr_matrix(df: pd.DataFrame, columns: list, is_sample: bool = True) -> pd.DataFrame:
+    """ Funcao que calcula a matriz de correlacao de Pearson entre varias variaveis quantitativas
+
+    Cada par usa somente as linhas em que as duas variaveis estao preenchidas. Os valores sao centralizados na media de
+    cada coluna e todas as somas (contagens, somas, somas dos quadrados e produtos cruzados) de todos os pares saem de
+    produtos de matrizes (BLAS) sobre um unico array float64.
+
+    Args:
+        df (pd.DataFrame): Dataframe com todos os dados
+        columns (list): Colunas com as variaveis quantitativas
+        is_sample (bool, optional): Informacao se os dados sao de uma amostra ou nao (de uma populacao). Defaults to True.
+
+    Returns:
+        pd.DataFrame: Matriz de correlacao, com as variaveis nas linhas e nas colunas
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'x': [1, 2, 3, 4, 5],
+    ...     'y': [2, 4, 6, 8, np.nan],
+    ...     'z': [5, 4, 3, 2, 1]
+    ... })
+    >>> corr_matrix(df, ['x', 'y', 'z'])
+         x    y    z
+    x  1.0  1.0 -1.0
+    y  1.0  1.0 -1.0
+    z -1.0 -1.0  1.0
+    """
+    ddof = int(is_sample)
+    values = _numeric_values(df, list(columns))
+    valid = ~np.isnan(values)
+    mask = valid.astype(np.float64)
+
+    # Centraliza na media de cada coluna (evita o cancelamento numerico das somas) e zera os valores ausentes
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = np.where(valid, values - np.nansum(values, axis=0) / valid.sum(axis=0), 0.0)
+
+    # Somas par a par: soma[i, j] e a soma da coluna i nas linhas em que a coluna j esta preenchida
+    qtd = mask.T @ mask
+    soma = values.T @ mask
+    soma_quadrados = (values ** 2).T @ mask
+    produtos = values.T @ values
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = (produtos - soma * soma.T / qtd) / (qtd - ddof)
+        var_1 = (soma_quadrados - soma ** 2 / qtd) / (qtd - ddof)
+        result = np.clip(cov / np.sqrt(var_1 * var_1.T), -1, 1)
+
+    return pd.DataFrame(result, index=list(columns), columns=list(columns))
+
+
+def _group_codes(df: pd.DataFrame, by) -> tuple:
+    # Codigo do grupo de cada linha (-1 para chaves ausentes) e o indice ordenado dos grupos
+    by = list(np.atleast_1d(by))
+    missing = [column for column in by if column not in df.columns]
+    if missing:
+        raise KeyError(f'Columns {missing} aren\'t on the columns')
+    grouper = df.groupby(by, sort=True)
+    codes = grouper.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    return grouper.size().index, codes
+
+
+def _moments(codes: np.ndarray, values: np.ndarray, size: int) -> tuple:
+    # Quantidade, media e soma dos desvios quadraticos de cada codigo, em duas passadas
+    qtd = np.bincount(codes, minlength=size).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=values, minlength=size) / qtd
+    m2 = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=size)
+    return qtd, mean, m2
+
+
+def _tidy(index: pd.Index, tables: dict, name: str) -> pd.DataFrame:
+    # Junta as tabelas (qtd, coeficiente) de cada variavel em um frame longo, com as chaves dos grupos em colunas
+    frames = []
+    for quanti, (qtd, coefficient) in tables.items():
+        frame = index.to_frame(index=False)
+        frame['quanti'] = quanti
+        frame['qtd'] = qtd.astype(np.int64)
+        frame[name] = coefficient
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def r2_by_group(df: pd.DataFrame, by, quali: str, quantis: list, is_sample: bool = True) -> pd.DataFrame:
+    """ Funcao que calcula o coeficiente R2 entre uma variavel qualitativa e cada variavel quantitativa dentro de cada
+    grupo (ex.: cada NOC, esporte ou ano), em uma unica passada vetorizada
+
+    Os momentos de cada grupo e de cada par (grupo, categoria) saem de np.bincount sobre os codigos combinados, entao o
+    custo praticamente nao depende da quantidade de grupos. Dentro de cada grupo, o resultado e o mesmo da funcao r2
+    com as linhas da variavel quantitativa preenchidas.
+
+    Args:
+        df (pd.DataFrame): Dataframe com todos os dados
+        by (str | list): Coluna (ou lista de colunas) dos grupos
+        quali (str): Coluna com os valores da variavel qualitativa
+        quantis (list): Colunas com as variaveis quantitativas
+        is_sample (bool, optional): Informacao se os dados sao de uma amostra ou nao (de uma populacao). Defaults to True.
+
+    Returns:
+        pd.DataFrame: Uma linha por grupo e variavel quantitativa, com as colunas dos grupos, 'quanti', 'qtd' (linhas usadas) e 'r2'
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'NOC': ['BRA'] * 6 + ['USA'] * 4,
+    ...     'qualitativa': ['A', 'A', 'B', 'B', 'C', 'C', 'A', 'B', 'A', 'B'],
+    ...     'quantitativa': [1, 2, 3, 4, 5, 6, 1, 2, 3, 4]
+    ... })
+    >>> r2_by_group(df, 'NOC', 'qualitativa', ['quantitativa']).round(4)
+       NOC        quanti  qtd      r2
+    0  BRA  quantitativa    6  0.8571
+    1  USA  quantitativa    4 -0.2000
+    """
+    ddof = int(is_sample)
+    index, groups = _group_codes(df, by)
+    if quali not in df.columns:
+        raise KeyError(f'Column {quali} isn\'t on the columns')
+    categories, labels = pd.factorize(df[quali])
+    values = _numeric_values(df, list(quantis))
+
+    tables = {}
+    for column, quanti in enumerate(quantis):
+        rows = (groups >= 0) & ~np.isnan(values[:, column])
+        # Variancia geral de cada grupo
+        qtd, _, m2 = _moments(groups[rows], values[rows, column], len(index))
+
+        # Variancia de cada par (grupo, categoria), ponderada dentro do grupo
+        rows &= categories >= 0
+        cells, cell_keys = pd.factorize(groups[rows] * len(labels) + categories[rows])
+        qtd_cell, _, m2_cell = _moments(cells, values[rows, column], len(cell_keys))
+        owner = cell_keys // max(len(labels), 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var_cell = np.where(qtd_cell > ddof, m2_cell / (qtd_cell - ddof), 0.0)
+            var_ponderada = np.bincount(owner, weights=var_cell * qtd_cell, minlength=len(index)) / \
+                np.bincount(owner, weights=qtd_cell, minlength=len(index))
+            tables[quanti] = (qtd, 1 - var_ponderada / (m2 / (qtd - ddof)))
+
+    return _tidy(index, tables, 'r2')
+
+
+def corr_by_group(df: pd.DataFrame, by, quanti: str, others: list, is_sample: bool = True) -> pd.DataFrame:
+    """ Funcao que calcula a correlacao entre uma variavel quantitativa e cada uma das outras dentro de cada grupo
+    (ex.: o ano e os atributos fisicos em cada NOC), em uma unica passada vetorizada
+
+    Cada par usa somente as linhas em que as duas variaveis estao preenchidas, como na funcao corr_matrix.
+
+    Args:
+        df (pd.DataFrame): Dataframe com todos os dados
+        by (str | list): Coluna (ou lista de colunas) dos grupos
+        quanti (str): Coluna com a variavel quantitativa fixa, ex.: 'Year'
+        others (list): Colunas com as outras variaveis quantitativas
+        is_sample (bool, optional): Informacao se os dados sao de uma amostra ou nao (de uma populacao). Defaults to True.
+
+    Returns:
+        pd.DataFrame: Uma linha por grupo e variavel de others, com as colunas dos grupos, 'quanti', 'qtd' (linhas usadas) e 'corr'
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'NOC': ['BRA', 'BRA', 'BRA', 'USA', 'USA', 'USA'],
+    ...     'Year': [2000, 2004, 2008, 2000, 2004, 2008],
+    ...     'Height': [170, 175, 180, 190, 185, np.nan]
+    ... })
+    >>> corr_by_group(df, 'NOC', 'Year', ['Height'])
+       NOC  quanti  qtd  corr
+    0  BRA  Height    3   1.0
+    1  USA  Height    2  -1.0
+    """
+    index, groups = _group_codes(df, by)
+    values = _numeric_values(df, [quanti] + list(others))
+
+    tables = {}
+    for column, other in enumerate(others, start=1):
+        rows = (groups >= 0) & ~np.isnan(values[:, 0]) & ~np.isnan(values[:, column])
+        codes, x, y = groups[rows], values[rows, 0], values[rows, column]
+        qtd, mean_x, m2_x = _moments(codes, x, len(index))
+        _, mean_y, m2_y = _moments(codes, y, len(index))
+        cross = np.bincount(codes, weights=(x - mean_x[codes]) * (y - mean_y[codes]), minlength=len(index))
+        # Os graus de liberdade (is_sample) se cancelam entre a covariancia e os desvios padrao
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tables[other] = (qtd, np.clip(cross / np.sqrt(m2_x * m2_y), -1, 1))
+
+    return _tidy(index, tables, 'corr')
+
+
+
+def _crosstab(codes_1: np.ndarray, codes_2: np.ndarray, size_1: int, size_2: int) -> tuple:
+    # Celulas nao vazias da tabela de contingencia (linha, coluna, frequencia), ignorando codigos ausentes (-1)
+    rows = (codes_1 >= 0) & (codes_2 >= 0)
+    keys = codes_1[rows] * size_2 + codes_2[rows]
+    if size_1 * size_2 <= max(len(keys), 1 << 20):
+        counts = np.bincount(keys, minlength=size_1 * size_2)
+        keys = np.flatnonzero(counts)
+        counts = counts[keys]
+    else:
+        # Muitas categorias (ex.: Name x Team): a tabela densa nao caberia na memoria
+        keys, counts = np.unique(keys, return_counts=True)
+    return keys // size_2, keys % size_2, counts.astype(np.float64)
+
+
+def _entropy(counts: np.ndarray, total: float) -> float:
+    p = counts[counts > 0] / total
+    return -np.sum(p * np.log(p))
+
+
+def _contingency_statistics(row: np.ndarray, column: np.ndarray, counts: np.ndarray, size_1: int, size_2: int) -> dict:
+    # Qui-quadrado, V de Cramer e U de Theil (nos dois sentidos) a partir das celulas nao vazias
+    qtd = counts.sum()
+    row_total = np.bincount(row, weights=counts, minlength=size_1)
+    column_total = np.bincount(column, weights=counts, minlength=size_2)
+    levels_1, levels_2 = np.count_nonzero(row_total), np.count_nonzero(column_total)
+
+    # Soma de (O - E)^2 / E em todas as celulas = soma de O^2 / E nas celulas nao vazias - n
+    chi2 = np.sum(counts ** 2 / (row_total[row] * column_total[column] / qtd)) - qtd if qtd else np.nan
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cramers_v = np.sqrt(max(chi2, 0) / qtd / (min(levels_1, levels_2) - 1))
+
+    # Informacao mutua: H(X) - H(X|Y) = H(X) + H(Y) - H(X, Y)
+    entropy_1, entropy_2 = _entropy(row_total, qtd), _entropy(column_total, qtd)
+    mutual_information = entropy_1 + entropy_2 - _entropy(counts, qtd)
+    return {
+        'qtd': int(qtd),
+        'chi2': chi2,
+        'dof': (levels_1 - 1) * (levels_2 - 1),
+        'cramers_v': cramers_v if np.isfinite(cramers_v) else np.nan,
+        # Uma variavel constante e totalmente determinada pela outra (U = 1)
+        'theils_u_1': mutual_information / entropy_1 if entropy_1 > 0 else 1.0,
+        'theils_u_2': mutual_information / entropy_2 if entropy_2 > 0 else 1.0
+    }
+
+
+def categorical_association(df: pd.DataFrame, qualis: list) -> pd.DataFrame:
+    """ Funcao que calcula o qui-quadrado, o V de Cramer e o U de Theil para todos os pares de variaveis qualitativas
+
+    Cada coluna e convertida em codigos (pd.factorize) uma unica vez e a tabela de contingencia de cada par sai de um
+    np.bincount dos codigos combinados. Linhas com algum valor ausente no par sao ignoradas. O U de Theil e
+    assimetrico: theils_u e a fracao da incerteza (entropia) de quali_1 explicada por quali_2.
+
+    Args:
+        df (pd.DataFrame): Dataframe com todos os dados
+        qualis (list): Colunas com as variaveis qualitativas
+
+    Returns:
+        pd.DataFrame: Uma linha por par ordenado (quali_1, quali_2), com as colunas 'qtd', 'chi2', 'dof', 'cramers_v' e 'theils_u'
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'Sex': ['M', 'M', 'M', 'F', 'F', 'F'],
+    ...     'Medal': ['Gold', 'Gold', 'Silver', 'Silver', 'Bronze', 'Bronze'],
+    ...     'Sport': ['Judo'] * 6
+    ... })
+    >>> categorical_association(df, ['Sex', 'Medal']).round(4)
+      quali_1 quali_2  qtd  chi2  dof  cramers_v  theils_u
+    0     Sex   Medal    6   4.0    2     0.8165    0.6667
+    1   Medal     Sex    6   4.0    2     0.8165    0.4206
+    """
+    missing = [quali for quali in qualis if quali not in df.columns]
+    if missing:
+        raise KeyError(f'Columns {missing} aren\'t on the columns')
+    codes = {quali: pd.factorize(df[quali]) for quali in qualis}
+
+    rows = []
+    for position, quali_1 in enumerate(qualis):
+        for quali_2 in qualis[position + 1:]:
+            (codes_1, labels_1), (codes_2, labels_2) = codes[quali_1], codes[quali_2]
+            statistics = _contingency_statistics(*_crosstab(codes_1, codes_2, len(labels_1), len(labels_2)), len(labels_1), len(labels_2))
+            theils_u_1, theils_u_2 = statistics.pop('theils_u_1'), statistics.pop('theils_u_2')
+            rows.append({'quali_1': quali_1, 'quali_2': quali_2, **statistics, 'theils_u': theils_u_1})
+            rows.append({'quali_1': quali_2, 'quali_2': quali_1, **statistics, 'theils_u': theils_u_2})
+
+    return pd.DataFrame(rows, columns=['quali_1', 'quali_2', 'qtd', 'chi2', 'dof', 'cramers_v', 'theils_u'])
+
+
+def cramers_v(df: pd.DataFrame, quali_1: str, quali_2: str) -> float:
+    """ Funcao que calcula o V de Cramer, que quantifica a associacao entre duas variaveis qualitativas
+
+    Args:
+        df (pd.DataFrame): Dataframe com todos os dados
+        quali_1 (str): Coluna com os valores da primeira variavel qualitativa
+        quali_2 (str): Coluna com os valores da segunda variavel qualitativa
+
+    Returns:
+        float: V de Cramer, entre 0 (sem associacao) e 1
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sex': ['M', 'M', 'F', 'F'], 'Sport': ['Judo', 'Judo', 'Golf', 'Golf']})
+    >>> cramers_v(df, 'Sex', 'Sport')
+    1.0
+    """
+    return categorical_association(df, [quali_1, quali_2]).loc[0, 'cramers_v']
+
+
+
+def _group_moments(codes: np.ndarray, values: np.ndarray, categories) -> pd.DataFrame:
+    # Quantidade, media e soma dos desvios quadraticos de cada categoria (codigos de pd.factorize)
+    qtd = np.bincount(codes, minlength=len(categories))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=values, minlength=len(categories)) / qtd
+    m2 = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=len(categories))
+    moments = pd.DataFrame({'qtd': qtd, 'mean': mean, 'm2': m2}, index=pd.Index(categories))
+    return moments[moments['qtd'] > 0]
+
+
+def _merge_moments(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    # Combinacao de Chan das medias e somas dos desvios quadraticos, categoria a categoria
+    index = left.index.union(right.index, sort=False)
+    left, right = left.reindex(index, fill_value=0), right.reindex(index, fill_value=0)
+    qtd = left['qtd'] + right['qtd']
+    delta = right['mean'] - left['mean']
+    return pd.DataFrame({
+        'qtd': qtd,
+        'mean': left['mean'] + delta * right['qtd'] / qtd,
+        'm2': left['m2'] + right['m2'] + delta ** 2 * left['qtd'] * right['qtd'] / qtd
+    })
+
+
+class R2Accumulator:
+    """Estatisticas suficientes do coeficiente R2 (quantidade, media e soma dos desvios quadraticos por categoria),
+    atualizadas bloco a bloco e combinaveis entre blocos ou processos.
+
+    Valores ausentes da variavel quantitativa sao ignorados; linhas sem categoria entram somente na variancia geral,
+    como na funcao r2.
+
+    Args:
+        quali (str): Coluna com os valores da variavel qualitativa
+        quanti (str): Coluna com os valores da variavel quantitativa
+        is_sample (bool, optional): Informacao se os dados sao de uma amostra ou nao (de uma populacao). Defaults to True.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'qualitativa': ['A', 'A', 'B', 'B', 'C', 'C'],
+    ...     'quantitativa': [1, 2, 3, 4, 5, 6]
+    ... })
+    >>> accumulator = R2Accumulator('qualitativa', 'quantitativa')
+    >>> round(accumulator.update(df.iloc[:3]).update(df.iloc[3:]).result(), 10)
+    0.8571428571
+    """
+    def __init__(self, quali: str, quanti: str, is_sample: bool = True) -> None:
+        self.quali = quali
+        self.quanti = quanti
+        self.is_sample = is_sample
+        self.groups = pd.DataFrame({'qtd': [], 'mean': [], 'm2': []})
+        self.total = pd.DataFrame({'qtd': [], 'mean': [], 'm2': []})
+
+    def update(self, df: pd.DataFrame) -> 'R2Accumulator':
+        """Adiciona um bloco de linhas as estatisticas.
+
+        Args:
+            df (pd.DataFrame): Bloco com as colunas quali e quanti.
+
+        Returns:
+            R2Accumulator: O proprio acumulador, para encadear chamadas.
+        """
+        if self.quali not in df.columns:
+            raise KeyError(f'Column {self.quali} isn\'t on the columns')
+        values = _numeric_values(df, [self.quanti])[:, 0]
+        valid = ~np.isnan(values)
+        codes, categories = pd.factorize(df[self.quali].to_numpy()[valid])
+        values = values[valid]
+
+        self.groups = _merge_moments(self.groups, _group_moments(codes[codes >= 0], values[codes >= 0], categories))
+        self.total = _merge_moments(self.total, _group_moments(np.zeros(len(values), dtype=int), values, [self.quanti]))
+        return self
+
+    def merge(self, other: 'R2Accumulator') -> 'R2Accumulator':
+        """Incorpora as estatisticas de outro acumulador das mesmas colunas.
+
+        Args:
+            other (R2Accumulator): Acumulador a ser incorporado; nao e modificado.
+
+        Returns:
+            R2Accumulator: O proprio acumulador, para encadear chamadas.
+        """
+        if (other.quali, other.quanti, other.is_sample) != (self.quali, self.quanti, self.is_sample):
+            raise ValueError("Accumulators with different columns can't be merged")
+        self.groups = _merge_moments(self.groups, other.groups)
+        self.total = _merge_moments(self.total, other.total)
+        return self
+
+    def result(self) -> float:
+        """Calcula o coeficiente R2 com as estatisticas acumuladas.
+
+        Returns:
+            float: Coeficiente R2
+        """
+        ddof = int(self.is_sample)
+        qtd = self.groups['qtd']
+        # Categorias com poucos valores para a variancia sao ignoradas, como na funcao r2
+        var = (self.groups['m2'] / (qtd - ddof)).where(qtd > ddof)
+        var_ponderada = (var * qtd).sum() / qtd.sum()
+        var_geral = self.total['m2'].sum() / (self.total['qtd'].sum() - ddof)
+
+        return 1 - (var_ponderada / var_geral)
+
+
+class CorrAccumulator:
+    """Estatisticas suficientes da matriz de correlacao (quantidades, medias, somas dos desvios quadraticos e dos
+    produtos cruzados de cada par de variaveis), atualizadas bloco a bloco e combinaveis entre blocos ou processos.
+
+    Como na funcao corr_matrix, cada par usa somente as linhas em que as duas variaveis estao preenchidas.
+
+    Args:
+        columns (list): Colunas com as variaveis quantitativas
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'x': [1, 2, 3, 4, 5],
+    ...     'y': [2, 4, 6, 8, np.nan],
+    ...     'z': [5, 4, 3, 2, 1]
+    ... })
+    >>> left, right = CorrAccumulator(['x', 'y', 'z']), CorrAccumulator(['x', 'y', 'z'])
+    >>> left.update(df.iloc[:2]).merge(right.update(df.iloc[2:])).result()
+         x    y    z
+    x  1.0  1.0 -1.0
+    y  1.0  1.0 -1.0
+    z -1.0 -1.0  1.0
+    """
+    def __init__(self, columns: list) -> None:
+        self.columns = list(columns)
+        size = (len(self.columns), len(self.columns))
+        # mean[i, j] e m2[i, j] sao da coluna i nas linhas em que a coluna j esta preenchida
+        self.qtd = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.cross = np.zeros(size)
+
+    def _add_moments(self, qtd: np.ndarray, mean: np.ndarray, m2: np.ndarray, cross: np.ndarray) -> None:
+        # Combinacao de Chan, par a par
+        total = self.qtd + qtd
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, self.qtd * qtd / total, 0.0)
+            delta = mean - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * np.where(total > 0, qtd / total, 0.0), 0.0)
+        self.m2 = self.m2 + m2 + delta ** 2 * weight
+        self.cross = self.cross + cross + delta * delta.T * weight
+        self.qtd = total
+
+    def update(self, df: pd.DataFrame) -> 'CorrAccumulator':
+        """Adiciona um bloco de linhas as estatisticas.
+
+        Args:
+            df (pd.DataFrame): Bloco com as colunas quantitativas.
+
+        Returns:
+            CorrAccumulator: O proprio acumulador, para encadear chamadas.
+        """
+        values = _numeric_values(df, self.columns)
+        valid = ~np.isnan(values)
+        mask = valid.astype(np.float64)
+
+        # Mesmas somas par a par da funcao corr_matrix, com os valores centralizados na media do bloco
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.nan_to_num(np.nansum(values, axis=0) / valid.sum(axis=0))
+        values = np.where(valid, values - shift, 0.0)
+        qtd = mask.T @ mask
+        soma = values.T @ mask
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(qtd > 0, soma / qtd, 0.0)
+        m2 = (values ** 2).T @ mask - soma * mean
+        cross = values.T @ values - soma * mean.T
+
+        self._add_moments(qtd, mean + shift[:, None], m2, cross)
+        return self
 
-    std_1 = df[quanti_1].std(ddof = is_sample)
-    std_2 = df[quanti_2].std(ddof = is_sample)
+    def merge(self, other: 'CorrAccumulator') -> 'CorrAccumulator':
+        """Incorpora as estatisticas de outro acumulador das mesmas colunas.
 
-    cov = quanti_1_center * quanti_2_center
-    cov = cov.sum() / (df.shape[0] - is_sample)
+        Args:
+            other (CorrAccumulator): Acumulador a ser incorporado; nao e modificado.
 
-    corr = cov / (std_1 * std_2)
+        Returns:
+            CorrAccumulator: O proprio acumulador, para encadear chamadas.
+        """
+        if other.columns != self.columns:
+            raise ValueError("Accumulators with different columns can't be merged")
+        self._add_moments(other.qtd, other.mean, other.m2, other.cross)
+        return self
 
-    return corr
+    def result(self) -> pd.DataFrame:
+        """Calcula a matriz de correlacao com as estatisticas acumuladas.
 
+        Returns:
+            pd.DataFrame: Matriz de correlacao, com as variaveis nas linhas e nas colunas
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.clip(self.cross / np.sqrt(self.m2 * self.m2.T), -1, 1)
+        return pd.DataFrame(result, index=self.columns, columns=self.columns)
 
 if __name__ == "__main__":
      doctest.testmod(verbose=False)
@@ -3,6 +3,7 @@
 import pandas as pd
 import numpy as np
 import doctest
+from data_loader import data_path
 
 
 def validade_athletes_columns(df: pd.DataFrame) -> None:
@@ -52,12 +53,13 @@ def validade_athletes_columns(df: pd.DataFrame) -> None:
 def medals_to_int(df: pd.DataFrame) -> pd.DataFrame:
     """Recebe DataFrame com coluna 'Medal' e converte valores string para inteiros.
     0: Sem medalha; 1: Bronze; 2: Prata; 3: Ouro.
+    Também cria a coluna booleana 'is_medalist', indicando se o atleta ganhou alguma medalha.
 
     Args:
         df (pd.DataFrame): DataFrame com coluna 'Medal'.
 
     Returns:
-        pd.DataFrame: DataFrame com coluna 'Medal' convertida para inteiros.
+        pd.DataFrame: DataFrame com coluna 'Medal' convertida para inteiros e a coluna 'is_medalist'.
     
     Example:
     ----------
@@ -65,6 +67,8 @@ def medals_to_int(df: pd.DataFrame) -> pd.DataFrame:
     >>> df = medals_to_int(data)
     >>> print(df['Medal'].tolist())
     [3.0, 3.0, 2.0, 1.0, 0.0]
+    >>> print(df['is_medalist'].tolist())
+    [True, True, True, True, False]
     
     >>> data = pd.DataFrame({'Atleta': ['Jaime', 'Walleria', 'Carlos', 'Henrique', 'Novaes'], 'Medal': [np.nan, 'Bronze', 'Bronze', 'Bronze', np.nan]  }) 
     >>> df = medals_to_int(data)
@@ -81,6 +85,7 @@ def medals_to_int(df: pd.DataFrame) -> pd.DataFrame:
         df.loc[:, 'Medal'] = df['Medal'].map({'Gold': 3, 'Silver': 2, 'Bronze': 1})
         df['Medal'] = df['Medal'].infer_objects().fillna(0)
         df.loc[:, 'Medal'] = df['Medal'].astype(int)
+        df['is_medalist'] = df['Medal'] > 0
         
     except KeyError:
         print(
@@ -90,6 +95,27 @@ def medals_to_int(df: pd.DataFrame) -> pd.DataFrame:
         return df
 
 
+def medalist_mask(df: pd.DataFrame) -> pd.Series:
+    """Retorna a máscara booleana dos atletas medalhistas, sem alterar o DataFrame.
+    Usa a coluna 'is_medalist' criada por medals_to_int e, se ela não existir, compara a coluna 'Medal'.
+
+    Args:
+        df (pd.DataFrame): DataFrame com coluna 'is_medalist' ou 'Medal' (inteiros de 0 a 3).
+
+    Returns:
+        pd.Series: Série booleana, True para os atletas com medalha.
+
+    Example:
+    ----------
+    >>> data = pd.DataFrame({'Medal': [0, 1, 3, 0]})
+    >>> print(medalist_mask(data).tolist())
+    [False, True, True, False]
+    """
+    if 'is_medalist' in df.columns:
+        return df['is_medalist']
+    return df['Medal'].isin([1, 2, 3])
+
+
 def convert_athletes_df_to_paralympics_format(athletes_df: pd.DataFrame) -> pd.DataFrame:
     """Função que recebe um DataFrame de atletas e converte para o formato dos dados das paralimpíadas.
 
@@ -231,7 +257,7 @@ def rename_countries_gdp(df: pd.DataFrame) -> pd.DataFrame:
 def clean_paralympic_atletes_dataset() -> None:
     """Função que padroniza os dados do dataset medal_athletes.csv com os dados dos outros datasets com informações das paralimpíadas e olimpíadas e cria um dataset modified_medal_athletes.csv com as modificações
     """
-    df = pd.read_csv("data/medal_athlete.csv")
+    df = pd.read_csv(data_path('medal_athlete.csv'))
     df.rename(columns={column: column.capitalize() for column in df.columns}, inplace=True)
     df = medals_to_int(df)
     # df['Sex'] = np.nan
@@ -257,7 +283,7 @@ def clean_paralympic_atletes_dataset() -> None:
     # print(np.intersect1d(df['Athlete_name'].to_numpy(), np.setdiff1d(aux_2, aux_1)))
     # print(df['Athlete_name'].nunique())
     
-    df.to_csv('data/modified_medal_athlete.csv')
+    df.to_csv(data_path('modified_medal_athlete.csv'))
 
 
 def map_name_normalization(df: pd.DataFrame) -> pd.DataFrame:
@@ -0,0 +1,84 @@
+"""Módulo com a leitura dos dados das análises a partir de um diretório de dados configurável.
+
+Nenhum arquivo é lido na importação dos módulos do src: as análises recebem os DataFrames como argumentos e
+quem precisa dos dados os carrega com as funções deste módulo. O diretório dos dados é 'data' (relativo ao
+diretório atual) e pode ser trocado pela variável de ambiente DATA_ROOT, que também vale para os processos
+filhos (ex.: o pool do render_pool), ex.: DATA_ROOT=/dados/olimpiadas python main.py
+"""
+import os
+import doctest
+import pandas as pd
+
+DATA_ROOT_VARIABLE = 'DATA_ROOT'
+DEFAULT_DATA_ROOT = 'data'
+
+
+def data_root() -> str:
+    """Retorna o diretório dos dados: a variável de ambiente DATA_ROOT ou, sem ela, 'data'.
+
+    Returns:
+        str: Diretório dos dados.
+    """
+    return os.environ.get(DATA_ROOT_VARIABLE) or DEFAULT_DATA_ROOT
+
+
+def set_data_root(path: str) -> None:
+    """Troca o diretório dos dados deste processo e dos processos criados depois.
+
+    Args:
+        path (str): Novo diretório dos dados.
+
+    Example:
+    ----------
+    >>> previous = os.environ.get(DATA_ROOT_VARIABLE)
+    >>> set_data_root('/tmp/olimpiadas')
+    >>> data_path('athlete_events.csv')
+    '/tmp/olimpiadas/athlete_events.csv'
+    >>> set_data_root(previous or DEFAULT_DATA_ROOT)
+    """
+    os.environ[DATA_ROOT_VARIABLE] = path
+
+
+def data_path(*parts: str) -> str:
+    """Monta o caminho de um arquivo dentro do diretório dos dados.
+
+    Args:
+        *parts (str): Partes do caminho relativas ao diretório dos dados, ex.: 'gdp', 'gdp.csv'.
+
+    Returns:
+        str: Caminho do arquivo.
+    """
+    return os.path.join(data_root(), *parts)
+
+
+def load_csv(*parts: str, **kwargs) -> pd.DataFrame:
+    """Lê um CSV do diretório dos dados.
+
+    Args:
+        *parts (str): Partes do caminho do arquivo, relativas ao diretório dos dados.
+        **kwargs: Argumentos do pd.read_csv.
+
+    Returns:
+        pd.DataFrame: Conteúdo do arquivo.
+    """
+    return pd.read_csv(data_path(*parts), **kwargs)
+
+
+def load_athletes(clean: bool = True) -> pd.DataFrame:
+    """Lê a tabela de atletas (athlete_events.csv) do diretório dos dados.
+
+    Args:
+        clean (bool, optional): Se True, converte as medalhas em inteiros (data_cleaner.medals_to_int). Defaults to True.
+
+    Returns:
+        pd.DataFrame: DataFrame dos atletas.
+    """
+    # Importado aqui: o data_cleaner usa data_path e importa este módulo
+    from data_cleaner import medals_to_int
+
+    athletes = load_csv('athlete_events.csv')
+    return medals_to_int(athletes) if clean else athletes
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
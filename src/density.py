@@ -0,0 +1,105 @@
+"""Módulo com a agregação de pontos em grades de densidade para os gráficos de dispersão densos.
+
+Em vez de desenhar um marcador por linha (centenas de milhares de atletas, quase todos sobrepostos), os
+pontos são contados em um histograma 2D com o NumPy e o gráfico desenha só as células da grade. O custo
+do desenho e o tamanho do arquivo passam a depender da quantidade de células, não da quantidade de linhas.
+"""
+import doctest
+import numpy as np
+import pandas as pd
+
+
+def category_edges(values: np.ndarray) -> np.ndarray:
+    """Calcula os limites das células para uma coluna discreta (ex.: os anos), com uma célula por valor.
+
+    Os limites ficam no ponto médio entre valores consecutivos; as células das pontas têm a mesma largura das vizinhas.
+
+    Args:
+        values (np.ndarray): Valores da coluna (NaN são ignorados).
+
+    Returns:
+        np.ndarray: Limites das células, com um elemento a mais que a quantidade de valores distintos.
+
+    Example:
+    ----------
+    >>> category_edges(np.array([2016, 2008, 2012, 2016, np.nan])).tolist()
+    [2006.0, 2010.0, 2014.0, 2018.0]
+    >>> category_edges(np.array([2016])).tolist()
+    [2015.5, 2016.5]
+    """
+    unique = np.unique(np.asarray(values, dtype=float))
+    unique = unique[~np.isnan(unique)]
+    if len(unique) == 0:
+        return np.array([0.0, 1.0])
+    if len(unique) == 1:
+        return np.array([unique[0] - 0.5, unique[0] + 0.5])
+
+    middle = (unique[:-1] + unique[1:]) / 2
+    return np.concatenate([[2 * unique[0] - middle[0]], middle, [2 * unique[-1] - middle[-1]]])
+
+
+def step_edges(values: np.ndarray, step: float = 1.0) -> np.ndarray:
+    """Calcula limites de células com largura fixa, centradas nos múltiplos de step (ex.: uma célula por ano de idade).
+
+    Args:
+        values (np.ndarray): Valores da coluna (NaN são ignorados).
+        step (float, optional): Largura das células. Defaults to 1.0.
+
+    Returns:
+        np.ndarray: Limites das células que cobrem todos os valores.
+
+    Example:
+    ----------
+    >>> step_edges(np.array([20, 22.4, np.nan])).tolist()
+    [19.5, 20.5, 21.5, 22.5]
+    >>> step_edges(np.array([60, 75]), step=10).tolist()
+    [55.0, 65.0, 75.0, 85.0]
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.array([-step / 2, step / 2])
+
+    first, last = np.round(values.min() / step), np.round(values.max() / step)
+    return (np.arange(first, last + 2) - 0.5) * step
+
+
+def density_grid(df: pd.DataFrame, x: str, y: str, bins=50, range: list = None) -> tuple:
+    """Conta os pontos (x, y) em uma grade 2D, ignorando as linhas com NaN.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados.
+        x (str): Coluna do eixo x.
+        y (str): Coluna do eixo y.
+        bins (int | array | list, optional): Células da grade, no formato do np.histogram2d
+            (quantidade ou limites, ou um par para x e y). Defaults to 50.
+        range (list, optional): Intervalos [[xmin, xmax], [ymin, ymax]] da grade. Defaults to None (dos dados).
+
+    Returns:
+        tuple: DataFrame com as contagens (índice com os centros das células em y, colunas com os centros em x),
+            os limites das células em x e os limites em y.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Year': [2012, 2012, 2016, 2016], 'Age': [20, 21, 30, np.nan]})
+    >>> grid, xedges, yedges = density_grid(df, 'Year', 'Age', bins=[category_edges(df['Year']), 2])
+    >>> grid.index.tolist(), grid.columns.tolist(), grid.to_numpy().tolist()
+    ([22.5, 27.5], [2012.0, 2016.0], [[2, 0], [0, 1]])
+    >>> xedges.tolist(), yedges.tolist()
+    ([2010.0, 2014.0, 2018.0], [20.0, 25.0, 30.0])
+    """
+    values_x = df[x].to_numpy(dtype=float)
+    values_y = df[y].to_numpy(dtype=float)
+    valid = ~(np.isnan(values_x) | np.isnan(values_y))
+
+    counts, xedges, yedges = np.histogram2d(values_x[valid], values_y[valid], bins=bins, range=range)
+
+    # histogram2d devolve as contagens com x nas linhas; a grade segue o formato do pcolormesh (y nas linhas)
+    grid = pd.DataFrame(counts.T.astype(np.int64),
+                        index=pd.Index((yedges[:-1] + yedges[1:]) / 2, name=y),
+                        columns=(xedges[:-1] + xedges[1:]) / 2)
+    return grid, xedges, yedges
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
@@ -0,0 +1,68 @@
+"""Módulo com o ciclo de vida das figuras dos gráficos.
+
+As funções de gráfico criam suas figuras com create_figure, que não registra a figura no gerenciador global
+do pyplot: a figura pertence a quem a recebeu e é liberada assim que deixa de ser referenciada. Com isso,
+nenhuma função depende da "figura atual" (plt.gcf) e execuções longas, com centenas de gráficos, não
+acumulam figuras abertas. save_figure salva e fecha a figura de forma determinística.
+"""
+import os
+import doctest
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+
+def create_figure(nrows: int = 1, ncols: int = 1, figsize: tuple = None, **kwargs) -> tuple:
+    """Cria uma figura com seus eixos, sem registrá-la no pyplot.
+
+    Args:
+        nrows (int, optional): Quantidade de linhas de eixos. Defaults to 1.
+        ncols (int, optional): Quantidade de colunas de eixos. Defaults to 1.
+        figsize (tuple, optional): Tamanho da figura, em polegadas. Defaults to None (padrão do matplotlib).
+        **kwargs: Argumentos repassados ao Figure.subplots, ex.: sharey=True.
+
+    Returns:
+        tuple: A figura e o eixo (ou o array de eixos).
+
+    Example:
+    ----------
+    >>> fig, ax = create_figure(figsize=(4, 3))
+    >>> fig.get_size_inches().tolist(), ax.figure is fig, plt.get_fignums()
+    ([4.0, 3.0], True, [])
+    """
+    figure = Figure(figsize=figsize)
+    return figure, figure.subplots(nrows, ncols, **kwargs)
+
+
+def close_figure(figure: Figure) -> None:
+    """Libera os recursos de uma figura, esteja ela registrada no pyplot ou não.
+
+    Args:
+        figure (Figure): Figura a ser fechada.
+    """
+    plt.close(figure)
+    figure.clear()
+
+
+def save_figure(figure: Figure, path: str, **kwargs) -> str:
+    """Salva a figura, criando o diretório de saída se necessário, e a fecha.
+
+    Args:
+        figure (Figure): Figura a ser salva.
+        path (str): Caminho do arquivo de saída.
+        **kwargs: Argumentos repassados ao savefig, ex.: dpi=300.
+
+    Returns:
+        str: Caminho do arquivo salvo.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    try:
+        figure.savefig(path, **kwargs)
+    finally:
+        close_figure(figure)
+    return path
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
@@ -0,0 +1,230 @@
+"""Módulo com o cálculo vetorizado de estatísticas descritivas por grupo.
+
+Os valores são ordenados uma única vez dentro de cada grupo; a partir dessa ordenação saem, para todos os
+grupos de uma vez, as estatísticas de ordem (mínimo, quartis, mediana, máximo), os momentos (média, variância,
+desvio padrão), os limites do intervalo interquartil e as extremidades dos bigodes do boxplot.
+"""
+import doctest
+import numpy as np
+import pandas as pd
+
+STATISTICS_COLUMNS = ['count', 'min', 'q1', 'median', 'q3', 'max', 'mean', 'std', 'var', 'iqr', 'lower_fence', 'upper_fence', 'whisker_low', 'whisker_high']
+
+
+def _lerp(low: np.ndarray, high: np.ndarray, fraction: np.ndarray) -> np.ndarray:
+    # Mesma interpolação linear usada pelo numpy (e pelo pandas) no cálculo dos quantis
+    diff = high - low
+    return np.where(fraction >= 0.5, high - diff * (1 - fraction), low + diff * fraction)
+
+
+def sorted_groups(df: pd.DataFrame, by, value: str) -> tuple:
+    """Ordena os valores da coluna dentro de cada grupo, ignorando NaN (nos valores e nas chaves dos grupos).
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados.
+        by (str | list): Coluna (ou lista de colunas) de agrupamento.
+        value (str): Coluna numérica.
+
+    Returns:
+        tuple: Índice dos grupos, array com a quantidade de valores por grupo, array com a posição inicial
+            de cada grupo e o array de valores ordenados por (grupo, valor).
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo', 'Golf', 'Judo'], 'Age': [30, 40, 20]})
+    >>> index, counts, starts, values = sorted_groups(df, 'Sport', 'Age')
+    >>> index.tolist(), counts.tolist(), starts.tolist(), values.tolist()
+    (['Golf', 'Judo'], [1, 2], [0, 1], [40, 20, 30])
+    """
+    keys = np.atleast_1d(by).tolist()
+    data = df[[*keys, value]]
+    # Linhas com chave NaN ficam fora dos grupos do groupby: também são removidas dos valores
+    data = data[data[value].notna() & data[keys].notna().all(axis=1)]
+
+    grouper = data.groupby(by, sort=True)
+    sizes = grouper.size()
+    codes = grouper.ngroup().to_numpy()
+    values = data[value].to_numpy()
+
+    order = np.lexsort((values, codes))
+    counts = sizes.to_numpy()
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(int)
+    return sizes.index, counts, starts, values[order]
+
+
+def grouped_quantile(counts: np.ndarray, starts: np.ndarray, values: np.ndarray, q: float) -> np.ndarray:
+    """Calcula o quantil q de cada grupo a partir dos valores já ordenados por sorted_groups.
+
+    Args:
+        counts (np.ndarray): Quantidade de valores por grupo.
+        starts (np.ndarray): Posição inicial de cada grupo.
+        values (np.ndarray): Valores ordenados por (grupo, valor).
+        q (float): Quantil, entre 0 e 1.
+
+    Returns:
+        np.ndarray: Quantil de cada grupo (interpolação linear).
+
+    Example:
+    ----------
+    >>> grouped_quantile(np.array([2, 3]), np.array([0, 2]), np.array([20.0, 21.0, 1.0, 2.0, 9.0]), 0.25).tolist()
+    [20.25, 1.5]
+    """
+    position = (counts - 1) * q
+    low = np.floor(position).astype(int)
+    high = np.minimum(low + 1, counts - 1)
+    values = values.astype(float)
+    return _lerp(values[starts + low], values[starts + high], position - low)
+
+
+def grouped_statistics(df: pd.DataFrame, by='Sport', value: str = 'Age', whisker: float = 1.5) -> pd.DataFrame:
+    """Calcula, em uma única passada vetorizada, as estatísticas descritivas de uma coluna para cada grupo.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados.
+        by (str | list, optional): Coluna (ou lista de colunas) de agrupamento, ex.: 'Sport', 'Event', 'NOC', 'Year'. Defaults to 'Sport'.
+        value (str, optional): Coluna numérica, ex.: 'Age', 'Height', 'Weight'. Defaults to 'Age'.
+        whisker (float, optional): Multiplicador do intervalo interquartil para os limites. Defaults to 1.5.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado pelos grupos, com as colunas de STATISTICS_COLUMNS.
+            'whisker_low' e 'whisker_high' são os valores mais extremos dentro dos limites (bigodes do boxplot).
+            'min', 'max' e os bigodes mantêm o tipo da coluna original; as demais são float.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({
+    ...     'Sport': ['Soccer', 'Basketball', 'Tennis', 'Soccer', 'Basketball', 'Tennis'],
+    ...     'Age': [20, 35, 25, 21, 45, 19]
+    ... })
+    >>> stats = grouped_statistics(df, 'Sport', 'Age')
+    >>> stats.loc['Basketball', ['min', 'q1', 'median', 'q3', 'max', 'var', 'lower_fence', 'upper_fence']].tolist()
+    [35.0, 37.5, 40.0, 42.5, 45.0, 50.0, 30.0, 50.0]
+    """
+    index, counts, starts, values = sorted_groups(df, by, value)
+    if len(counts) == 0:
+        return pd.DataFrame(columns=STATISTICS_COLUMNS, index=index)
+
+    ends = starts + counts - 1
+    floats = values.astype(float)
+
+    q1 = grouped_quantile(counts, starts, floats, 0.25)
+    median = grouped_quantile(counts, starts, floats, 0.5)
+    q3 = grouped_quantile(counts, starts, floats, 0.75)
+
+    # Momentos em duas passadas (média e desvios quadráticos), como no pandas
+    mean = np.add.reduceat(floats, starts) / counts
+    squares = np.add.reduceat((floats - np.repeat(mean, counts)) ** 2, starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = np.where(counts > 1, squares / (counts - 1), np.nan)
+
+    iqr = q3 - q1
+    lower_fence = q1 - whisker * iqr
+    upper_fence = q3 + whisker * iqr
+
+    # Dentro de cada grupo os valores estão ordenados: o bigode inferior é o primeiro valor >= limite inferior
+    # e o superior, o último valor <= limite superior
+    below = np.add.reduceat(floats < np.repeat(lower_fence, counts), starts)
+    within = np.add.reduceat(floats <= np.repeat(upper_fence, counts), starts)
+
+    return pd.DataFrame({
+        'count': counts,
+        'min': values[starts],
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'max': values[ends],
+        'mean': mean,
+        'std': np.sqrt(var),
+        'var': var,
+        'iqr': iqr,
+        'lower_fence': lower_fence,
+        'upper_fence': upper_fence,
+        'whisker_low': values[starts + below],
+        'whisker_high': values[starts + within - 1],
+    }, index=index)
+
+
+def broadcast_to_rows(df: pd.DataFrame, by, group_values: pd.Series) -> np.ndarray:
+    """Distribui um valor por grupo para todas as linhas do grupo.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as colunas de agrupamento.
+        by (str | list): Coluna (ou lista de colunas) de agrupamento.
+        group_values (pd.Series): Valores indexados pelos grupos.
+
+    Returns:
+        np.ndarray: Valor do grupo de cada linha (NaN para grupos ausentes).
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo', 'Golf', 'Judo']})
+    >>> broadcast_to_rows(df, 'Sport', pd.Series({'Golf': 1.0, 'Judo': 2.0})).tolist()
+    [2.0, 1.0, 2.0]
+    """
+    by = np.atleast_1d(by).tolist()
+    if len(by) == 1:
+        keys = pd.Index(df[by[0]])
+    else:
+        keys = pd.MultiIndex.from_frame(df[by])
+    return group_values.reindex(keys).to_numpy(dtype=float)
+
+
+def iqr_outliers(df: pd.DataFrame, by='Sport', value: str = 'Age', whisker: float = 1.5, stats: pd.DataFrame = None) -> tuple:
+    """Identifica os outliers de uma coluna pelo critério do intervalo interquartil de cada grupo.
+
+    Os limites saem de grouped_statistics (uma única ordenação por grupo, reutilizável pelos boxplots) e são
+    levados às linhas pela chave do grupo (broadcast_to_rows), em vez de groupby().quantile() com transform.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados.
+        by (str | list, optional): Coluna (ou lista de colunas) de agrupamento. Defaults to 'Sport'.
+        value (str, optional): Coluna numérica. Defaults to 'Age'.
+        whisker (float, optional): Multiplicador do intervalo interquartil. Defaults to 1.5.
+        stats (pd.DataFrame, optional): Estatísticas já calculadas por grouped_statistics. Defaults to None (calcula).
+
+    Returns:
+        tuple: Série com a quantidade de outliers por grupo e série booleana (alinhada a df) indicando as linhas outliers.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo'] * 5 + ['Golf'] * 2, 'Age': [20, 21, 22, 23, 60, 40, 41]})
+    >>> counts, mask = iqr_outliers(df, 'Sport', 'Age')
+    >>> counts.to_dict()
+    {'Golf': 0, 'Judo': 1}
+    >>> df[mask]['Age'].tolist()
+    [60]
+    """
+    if stats is None:
+        stats = grouped_statistics(df, by, value, whisker)
+
+    values = df[value].to_numpy(dtype=float)
+    lower = broadcast_to_rows(df, by, stats['lower_fence'])
+    upper = broadcast_to_rows(df, by, stats['upper_fence'])
+
+    # Comparações com NaN são falsas: valores ausentes nunca são outliers
+    mask = pd.Series((values < lower) | (values > upper), index=df.index, name=value)
+    counts = mask.groupby([df[column] for column in np.atleast_1d(by)]).sum().reindex(stats.index, fill_value=0)
+    return counts.astype(int), mask
+
+
+def top_groups(counts: pd.Series, n: int = 3) -> list:
+    """Retorna os n grupos com maiores contagens; empates mantêm a ordem dos grupos.
+
+    Args:
+        counts (pd.Series): Contagens indexadas pelos grupos.
+        n (int, optional): Quantidade de grupos. Defaults to 3.
+
+    Returns:
+        list: Grupos com as maiores contagens positivas.
+
+    Example:
+    ----------
+    >>> top_groups(pd.Series({'Boxing': 2, 'Golf': 0, 'Soccer': 2, 'Tennis': 1}), 2)
+    ['Boxing', 'Soccer']
+    """
+    counts = counts[counts > 0]
+    return counts.sort_values(ascending=False, kind='stable').head(n).index.tolist()
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
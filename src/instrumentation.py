@@ -0,0 +1,351 @@
+"""Módulo com a instrumentação das etapas do pipeline: tempo, CPU, memória e linhas processadas.
+
+Cada etapa (uma função instrumentada ou um bloco `with profiler.stage(...)`) registra o tempo decorrido, o tempo
+de CPU, o aumento do pico de memória do processo (RSS) e a quantidade de linhas dos DataFrames de entrada e de
+saída. Os registros são exportados como um trace JSON (formato do chrome://tracing e do Perfetto) e como pilhas
+"folded" (formato do flamegraph.pl e do speedscope), para comparar o desempenho entre versões dos dados.
+
+As funções são instrumentadas em tempo de execução, por módulo (instrument_module) ou por diretório
+(instrument_package), sem alterar o código das análises.
+"""
+import os
+import sys
+import time
+import json
+import inspect
+import doctest
+import functools
+import threading
+import pandas as pd
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, o pico de memória não é medido
+    resource = None
+
+RECORD_COLUMNS = ['name', 'stack', 'start', 'wall_seconds', 'cpu_seconds', 'peak_rss_delta_kb', 'rows_in', 'rows_out', 'thread']
+
+
+def peak_rss_kb() -> float:
+    """Retorna o pico de memória residente (RSS) do processo, em KB, ou None se não disponível.
+
+    Example:
+    ----------
+    >>> peak_rss_kb() is None or peak_rss_kb() > 0
+    True
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No macOS o ru_maxrss é dado em bytes; no Linux, em KB
+    return peak / 1024 if sys.platform == 'darwin' else float(peak)
+
+
+def count_rows(value) -> int:
+    """Conta as linhas dos DataFrames (ou Series) de um valor, inclusive dentro de tuplas, listas e dicionários.
+
+    Args:
+        value: Valor qualquer, ex.: os argumentos ou o retorno de uma função.
+
+    Returns:
+        int: Total de linhas, ou None se o valor não tiver DataFrames.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Medal': [1, 2, 3]})
+    >>> count_rows(df), count_rows((df, df.head(1), 'Sport')), count_rows({'df': df}), count_rows([1, 2])
+    (3, 4, 3, None)
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (tuple, list)):
+        counts = [count for count in map(count_rows, value) if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+class Profiler:
+    """Registro das etapas instrumentadas de uma execução.
+
+    Example:
+    ----------
+    >>> profiler = Profiler()
+    >>> with profiler.stage('load') as info:
+    ...     with profiler.stage('read_csv', rows_in=None) as inner:
+    ...         inner['rows_out'] = 10
+    >>> profiler.records()[['name', 'stack', 'rows_out']].values.tolist()
+    [['read_csv', 'load;read_csv', 10], ['load', 'load', None]]
+    """
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None):
+        """Mede um bloco de código como uma etapa do pipeline.
+
+        Args:
+            name (str): Nome da etapa.
+            rows_in (int, optional): Linhas de entrada da etapa. Defaults to None.
+
+        Yields:
+            dict: Informações da etapa; o bloco pode definir info['rows_out'].
+        """
+        stack = self._stack()
+        stack.append(name)
+        info = {'rows_in': rows_in, 'rows_out': None}
+        rss = peak_rss_kb()
+        cpu = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu
+            record = {
+                'name': name,
+                'stack': ';'.join(stack),
+                'start': start - self._origin,
+                'wall_seconds': wall,
+                'cpu_seconds': cpu,
+                'peak_rss_delta_kb': None if rss is None else peak_rss_kb() - rss,
+                'rows_in': info['rows_in'],
+                'rows_out': info['rows_out'],
+                'thread': threading.get_ident(),
+            }
+            stack.pop()
+            with self._lock:
+                self._records.append(record)
+
+    def instrument(self, function, name: str = None):
+        """Retorna a função envolvida por uma etapa, que conta as linhas dos argumentos e do retorno.
+
+        Args:
+            function (callable): Função a ser instrumentada.
+            name (str, optional): Nome da etapa. Defaults to None ('<módulo>.<função>').
+
+        Returns:
+            callable: Função instrumentada.
+
+        Example:
+        ----------
+        >>> profiler = Profiler()
+        >>> head = profiler.instrument(pd.DataFrame.head, 'head')
+        >>> len(head(pd.DataFrame({'Medal': range(10)}), 3))
+        3
+        >>> profiler.records()[['name', 'rows_in', 'rows_out']].values.tolist()
+        [['head', 10, 3]]
+        """
+        name = name if name is not None else f"{function.__module__.rpartition('.')[2]}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.stage(name, rows_in=count_rows((args, kwargs))) as info:
+                result = function(*args, **kwargs)
+                info['rows_out'] = count_rows(result)
+                return result
+
+        wrapper.__instrumented__ = True
+        return wrapper
+
+    def records(self) -> pd.DataFrame:
+        """Retorna os registros das etapas, na ordem em que terminaram.
+
+        Returns:
+            pd.DataFrame: Um registro por execução de etapa, com as colunas RECORD_COLUMNS.
+        """
+        with self._lock:
+            records = list(self._records)
+        # As contagens de linhas ficam como object, para que as etapas sem DataFrame mantenham None (e não NaN)
+        return pd.DataFrame({column: pd.Series([record[column] for record in records], dtype=object if column.startswith('rows') else None)
+                             for column in RECORD_COLUMNS}, columns=RECORD_COLUMNS)
+
+    def summary(self) -> pd.DataFrame:
+        """Agrega os registros por etapa, da que mais tempo consumiu para a que menos consumiu.
+
+        Returns:
+            pd.DataFrame: Chamadas, tempo total, tempo de CPU, maior aumento de pico de memória e linhas por etapa.
+
+        Example:
+        ----------
+        >>> profiler = Profiler()
+        >>> for _ in range(3):
+        ...     with profiler.stage('save'):
+        ...         pass
+        >>> profiler.summary()['calls'].to_dict()
+        {'save': 3}
+        """
+        records = self.records()
+        summary = records.groupby('name').agg(
+            calls=('name', 'size'),
+            wall_seconds=('wall_seconds', 'sum'),
+            cpu_seconds=('cpu_seconds', 'sum'),
+            peak_rss_delta_kb=('peak_rss_delta_kb', 'max'),
+            rows_in=('rows_in', lambda rows: rows.dropna().sum()),
+            rows_out=('rows_out', lambda rows: rows.dropna().sum()),
+        )
+        return summary.sort_values('wall_seconds', ascending=False)
+
+    def chrome_trace(self) -> dict:
+        """Exporta os registros no formato de trace do chrome://tracing e do Perfetto (eventos completos, 'X').
+
+        Returns:
+            dict: Trace com a lista 'traceEvents' (tempos em microssegundos).
+
+        Example:
+        ----------
+        >>> profiler = Profiler()
+        >>> with profiler.stage('load'):
+        ...     pass
+        >>> event = profiler.chrome_trace()['traceEvents'][0]
+        >>> event['name'], event['ph'], sorted(event['args'])
+        ('load', 'X', ['cpu_ms', 'peak_rss_delta_kb', 'rows_in', 'rows_out'])
+        """
+        events = []
+        for record in self.records().to_dict(orient='records'):
+            events.append({
+                'name': record['name'],
+                'cat': record['name'].partition('.')[0],
+                'ph': 'X',
+                'ts': record['start'] * 1e6,
+                'dur': record['wall_seconds'] * 1e6,
+                'pid': os.getpid(),
+                'tid': record['thread'],
+                'args': {
+                    'cpu_ms': record['cpu_seconds'] * 1e3,
+                    'peak_rss_delta_kb': None if pd.isna(record['peak_rss_delta_kb']) else record['peak_rss_delta_kb'],
+                    'rows_in': record['rows_in'],
+                    'rows_out': record['rows_out'],
+                },
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def folded_stacks(self) -> str:
+        """Exporta o tempo próprio de cada pilha de etapas no formato "folded" (flamegraph.pl, speedscope).
+
+        O tempo próprio de uma etapa é o seu tempo total menos o das etapas chamadas dentro dela, em microssegundos.
+
+        Returns:
+            str: Uma linha por pilha: as etapas separadas por ';' e o tempo próprio.
+
+        Example:
+        ----------
+        >>> profiler = Profiler()
+        >>> with profiler.stage('main'):
+        ...     with profiler.stage('save'):
+        ...         time.sleep(0.01)
+        >>> [line.split(' ')[0] for line in profiler.folded_stacks().splitlines()]
+        ['main', 'main;save']
+        """
+        records = self.records()
+        total = records.groupby('stack')['wall_seconds'].sum()
+
+        # Pilha "pai" de cada pilha; o tempo dos filhos é descontado do pai
+        parents = pd.Series([stack.rpartition(';')[0] for stack in total.index], index=total.index)
+        children = total[parents != ''].groupby(parents[parents != '']).sum()
+        own = (total - children.reindex(total.index, fill_value=0)).clip(lower=0)
+
+        return '\n'.join(f'{stack} {round(seconds * 1e6)}' for stack, seconds in own.sort_index().items())
+
+    def save(self, directory: str) -> tuple:
+        """Grava o trace JSON e as pilhas folded da execução.
+
+        Args:
+            directory (str): Diretório de saída.
+
+        Returns:
+            tuple: Caminhos do trace ('trace.json') e do perfil ('profile.folded').
+        """
+        os.makedirs(directory, exist_ok=True)
+        trace_path = os.path.join(directory, 'trace.json')
+        folded_path = os.path.join(directory, 'profile.folded')
+        with open(trace_path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file, default=str)
+        with open(folded_path, 'w', encoding='utf-8') as file:
+            file.write(self.folded_stacks() + '\n')
+        return trace_path, folded_path
+
+
+def stage(profiler: Profiler, name: str, rows_in: int = None):
+    """Etapa do profiler, ou um contexto vazio quando a instrumentação está desligada (profiler None).
+
+    Args:
+        profiler (Profiler): Profiler da execução, ou None.
+        name (str): Nome da etapa.
+        rows_in (int, optional): Linhas de entrada da etapa. Defaults to None.
+
+    Returns:
+        contextmanager: Contexto da etapa, que produz o dicionário de informações da etapa.
+
+    Example:
+    ----------
+    >>> with stage(None, 'load') as info:
+    ...     info['rows_out'] = 10
+    """
+    return profiler.stage(name, rows_in) if profiler is not None else nullcontext({})
+
+
+def instrument_module(module, profiler: Profiler, directory: str = None) -> list:
+    """Instrumenta as funções públicas de um módulo, substituindo-as no próprio módulo.
+
+    Como as chamadas entre funções do módulo passam pelos seus globais, elas também são medidas. Funções
+    importadas de outros módulos (ex.: `from data_cleaner import *`) só são instrumentadas se vierem de um
+    arquivo do diretório dado.
+
+    Args:
+        module (module): Módulo a ser instrumentado.
+        profiler (Profiler): Profiler que recebe os registros.
+        directory (str, optional): Diretório dos módulos cujas funções podem ser instrumentadas.
+            Defaults to None (só as funções definidas no próprio módulo).
+
+    Returns:
+        list: Nomes das funções instrumentadas.
+    """
+    instrumented = []
+    for name, value in list(vars(module).items()):
+        if name.startswith('_') or not inspect.isfunction(value) or getattr(value, '__instrumented__', False):
+            continue
+        source = inspect.getsourcefile(value) or ''
+        if value.__module__ == module.__name__ or (directory is not None and os.path.dirname(os.path.abspath(source)) == directory):
+            setattr(module, name, profiler.instrument(value))
+            instrumented.append(name)
+    return instrumented
+
+
+def instrument_package(directory: str, profiler: Profiler) -> list:
+    """Instrumenta todos os módulos já importados que estão em um diretório (ex.: src).
+
+    Os módulos do src podem estar carregados duas vezes (como `src.x` pelo main e como `x` pelos imports
+    internos); as duas cópias são instrumentadas.
+
+    Args:
+        directory (str): Diretório dos módulos.
+        profiler (Profiler): Profiler que recebe os registros.
+
+    Returns:
+        list: Nomes dos módulos instrumentados.
+    """
+    directory = os.path.abspath(directory)
+    modules = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path is None or module.__name__.rpartition('.')[2] == __name__.rpartition('.')[2]:
+            continue
+        if os.path.dirname(os.path.abspath(path)) == directory:
+            instrument_module(module, profiler, directory)
+            modules.append(module.__name__)
+    return sorted(modules)
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
@@ -2,11 +2,19 @@
 média de medalhas ganhas por olimpíada para países nos últimos 50 anos.
 Scatterplot para analisar a Urbanização Percentual X Densidade Urbana de Medalhas (qtd. de medalhas por habitante urbano).
 """
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from data_cleaner import *
+from checkpoint import CheckpointWriter
+from world_geometry import load_world_geometry
+from choropleth import world_renderer
+from annotations import top_k, merge_label_sets
+from figures import create_figure
+from chart_spec import ChartSpec, FrameCache, chart
+from matplotlib.figure import Figure
 
 
 def prepare_2016_medalist_urbanization_analysis(athletes_df: pd.DataFrame, urbanization_df: pd.DataFrame, noc_df: pd.DataFrame) -> pd.DataFrame:
@@ -20,10 +28,9 @@ def prepare_2016_medalist_urbanization_analysis(athletes_df: pd.DataFrame, urban
         pd.DataFrame: DataFrame com dados de medalistas e urbanização em 2016.
     """
     # Filtragem dos atletas medalhistas para Análise e união com os dados de urbanização
-    athletes_df.loc[:, 'Medal'] = athletes_df['Medal'].apply(lambda x: 1 if x in [1, 2, 3] else 0) # Só queremos saber se ganhou ou não
     athletes_2016 = athletes_df[athletes_df['Year'] == 2016]
-    medal_count_per_country_2016 = athletes_2016.groupby('NOC')['Medal'].sum().reset_index()
-    medal_count_per_country_2016.rename(columns={'Medal': 'Medalists'}, inplace=True)
+    # Só queremos saber se ganhou ou não
+    medal_count_per_country_2016 = medalist_mask(athletes_2016).groupby(athletes_2016['NOC']).sum().reset_index(name='Medalists')
 
     # Merge com noc_df pra mappear NOC no nome do país
     medal_count_per_country_2016 = pd.merge(medal_count_per_country_2016, noc_df[['NOC', 'Country']], on='NOC', how='left')
@@ -45,63 +52,66 @@ def prepare_2016_medalist_urbanization_analysis(athletes_df: pd.DataFrame, urban
     return data_2016
 
 
-def create_scatterplot_2016_medalist_urbanization(data_2016: pd.DataFrame) -> plt:
+def create_scatterplot_2016_medalist_urbanization(data_2016: pd.DataFrame, k: int = 5, cache: FrameCache = None) -> Figure:
     """Função que gera um scatterplot com a relação entre a urbanização percentual e a densidade de medalhas por habitante urbano.
     
     Args:
         data_2016 (pd.DataFrame): DataFrame com dados de medalistas e urbanização em 2016.
+        k (int, optional): Quantidade de países anotados em cada ranking (top, bottom e mais medalhistas). Defaults to 5.
+        cache (FrameCache, optional): Cache onde os dados e o spec são guardados ('urbanization_medal_density_2016'). Defaults to None.
         
     Returns:
-        plt: Objeto do tipo matplotlib.pyplot com o scatterplot.
+        Figure: Figura do matplotlib com o scatterplot.
     """
-    # Scatterplot com Seaborn
-    sns.set_theme(style="whitegrid")
-    sns.set_palette("rocket")
-
-    scatterplot = sns.scatterplot(x='Urban_Pop_Percent', y='Urban_Medalist_Density', data=data_2016, size='Medalists', sizes=(10, 100), legend=False)
-    scatterplot.set_yscale('log') # Escala logarítmica para melhor visualização
-
-    scatterplot.set_title('Urbanization vs Urban Medal Density (2016)')
-    scatterplot.set_xlabel('Urban Population (%)')
-    scatterplot.set_ylabel('Medals per Urban Inhabitant')
-
-    # Identificando o top 5 e bottom 5 por Urban_Medalist_Density; também pegando o top 5 por medalhistas
-    top_5_countries = data_2016.nlargest(5, 'Urban_Medalist_Density')
-    bottom_5_countries = data_2016.nsmallest(5, 'Urban_Medalist_Density')
-    most_medalists = data_2016.nlargest(5, 'Medalists')
-    brazil = data_2016[data_2016['Country'] == 'Brazil']
-
-    # Anotando o scatterplot com os países
-    colorir = [top_5_countries, bottom_5_countries, most_medalists, brazil]
-    colors = ['seagreen', '#e35252', '#d67e20', '#037bfc']
-    font_sizes = [7, 7, 6, 6]
-    for i, df in enumerate(colorir):
-        for _, row in df.iterrows():
-            scatterplot.text(row['Urban_Pop_Percent'], row['Urban_Medalist_Density'], row['Country'], color=colors[i], weight='bold', fontsize=font_sizes[i])
-
-    return scatterplot
+    # Identificando o top k e bottom k por Urban_Medalist_Density; também pegando o top k por medalhistas e o Brasil
+    # Países em mais de um conjunto são anotados uma única vez, com a cor do último conjunto
+    positions, colors, font_sizes = merge_label_sets([
+        (top_k(data_2016, 'Urban_Medalist_Density', k), 'seagreen', 7),
+        (top_k(data_2016, 'Urban_Medalist_Density', k, largest=False), '#e35252', 7),
+        (top_k(data_2016, 'Medalists', k), '#d67e20', 6),
+        (np.flatnonzero(data_2016['Country'].to_numpy() == 'Brazil'), '#037bfc', 6),
+    ])
+
+    # Os rótulos viram colunas do DataFrame do gráfico (vazias nos países não anotados)
+    frame = data_2016[['Country', 'Medalists', 'Urban_Pop_Percent', 'Urban_Medalist_Density']].reset_index(drop=True)
+    frame['Label'] = pd.Series(frame['Country'].to_numpy()[positions], index=positions)
+    frame['Label_Color'] = pd.Series(colors, index=positions, dtype=object)
+    frame['Label_Size'] = pd.Series(font_sizes, index=positions, dtype=float)
+
+    # Escala logarítmica no eixo y para melhor visualização
+    spec = ChartSpec(
+        'urbanization_medal_density_2016', 'scatter',
+        layers=[{'x': 'Urban_Pop_Percent', 'y': 'Urban_Medalist_Density', 'size': 'Medalists', 'sizes': (10, 100), 'legend': False,
+                 'text': 'Label', 'text_color': 'Label_Color', 'text_size': 'Label_Size'}],
+        title='Urbanization vs Urban Medal Density (2016)',
+        xlabel='Urban Population (%)', ylabel='Medals per Urban Inhabitant', yscale='log',
+        theme={'style': 'whitegrid', 'palette': 'rocket'}
+    )
+
+    return chart(spec, frame, cache)
 
 
 # GeoPandas para visualização geográfica
-def prepare_map_visualization_data(athletes_df: pd.DataFrame, urbanization_df: pd.DataFrame, noc_df: pd.DataFrame) -> pd.DataFrame:
+def prepare_map_visualization_data(athletes_df: pd.DataFrame, urbanization_df: pd.DataFrame, noc_df: pd.DataFrame, checkpoint_writer: CheckpointWriter = None) -> pd.DataFrame:
     """Função para preparar os dados para entrada da função de visualização geográfica.
 
     Args:
         athletes_df (pd.DataFrame): DataFrame com dados dos atletas.
         urbanization_df (pd.DataFrame): DataFrame com dados de urbanização.
         noc_df (pd.DataFrame): DataFrame com dados de NOC.
+        checkpoint_writer (CheckpointWriter, optional): Escritor dos checkpoints intermediários. Defaults to None (sem checkpoints).
 
     Returns:
         pd.DataFrame: DataFrame com os dados de medalistas e urbanização para visualização geográfica.
     """
     # Preparação da base de atletas
-    athletes_df.loc[:, 'Medal'] = athletes_df['Medal'].apply(lambda x: 1 if x in [1, 2, 3] else 0) # Só queremos saber se ganhou ou não
-    athletes_df = athletes_df[athletes_df['Year'].between(1956, 2016)]
-    athletes_df = athletes_df[athletes_df['Medal'] > 0]
+    athletes_df = athletes_df[athletes_df['Year'].between(1956, 2016) & medalist_mask(athletes_df)] # Só queremos saber se ganhou ou não
     aggregated_df = aggregate_medals_by_event_team(athletes_df)
-    aggregated_df.to_csv('data/df_checkpoints/athletes_agregados.csv')
+    if checkpoint_writer is not None:
+        checkpoint_writer.save(aggregated_df, 'athletes_agregados')
     
-    medal_count_per_country_per_year = aggregated_df.groupby(['Year', 'NOC'])['Medal'].sum().reset_index()
+    # Cada linha agregada é uma medalha do time no evento
+    medal_count_per_country_per_year = aggregated_df.groupby(['Year', 'NOC']).size().reset_index(name='Medal')
     medal_count_per_country_per_year = pd.merge(medal_count_per_country_per_year, noc_df[['NOC', 'Country']], on='NOC', how='left')
     
     # Preparação da base de urbanização
@@ -116,16 +126,18 @@ def prepare_map_visualization_data(athletes_df: pd.DataFrame, urbanization_df: p
     # Tratamento de dados faltantes
     data = data[data['Urban_Pop_Percent'] != 'NOT APPLICABLE']
     
-    data.to_csv('data/df_checkpoints/map_visualization_data_checkpoint.csv', index=False) # Checkpoint para análise
+    if checkpoint_writer is not None:
+        checkpoint_writer.save(data, 'map_visualization_data_checkpoint') # Checkpoint para análise
     return data
 
 
-def calculate_dynamic_growth(data: pd.DataFrame, value_column: str) -> pd.DataFrame:
+def calculate_dynamic_growth(data: pd.DataFrame, value_column: str, checkpoint_writer: CheckpointWriter = None) -> pd.DataFrame:
     """Calcula o crescimento percentual de o valor especificado por coluna entre o primeiro e o último ano disponível do país.
 
     Args:
         data (pd.DataFrame): df com colunas: ,Year,NOC,Medal,Country,Pop_Absolute,Urban_Pop_Percent
         value_column (str): Colunas para calcular crescimento (e.g. 'Medal' or 'Urban_Pop_Percent').
+        checkpoint_writer (CheckpointWriter, optional): Escritor dos checkpoints intermediários. Defaults to None (sem checkpoints).
 
     Returns:
         pd.DataFrame: Dataframe com País e Crescimento Percentual daquela coluna.
@@ -153,67 +165,64 @@ def calculate_dynamic_growth(data: pd.DataFrame, value_column: str) -> pd.DataFr
     except ZeroDivisionError: # Caso onde o primeiro e o último ano são iguais
         growth_df[f'{value_column}_Dynamic_Growth'] = 0
     
-    growth_df.to_csv(f'data/df_checkpoints/growth_{value_column}_checkpoint.csv', index=False) # Checkpoint para análise
+    if checkpoint_writer is not None:
+        checkpoint_writer.save(growth_df, f'growth_{value_column}_checkpoint') # Checkpoint para análise
     return growth_df[['Country', f'{value_column}_Dynamic_Growth']]
 
 
-def create_map_visualization(data: pd.DataFrame) -> plt:
+def create_map_visualization(data: pd.DataFrame, checkpoint_writer: CheckpointWriter = None, cache_dir: str = None) -> Figure:
     """Função que gera a visualização geográfica dos dados com geopandas.
 
     Args:
         data (pd.DataFrame): dados preparados para visualização geográfica.
+        checkpoint_writer (CheckpointWriter, optional): Escritor dos checkpoints intermediários. Defaults to None (sem checkpoints).
+        cache_dir (str, optional): Diretório do cache em disco das geometrias. Defaults to None (world_geometry.world_cache_dir()).
         
     Returns: 
-        plt: Objeto do tipo matplotlib.pyplot com a visualização geográfica.
+        Figure: Figura do matplotlib com a visualização geográfica.
     """
     # Tratando inconsistências nos nomes dos países (de novo...)
     data = map_name_normalization(data)
     
     # Calcula o crescimento da população urbana e dos medalhistas
-    urban_growth = calculate_dynamic_growth(data, 'Urban_Pop_Percent')
-    medal_growth = calculate_dynamic_growth(data, 'Medal')
+    urban_growth = calculate_dynamic_growth(data, 'Urban_Pop_Percent', checkpoint_writer)
+    medal_growth = calculate_dynamic_growth(data, 'Medal', checkpoint_writer)
 
-    # Carrega mapa do GeoPandas
-    world = gpd.read_file('data/world_map/ne_110m_admin_0_countries.shp')
-    
-    # Merge dos dados de crescimento com o geodataframe do mundo para plotagem
-    world_urban = pd.merge(world, urban_growth, how='left', left_on='NAME', right_on='Country')
-    world_medals = pd.merge(world, medal_growth, how='left', left_on='NAME', right_on='Country')
+    # Geometrias do mundo, convertidas uma única vez para o matplotlib
+    renderer = world_renderer(cache_dir=cache_dir)
     
     # Plot crescimento da urbanização
-    plt.figure()
-    fig, ax = plt.subplots(1, 2, figsize=(20, 10))
-    plt.subplots_adjust(wspace=0)  # Adjust the width space between subplots
-    world_urban.plot(column='Urban_Pop_Percent_Dynamic_Growth', cmap='Blues', legend=False, ax=ax[0], missing_kwds={'color': 'lightgrey'}, linewidth=0.25, edgecolor='black')
+    fig, ax = create_figure(1, 2, figsize=(20, 10))
+    fig.subplots_adjust(wspace=0)  # Adjust the width space between subplots
+    renderer.plot(urban_growth.set_index('Country')['Urban_Pop_Percent_Dynamic_Growth'], ax=ax[0], cmap='Blues')
     ax[0].set_title('Urbanization Growth (First to Last Available Year)')
 
     # Plot crescimento de medalhistas
-    world_medals.plot(column='Medal_Dynamic_Growth', cmap='Reds', legend=False, ax=ax[1], missing_kwds={'color': 'lightgrey'}, linewidth=0.25, edgecolor='black')
+    renderer.plot(medal_growth.set_index('Country')['Medal_Dynamic_Growth'], ax=ax[1], cmap='Reds')
     ax[1].set_title('Medal Growth (First to Last Available Year)')
     
     fig.suptitle('Comparison of Growth in Urbanization and Medals (1956-2016)', fontsize=18, weight='bold')
-    plt.subplots_adjust(bottom=0.55)
+    fig.subplots_adjust(bottom=0.55)
 
-    return plt
+    return fig
 
 
 # Função interna para encontrar países com nomes diferentes; alguns não existem no GeoPandas (e.g. Singapura)
-def find_mismatched_countries(data: pd.DataFrame) -> pd.DataFrame:
+def find_mismatched_countries(data: pd.DataFrame, cache_dir: str = None) -> pd.DataFrame:
     """Find countries in the data that have mismatched names compared to GeoPandas world data.
 
     Args:
         data (pd.DataFrame): DataFrame containing the country names to check.
+        cache_dir (str, optional): Disk cache directory of the world geometries. Defaults to None (world_geometry.world_cache_dir()).
 
     Returns:
         pd.DataFrame: DataFrame with country names that do not match GeoPandas world dataset.
     """
-    # Load world boundaries from GeoPandas
-    world = gpd.read_file('data/world_map/ne_110m_admin_0_countries.shp')
-    
-    # Perform a left merge to check which countries in 'data' don't have a match in the GeoPandas world dataset
-    merged_data = pd.merge(data[['Country']].drop_duplicates(), world[['NAME']], left_on='Country', right_on='NAME', how='left')
+    # Load world boundaries from GeoPandas (indexed by country name, cached)
+    world = load_world_geometry(cache_dir=cache_dir)
     
-    # Find the countries where the merge resulted in NaN in the 'name' column (meaning no match in GeoPandas)
-    mismatched_countries = merged_data[merged_data['NAME'].isna()]
+    # Find the countries in 'data' that have no match in the GeoPandas world dataset
+    countries = data[['Country']].drop_duplicates()
+    mismatched_countries = countries[~countries['Country'].isin(world.index)]
     
     return mismatched_countries[['Country']]
@@ -5,6 +5,8 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 from data_cleaner import convert_athletes_df_to_paralympics_format, rename_countries_gdp
+from chart_spec import ChartSpec, FrameCache, chart, chart_name
+from matplotlib.figure import Figure
 
 
 def add_country_from_noc(df: pd.DataFrame, noc_df: pd.DataFrame) -> pd.DataFrame:
@@ -227,25 +229,25 @@ def prepare_2016_olympics_paralympics_pib_analysis(data: pd.DataFrame) -> pd.Dat
     return merged_data
 
 
-def create_heatmap(correlation_matrix: pd.DataFrame, title: str) -> None:
+def create_heatmap(correlation_matrix: pd.DataFrame, title: str, cache: FrameCache = None) -> Figure:
     """
     Cria um heatmap de correlação com a matrix de correlação e título passados.
 
     Args:
         data (pd.DataFrame): Matrix de correlação.
+        title (str): Título do heatmap.
+        cache (FrameCache, optional): Cache onde a matriz e o spec são guardados (nome gerado do título). Defaults to None.
 
     Returns:
-        plt: Objeto do tipo matplotlib.pyplot com o heatmap.
+        Figure: Figura do matplotlib com o heatmap.
     """
-    plt.figure(figsize=(12, 8))
-    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', vmin=-1, vmax=1, linewidths=0.5, annot_kws={'size': 30})
+    spec = ChartSpec(chart_name(title), 'heatmap', title=title, figsize=(12, 8),
+                     options={'annot': True, 'cmap': 'coolwarm', 'vmin': -1, 'vmax': 1, 'linewidths': 0.5, 'annot_kws': {'size': 30}})
     
-    plt.title(title)
-    
-    return plt
+    return chart(spec, correlation_matrix, cache)
 
 
-def create_scatterplot_olympics_paralympics_pib_2016(data_2016: pd.DataFrame, xlim: tuple = None, ylim: tuple = None, zlim: tuple = None) -> None:
+def create_scatterplot_olympics_paralympics_pib_2016(data_2016: pd.DataFrame, xlim: tuple = None, ylim: tuple = None, zlim: tuple = None, cache: FrameCache = None) -> Figure:
     """
     Cria um gráfico de dispersão 3D que mostra a relação entre medalhas nas
     Olimpíadas, nas Paralimpíadas e PIB dos países em 2016.
@@ -253,32 +255,22 @@ def create_scatterplot_olympics_paralympics_pib_2016(data_2016: pd.DataFrame, xl
     Args:
         data (pd.DataFrame): DataFrame preparado com colunas 'Country', 
             'M_Olympics', 'M_Paralympics' e 'GDP'.
+        xlim (tuple, optional): Limites do eixo x. Defaults to None.
+        ylim (tuple, optional): Limites do eixo y. Defaults to None.
+        zlim (tuple, optional): Limites do eixo z. Defaults to None.
+        cache (FrameCache, optional): Cache onde os dados e o spec são guardados ('olympics_paralympics_pib_2016'). Defaults to None.
 
     Returns:
-        plt: Objeto do tipo matplotlib.pyplot com o scatterplot.
+        Figure: Figura do matplotlib com o scatterplot.
     """
-    # Cria a figura e os eixos 3D
-    fig = plt.figure(figsize=(12, 8))
-    ax = fig.add_subplot(111, projection='3d')
-
-    # Plota os dados
-    ax.scatter(data_2016['M_Olympics'], data_2016['M_Paralympics'], 
-               data_2016['GDP'], c='blue', marker='o', alpha=0.6)
-
-    # Adiciona labels aos eixos
-    ax.set_xlabel('Total Medals at the Olympics')
-    ax.set_ylabel('Total Medals at the Paralympics')
-    ax.set_zlabel('GDP (in billions)')
-    ax.set_title('3D Dispersion: Medals in the Olympics and Paralympics vs GDP (2016)')
-
-    ax.view_init(elev=20, azim=-70)
-    ax.set_facecolor('#8f8f8f')
-
-    if xlim:
-        ax.set_xlim(xlim)
-    if ylim:
-        ax.set_ylim(ylim)
-    if zlim:
-        ax.set_zlim(zlim)
-
-    return plt
+    # Dispersão 3D com os eixos, a câmera e os limites descritos no spec
+    spec = ChartSpec(
+        'olympics_paralympics_pib_2016', 'scatter3d',
+        layers=[{'x': 'M_Olympics', 'y': 'M_Paralympics', 'z': 'GDP', 'c': 'blue', 'marker': 'o', 'alpha': 0.6}],
+        title='3D Dispersion: Medals in the Olympics and Paralympics vs GDP (2016)',
+        xlabel='Total Medals at the Olympics', ylabel='Total Medals at the Paralympics',
+        xlim=xlim or None, ylim=ylim or None, figsize=(12, 8),
+        options={'zlabel': 'GDP (in billions)', 'zlim': zlim or None, 'view': {'elev': 20, 'azim': -70}, 'facecolor': '#8f8f8f'}
+    )
+
+    return chart(spec, data_2016[['M_Olympics', 'M_Paralympics', 'GDP']], cache)
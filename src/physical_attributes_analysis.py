@@ -1,110 +1,130 @@
 """Modulo com as funcoes para a hipotese do perfil fisico dos atletas"""
 
-import numpy as pd
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-from data_cleaner import medals_to_int
-from data_predictor import *
 from coeficient_functions import *
+from figures import save_figure
+from chart_spec import ChartSpec, FrameCache, chart
+from attributes_report import create_medal_boxplot
+from sport_taxonomy import classify, with_taxonomy
+from density import density_grid, category_edges, step_edges
+from matplotlib.figure import Figure
 
-original = pd.read_csv('data\\athlete_events.csv')
-original = medals_to_int(original)
-# df = predict_missing(original.copy())
-
-# Classificacao dos esportes em 7 categorias, dada pelo ChatGpt
-sport_map = {
-    'Basketball': 'invasao','Judo': 'combate','Football': 'invasao','Tug-Of-War': 'invasao','Speed Skating': 'marca','Cross Country Skiing': 'marca',
-    'Athletics': 'marca','Ice Hockey': 'invasao','Swimming': 'marca','Badminton': 'rede/parede','Sailing': 'marca','Biathlon': 'tecnico-combinatorio',
-    'Gymnastics': 'tecnico-combinatorio','Art Competitions': 'tecnico-combinatorio','Alpine Skiing': 'marca','Handball': 'invasao','Weightlifting': 'marca',
-    'Wrestling': 'combate','Luge': 'tecnico-combinatorio','Water Polo': 'invasao','Hockey': 'invasao','Rowing': 'marca','Bobsleigh': 'tecnico-combinatorio',
-    'Fencing': 'tecnico-combinatorio','Equestrianism': 'tecnico-combinatorio','Shooting': 'precisao','Boxing': 'combate','Taekwondo': 'combate','Cycling': 'marca',
-    'Diving': 'marca','Canoeing': 'marca','Tennis': 'rede/parede','Modern Pentathlon': 'tecnico-combinatorio','Figure Skating': 'tecnico-combinatorio','Golf': 'precisao',
-    'Softball': 'campo/taco','Archery': 'precisao','Volleyball': 'rede/parede','Synchronized Swimming': 'tecnico-combinatorio','Table Tennis': 'rede/parede',
-    'Nordic Combined': 'tecnico-combinatorio','Baseball': 'campo/taco','Rhythmic Gymnastics': 'tecnico-combinatorio','Freestyle Skiing': 'marca','Rugby Sevens': 'invasao',
-    'Trampolining': 'tecnico-combinatorio','Beach Volleyball': 'rede/parede','Triathlon': 'marca','Ski Jumping': 'marca','Curling': 'precisao',
-    'Snowboarding': 'tecnico-combinatorio','Rugby': 'invasao','Short Track Speed Skating': 'marca','Skeleton': 'tecnico-combinatorio','Lacrosse': 'invasao',
-    'Polo': 'invasao','Racquets': 'rede/parede','Motorboating': 'marca','Jeu De Paume': 'rede/parede'
-}
-
-def get_filters(df: pd.DataFrame) -> tuple:
+
+def sports_completeness(df: pd.DataFrame, columns: list = ['Sex', 'Age', 'Height', 'Weight']) -> pd.Series:
+    """ Funcao que calcula a fracao de valores preenchidos das colunas em cada esporte.
+
+    Args:
+        df (pd.DataFrame): Dataframe com os dados brutos.
+        columns (list, optional): Colunas avaliadas. Defaults to ['Sex', 'Age', 'Height', 'Weight'].
+
+    Returns:
+        pd.Series: Fracao de valores preenchidos de cada esporte, do mais completo para o menos completo.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo', 'Judo', 'Golf'], 'Sex': ['M', 'F', 'M'],
+    ...                    'Age': [20, None, 30], 'Height': [170, 160, 180], 'Weight': [None, None, 80]})
+    >>> sports_completeness(df).to_dict()
+    {'Golf': 1.0, 'Judo': 0.625}
+    """
+    completeness = df[columns].notna().groupby(df['Sport']).mean().mean(axis=1)
+    return completeness.sort_values(ascending=False, kind='stable')
+
+
+def get_filters(df: pd.DataFrame, complete_df: pd.DataFrame = None) -> tuple:
     """ Funcao que recebe um dataframe e cria os filtros de esportes mais coerentes e esportes que o brasil mais ganhou.
 
+    Os filtros nao sao memorizados: quem os usa mais de uma vez (ex.: attributes_sports_analysis) os calcula uma
+    vez e repassa as listas (ex.: o argumento top_sports_brasil de attributes_sports_figures).
+
     Args:
-        df (pd.Dataframe): Datarame com os dados brutos.
+        df (pd.Dataframe): Datarame com os dados.
+        complete_df (pd.DataFrame, optional): Dataframe com os dados brutos (antes da imputacao de valores) usado no
+            calculo dos esportes mais completos. Defaults to None (o proprio df).
 
     Returns:
         tuple: Uma lista com os 7 esportes mais coerentes, uma lista com o esporte mais coerente de cada uma das 7 categorias e uma lista com os 7 esportes que o Brasil mais ganhou.
     """
-    # Classificacao dos esportes nas 7 categorias
-    df = df.copy()
-    df.loc[:, 'sport_class'] = df['Sport'].map(sport_map)
+    complete_df = df if complete_df is None else complete_df
 
     # Filtro para os esportes mais coerentes
-    coerentes = original[['Sport', 'Sex', 'Age', 'Height', 'Weight']].groupby('Sport').count()
-    coerentes['complete'] = coerentes.apply(lambda x: x.sum()/(x.shape[0]*x.Sex), axis=1)
-    coerentes = coerentes.reset_index().sort_values(by='complete', ascending=False).set_index('Sport')
-    sports_complete_map = coerentes['complete'].to_dict()
-    df.loc[:, 'complete'] = df['Sport'].map(sports_complete_map)
-    df = df.sort_values(by='complete', ascending=False)
-    top_sports_complete = list(sports_complete_map.keys())[:7]
-
-    # Filtro para pegar os esporte mais coerente de cada categoria
-    category = df.groupby('sport_class').first().reset_index()
-    top_sports_complete_category = category.Sport.unique().tolist()
+    completeness = sports_completeness(complete_df)
+    top_sports_complete = completeness.index[:7].tolist()
+
+    # Filtro para pegar os esporte mais coerente de cada categoria: esportes do df na ordem de completude
+    sports = pd.Index(df['Sport'].unique())
+    ranking = completeness.index[completeness.index.isin(sports)].append(sports.difference(completeness.index))
+    classes = classify(pd.Series(ranking), ['sport_class'])['sport_class'].to_numpy()
+    category = pd.Series(ranking, index=classes).groupby(level=0).first()
+    top_sports_complete_category = category.tolist()
 
     # Filtro para os esportes mais premiados do Brasil
     df_brasil = df[df['NOC'] == 'BRA']
-    df_medals_brasil = df_brasil[['Sport', 'Medal', 'Sex', 'Age', 'Height', 'Weight']].groupby('Sport').count()
-    df_medals_brasil = df_medals_brasil.reset_index().sort_values(by='Medal', ascending=False)
-    top_sports_brasil = df_medals_brasil.head(7).Sport.tolist()
-    
+    medals_brasil = df_brasil['Medal'].notna().groupby(df_brasil['Sport']).sum()
+    top_sports_brasil = medals_brasil.sort_values(ascending=False, kind='stable').head(7).index.tolist()
+
     return top_sports_complete, top_sports_complete_category, top_sports_brasil
 
 
+def attributes_r2_table(df: pd.DataFrame, filters: dict, qualis: list = ['Sport', 'sport_class'], attributes: list = ['Age', 'Height', 'Weight']) -> pd.DataFrame:
+    """ Funcao que calcula os coeficientes R2 entre as colunas de esporte e os atributos fisicos para cada filtro de esportes.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as variaveis.
+        filters (dict): Nome de cada filtro e a lista de esportes dele.
+        qualis (list, optional): Colunas qualitativas. Defaults to ['Sport', 'sport_class'].
+        attributes (list, optional): Atributos fisicos. Defaults to ['Age', 'Height', 'Weight'].
+
+    Returns:
+        pd.DataFrame: Tabela com os coeficientes, indexada pelo filtro e pela coluna qualitativa, com os atributos nas colunas.
+    """
+    df = with_taxonomy(df, ['sport_class'])
+    tables = {name_filter: r2_matrix(df[df['Sport'].isin(filter_sport)], qualis, attributes, False)
+              for name_filter, filter_sport in filters.items()}
+    return pd.concat(tables, names=['filter', 'quali'])
+
+
+def medal_attributes_r2(df: pd.DataFrame, sports: list, attributes: list = ['Age', 'Height', 'Weight']) -> pd.DataFrame:
+    """ Funcao que calcula os coeficientes R2 entre a medalha e os atributos fisicos em cada esporte, no geral e em cada pais.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as variaveis.
+        sports (list): Esportes analisados.
+        attributes (list, optional): Atributos fisicos. Defaults to ['Age', 'Height', 'Weight'].
+
+    Returns:
+        pd.DataFrame: Uma linha por NOC, esporte e atributo (NOC 'Geral' para todos os paises), com as colunas 'qtd' e 'r2'.
+    """
+    df_sports = df[df['Sport'].isin(sports)]
+    general = r2_by_group(df_sports, 'Sport', 'Medal', attributes, False)
+    general.insert(0, 'NOC', 'Geral')
+    return pd.concat([general, r2_by_group(df_sports, ['NOC', 'Sport'], 'Medal', attributes, False)], ignore_index=True)
+
+
 # df, cols_to_fix, cols_types, encoders = to_encoded(df)
 # print(f'Colunas problematicas: {cols_to_fix}\nColunas com varios tipos: {cols_types}')
-def attributes_sports_analysis(df: pd.DataFrame) -> None:
+def attributes_sports_analysis(df: pd.DataFrame, complete_df: pd.DataFrame = None) -> None:
     """ Funcao que recebe um DataFrame e analisa as possiveis relacoes de associacao entre suas variaveis de atributos fisicos com os esportes.
 
     Args:
         df (pd.DataFrame): DataFrame com as variaveis.
+        complete_df (pd.DataFrame, optional): DataFrame com os dados brutos, usado no filtro dos esportes mais completos. Defaults to None (o proprio df).
     """
     # Obtem os filtros analise
-    top_sports_complete, top_sports_complete_category, top_sports_brasil = get_filters(df)
+    top_sports_complete, top_sports_complete_category, top_sports_brasil = get_filters(df, complete_df)
 
     # Verificacao das associacoes dos atributos fisicos com as colunas de esporte (geral ou categorizado) para cada filtro
-    """for filter_sport, name_filter in zip([top_sports_complete, top_sports_complete_category, top_sports_brasil], ['Top_complete', 'Top_complete_category', 'brasil']):
-        print(f'Analisando o filtro: {name_filter}\n')
-        df_filter = df[df['Sport'].isin(filter_sport)]
-        for column_quali in ['Sport', 'sport_class']:
-            print(f'--------------- Analisando associacao com {column_quali}:')
-            for attribute in ['Age', 'Height', 'Weight']:
-                r_2 = r2(df_filter, column_quali, attribute, False)
-                print(f'Associacao entre {column_quali} e {attribute}')
-                print(f'Coeficiente r_2 = {r_2}\n')
-        print('\n\n\n')"""
+    """filters = {'Top_complete': top_sports_complete, 'Top_complete_category': top_sports_complete_category, 'brasil': top_sports_brasil}
+    print(attributes_r2_table(df, filters))"""
 
     # E evidente que a os atributos fisicos estao mais associados ao proprio esporte do que a categoria dele
     # Idade e geralmente o atributo que tem menor associacao com o esporte
     # Para os esportes mais premiados do Brasil, os atributos parecem tem maior associacao com o esporte do que quando aplicado a outros esportes
 
-    # Analise dos dados dos esportes mais premiados do Brasil
-    df_top_sports = df[df['Sport'].isin(top_sports_brasil)]
-    df_top_sports_brasil = df_top_sports[df_top_sports['NOC'] == 'BRA']
     # Analise da associacao entre os atributos fisicos e a medalha para cada esporte mais premiado do Brasil
-    """for sport in top_sports_brasil:
-        print(f'Analise do esporte: {sport}')
-        df_filter_general = df_top_sports[df_top_sports['Sport'] == sport]
-        df_filter_brasil = df_top_sports_brasil[df_top_sports_brasil['Sport'] == sport]
-        for attribute in ['Age', 'Height', 'Weight']:
-            print(f'---------------- \nAssociacao entre {attribute} e Medal - Geral')
-            print(r2(df_filter_general, 'Medal', attribute, False))
-            print(f'Associacao entre {attribute} e Medal - Brasil')
-            print(r2(df_filter_brasil, 'Medal', attribute, False))
-
-        print('\n\n')"""
+    """r2_medals = medal_attributes_r2(df, top_sports_brasil)
+    print(r2_medals[r2_medals['NOC'].isin(['Geral', 'BRA'])])"""
 
     # Calculados os coeficientes r2 entre as medalhas e os atributos fisicos para cada esporte
     # Notamos que mal existe associacao entre tais atributos e a medalha ganha pelo atleta naquele esporte
@@ -112,39 +132,117 @@ def attributes_sports_analysis(df: pd.DataFrame) -> None:
     # Vale somente ressaltar o volei, o futebol e o basquete brasileiros
     
     # Codigo para salvar os graficos da analise
+    for path, function, args in attributes_sports_figures(df, top_sports_brasil):
+        save_figure(function(*args), path)
+
+
+def attributes_sports_figures(df: pd.DataFrame, top_sports_brasil: list = None) -> list:
+    """Lista os boxplots por medalha dos esportes coletivos mais premiados do Brasil, sem renderiza-los.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os atletas.
+        top_sports_brasil (list, optional): Esportes mais premiados do Brasil. Defaults to None (calculados por get_filters).
+
+    Returns:
+        list: Tuplas (caminho do arquivo, funcao que cria a figura, argumentos da funcao).
+    """
+    if top_sports_brasil is None:
+        _, _, top_sports_brasil = get_filters(df)
+    df_top_sports_brasil = df[df['Sport'].isin(top_sports_brasil) & (df['NOC'] == 'BRA')]
+
+    figures = []
     for sport in ['Volleyball', 'Football', 'Basketball']:
         df_sport_brasil = df_top_sports_brasil[df_top_sports_brasil['Sport'] == sport]
         for attribute in ['Height', 'Weight']:
-            plt.figure()
-            sns.boxplot(x='Medal', y=attribute, data=df_sport_brasil)
-            plt.title(f'{sport} - {attribute}')
-            plt.savefig(f'graphs/physical_attributes_graphs/{sport}_{attribute}.png')
+            figures.append((f'graphs/physical_attributes_graphs/{sport}_{attribute}.png', create_medal_boxplot,
+                            (df_sport_brasil[['Medal', attribute]], sport, attribute)))
+    return figures
+
+
+def create_attribute_year_scatter(df: pd.DataFrame, attribute: str, name: str = None, cache: FrameCache = None, density: bool = True, rasterized: bool = False) -> Figure:
+    """Cria o grafico de dispersao de um atributo fisico ao longo dos anos.
+
+    No modo densidade, os atletas sao contados em uma grade (uma celula por ano e por unidade do atributo) antes
+    do desenho: o custo do grafico e o tamanho do arquivo nao crescem com a quantidade de linhas.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as colunas 'Year' e attribute.
+        attribute (str): Atributo fisico, ex.: 'Age', 'Height' ou 'Weight'.
+        name (str, optional): Nome do grafico no cache. Defaults to None ('<attribute>_ano').
+        cache (FrameCache, optional): Cache onde os dados (ou a grade) e o spec sao guardados. Defaults to None.
+        density (bool, optional): Se True, desenha a grade de densidade; senao, um ponto por atleta. Defaults to True.
+        rasterized (bool, optional): Se True, rasteriza os pontos (ou a grade) mesmo em arquivos vetoriais (svg, pdf),
+            mantendo os eixos e textos em vetor. Defaults to False.
+
+    Returns:
+        Figure: Figura do matplotlib com o grafico de dispersao.
+    """
+    spec = ChartSpec(name or f'{attribute}_ano', 'scatter', layers=[{'x': 'Year', 'y': attribute, 'rasterized': rasterized}],
+                     title=f'Correlacao: {attribute} e ano', xlabel='Year', ylabel=attribute)
+    if not density:
+        return chart(spec, df[['Year', attribute]], cache)
+
+    grid, xedges, yedges = density_grid(df, 'Year', attribute, bins=[category_edges(df['Year']), step_edges(df[attribute])])
+    spec = spec.replace(kind='density', layers=[], options={
+        'xedges': xedges.tolist(), 'yedges': yedges.tolist(), 'cmap': 'viridis', 'norm': 'log',
+        'rasterized': rasterized, 'colorbar': 'Atletas'
+    })
+    return chart(spec, grid, cache)
+
+
+def attributes_years_figures(df: pd.DataFrame, density: bool = True, vector: bool = False) -> list:
+    """Lista os graficos de dispersao dos atributos fisicos ao longo dos anos (geral e Brasil), sem renderiza-los.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os atletas.
+        density (bool, optional): Se True, os graficos usam a grade de densidade. Defaults to True.
+        vector (bool, optional): Se True, salva em svg, com os dados rasterizados e os textos em vetor. Defaults to False (png).
+
+    Returns:
+        list: Tuplas (caminho do arquivo, funcao que cria a figura, argumentos posicionais, argumentos nomeados da funcao).
+    """
+    df_brasil = df[df['NOC'] == 'BRA']
+    options = {'density': density, 'rasterized': vector}
+    extension = 'svg' if vector else 'png'
+
+    figures = []
+    for attribute in ['Age', 'Height', 'Weight']:
+        # Cada grafico tem a sua propria figura: o grafico do Brasil nao acumula os pontos do geral
+        figures.append((f'graphs/physical_attributes_graphs/{attribute}_ano.{extension}', create_attribute_year_scatter,
+                        (df[['Year', attribute]], attribute), options))
+        figures.append((f'graphs/physical_attributes_graphs/{attribute}_ano_brasil.{extension}', create_attribute_year_scatter,
+                        (df_brasil[['Year', attribute]], attribute, f'{attribute}_ano_brasil'), options))
+    return figures
+
 
+def attributes_year_corr(df: pd.DataFrame, attributes: list = ['Age', 'Height', 'Weight']) -> pd.DataFrame:
+    """Funcao que calcula a correlacao entre o ano e os atributos fisicos, no geral e no Brasil.
 
-def attributes_years_analysis(df: pd.DataFrame) -> None:
+    Args:
+        df (pd.DataFrame): df dos atletas
+        attributes (list, optional): Atributos fisicos. Defaults to ['Age', 'Height', 'Weight'].
+
+    Returns:
+        pd.DataFrame: Correlacoes com o ano, com as linhas 'Geral' e 'Brasil' e os atributos nas colunas.
+    """
+    columns = ['Year'] + attributes
+    return pd.DataFrame({
+        'Geral': corr_matrix(df, columns, False).loc['Year', attributes],
+        'Brasil': corr_matrix(df[df['NOC'] == 'BRA'], columns, False).loc['Year', attributes]
+    }).T
+
+
+def attributes_years_analysis(df: pd.DataFrame, density: bool = True, vector: bool = False) -> None:
     """Função que recebe um DataFrame e analisa as possiveis relacoes de associacao entre suas variaveis de atributos fisicos com os anos.
 
     Args:
         df (pd.DataFrame): df dos atletas
+        density (bool, optional): Se True, os graficos usam a grade de densidade. Defaults to True.
+        vector (bool, optional): Se True, salva os graficos em svg. Defaults to False.
     """
-    # Analise da correlacao entre o ano e os atributos fisicos
-    plt.xlabel('Year')
-    for attribute in ['Age', 'Height', 'Weight']:
-        plt.ylabel(attribute)
-        
-        df_brasil = df[df['NOC'] == 'BRA']
-        #print(f'\n--------------- Correlacao entre {attribute} e Year - Geral')
-        #print(corr(df, attribute, 'Year', False))
-        plt.title(f'Correlacao: {attribute} e ano')
-        plt.scatter(data=df, x='Year', y=attribute)
-        
-        plt.savefig(f'graphs/physical_attributes_graphs/{attribute}_ano.png')
-
-        #print(f'\nCorrelacao entre {attribute} e Year - Brasil')
-        #print(corr(df_brasil, attribute, 'Year', False))
-        plt.title(f'Correlacao: {attribute} e ano')
-        plt.scatter(data=df_brasil, x='Year', y=attribute)
-        plt.savefig(f'graphs/physical_attributes_graphs/{attribute}_ano_brasil.png')
+    # Analise da correlacao entre o ano e os atributos fisicos (geral e Brasil), ex.: print(attributes_year_corr(df))
+    for path, function, args, kwargs in attributes_years_figures(df, density, vector):
+        save_figure(function(*args, **kwargs), path)
 
     # Idade parece se correlacionar mais com o Ano do que os demais atributos, mas ainda assim, muito pouco
     # No Brasil, pelo contrario, a idade quase nao variou, mas as correlacoes de altura e peso com o Ano sao mais significantes (ainda pouco) que a Idade
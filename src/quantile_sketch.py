@@ -0,0 +1,374 @@
+"""Módulo com sketches de quantis (KLL) para resumir colunas numéricas sem manter todas as linhas em memória.
+
+Cada sketch guarda uma amostra ponderada dos valores, organizada em níveis (compactadores): quando um nível
+enche, seus itens são ordenados e metade deles sobe para o nível seguinte com o dobro do peso. O erro de rank
+fica limitado (aproximadamente 1.7 / k da quantidade de valores) e os sketches de blocos ou processos
+diferentes podem ser combinados com merge. Enquanto nenhum nível é compactado, os quantis são exatos.
+
+Contagem, mínimo, máximo, média e variância são mantidos de forma exata ao lado da amostra.
+"""
+import doctest
+import numpy as np
+import pandas as pd
+from group_statistics import STATISTICS_COLUMNS
+
+# Fator de decaimento das capacidades dos níveis inferiores
+_CAPACITY_DECAY = 2 / 3
+
+
+class QuantileSketch:
+    """Sketch KLL de quantis de uma coluna numérica.
+
+    Args:
+        k (int, optional): Capacidade do nível mais alto; controla a precisão e a memória. Defaults to 200.
+        seed (int, optional): Semente do gerador usado nas compactações. Defaults to None.
+
+    Example:
+    ----------
+    >>> sketch = QuantileSketch()
+    >>> sketch.update([20, 35, 25, 21, 45, 19])
+    >>> sketch.count, sketch.min, sketch.max, sketch.quantile(0.5)
+    (6, 19.0, 45.0, 23.0)
+    """
+    def __init__(self, k: int = 200, seed: int = None) -> None:
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _add_moments(self, count: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        # Combinação de Chan para média e soma dos desvios quadráticos
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = np.fmin(self.min, minimum)
+        self.max = np.fmax(self.max, maximum)
+
+    def _compress(self) -> None:
+        while sum(len(level) for level in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h in range(len(self.levels)) if len(self.levels[h]) >= self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+
+            items = np.sort(self.levels[level])
+            # Com quantidade ímpar, um item fica no nível atual
+            rest, items = items[:len(items) % 2], items[len(items) % 2:]
+            promoted = items[self._rng.integers(2)::2]
+            self.levels[level] = rest
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values) -> None:
+        """Adiciona valores ao sketch, ignorando NaN.
+
+        Args:
+            values (array-like): Valores numéricos.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        mean = values.mean()
+        self._add_moments(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Incorpora os valores de outro sketch (de outro bloco ou processo) a este.
+
+        Args:
+            other (QuantileSketch): Sketch a ser incorporado; não é modificado.
+
+        Returns:
+            QuantileSketch: O próprio sketch, para encadear chamadas.
+
+        Example:
+        ----------
+        >>> left, right = QuantileSketch(), QuantileSketch()
+        >>> left.update([1, 2, 3])
+        >>> right.update([4, 5])
+        >>> left.merge(right).quantile(0.5), left.count
+        (3.0, 5)
+        """
+        if other.count == 0:
+            return self
+
+        self._add_moments(other.count, other.mean, other.m2, other.min, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+        return self
+
+    def _weighted_items(self) -> tuple:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    @property
+    def is_exact(self) -> bool:
+        """bool: Se nenhum nível foi compactado e o sketch ainda guarda todos os valores."""
+        return len(self.levels) == 1
+
+    @property
+    def var(self) -> float:
+        """float: Variância amostral (ddof=1) dos valores; NaN com menos de dois valores."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    def quantile(self, q):
+        """Estima o quantil q dos valores, com interpolação linear entre os itens do sketch.
+
+        Args:
+            q (float | array-like): Quantil (ou quantis), entre 0 e 1.
+
+        Returns:
+            float | np.ndarray: Quantil estimado; NaN se o sketch estiver vazio.
+
+        Example:
+        ----------
+        >>> sketch = QuantileSketch()
+        >>> sketch.update([20, 21])
+        >>> sketch.quantile([0.25, 0.75]).tolist()
+        [20.25, 20.75]
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)[()]
+
+        items, weights = self._weighted_items()
+        # Cada item ocupa o centro do intervalo de ranks que representa; com pesos 1, coincide com o numpy
+        positions = np.cumsum(weights) - (weights + 1) / 2
+        result = np.interp(np.asarray(q, dtype=float) * (weights.sum() - 1), positions, items)
+        return np.clip(result, self.min, self.max)[()]
+
+    def rank(self, x, inclusive: bool = False):
+        """Estima quantos valores são menores (ou menores ou iguais) que x.
+
+        Args:
+            x (float | array-like): Valor (ou valores) de referência.
+            inclusive (bool, optional): Se True, conta também os valores iguais a x. Defaults to False.
+
+        Returns:
+            float | np.ndarray: Quantidade estimada de valores, na escala de count.
+
+        Example:
+        ----------
+        >>> sketch = QuantileSketch()
+        >>> sketch.update([1, 2, 2, 3])
+        >>> sketch.rank(2), sketch.rank(2, inclusive=True)
+        (1.0, 3.0)
+        """
+        items, weights = self._weighted_items()
+        cumulative = np.concatenate([[0], np.cumsum(weights)])
+        positions = np.searchsorted(items, x, side='right' if inclusive else 'left')
+        # Os pesos somam a contagem aproximada; a escala é ajustada para a contagem exata
+        scale = self.count / cumulative[-1] if cumulative[-1] else 0.0
+        return (cumulative[positions] * scale).astype(float)[()]
+
+    def _whiskers(self, lower_fence: float, upper_fence: float) -> tuple:
+        # Valores mais extremos dentro dos limites; o mínimo e o máximo são exatos, os demais vêm dos itens guardados
+        if self.count == 0:
+            return np.nan, np.nan
+        items, _ = self._weighted_items()
+        low = self.min if self.min >= lower_fence else items[np.searchsorted(items, lower_fence, side='left')]
+        high = self.max if self.max <= upper_fence else items[np.searchsorted(items, upper_fence, side='right') - 1]
+        return float(low), float(high)
+
+    def statistics(self, whisker: float = 1.5) -> dict:
+        """Resume o sketch nas mesmas estatísticas de group_statistics.grouped_statistics.
+
+        Args:
+            whisker (float, optional): Multiplicador do intervalo interquartil para os limites. Defaults to 1.5.
+
+        Returns:
+            dict: Estatísticas com as chaves de STATISTICS_COLUMNS.
+
+        Example:
+        ----------
+        >>> sketch = QuantileSketch()
+        >>> sketch.update([35, 45])
+        >>> stats = sketch.statistics()
+        >>> stats['q1'], stats['var'], stats['upper_fence']
+        (37.5, 50.0, 50.0)
+        """
+        q1, median, q3 = self.quantile([0.25, 0.5, 0.75]).tolist() if self.count else [np.nan] * 3
+        iqr = q3 - q1
+        lower_fence, upper_fence = q1 - whisker * iqr, q3 + whisker * iqr
+        whisker_low, whisker_high = self._whiskers(lower_fence, upper_fence)
+        return {
+            'count': self.count,
+            'min': self.min,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'max': self.max,
+            'mean': self.mean if self.count else np.nan,
+            'std': np.sqrt(self.var),
+            'var': self.var,
+            'iqr': iqr,
+            'lower_fence': lower_fence,
+            'upper_fence': upper_fence,
+            'whisker_low': whisker_low,
+            'whisker_high': whisker_high,
+        }
+
+
+class GroupedQuantileSketch:
+    """Conjunto de sketches de uma coluna, um por grupo, atualizado bloco a bloco.
+
+    Args:
+        by (list, optional): Colunas de agrupamento. Defaults to ['Sport', 'Sex', 'Year'].
+        value (str, optional): Coluna numérica resumida, ex.: 'Age', 'Height', 'Weight'. Defaults to 'Age'.
+        k (int, optional): Capacidade de cada sketch. Defaults to 200.
+        seed (int, optional): Semente dos sketches. Defaults to None.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo', 'Judo', 'Golf'], 'Sex': ['M', 'F', 'M'], 'Year': [2016] * 3, 'Age': [20, 30, 40]})
+    >>> grouped = GroupedQuantileSketch()
+    >>> grouped.update(df)
+    >>> sorted(grouped.sketches)
+    [('Golf', 'M', 2016), ('Judo', 'F', 2016), ('Judo', 'M', 2016)]
+    >>> grouped.rollup(['Sport']).statistics()['median'].tolist()
+    [40.0, 25.0]
+    """
+    def __init__(self, by: list = None, value: str = 'Age', k: int = 200, seed: int = None) -> None:
+        self.by = list(by) if by is not None else ['Sport', 'Sex', 'Year']
+        self.value = value
+        self.k = k
+        self.seed = seed
+        self.sketches = {}
+
+    def _sketch(self, key: tuple) -> QuantileSketch:
+        if key not in self.sketches:
+            self.sketches[key] = QuantileSketch(self.k, self.seed)
+        return self.sketches[key]
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Adiciona um bloco de linhas aos sketches dos seus grupos.
+
+        Args:
+            df (pd.DataFrame): Bloco com as colunas de agrupamento e a coluna de valores.
+        """
+        data = df[[*self.by, self.value]]
+        data = data[data[self.value].notna()]
+        values = data[self.value].to_numpy(dtype=float)
+
+        for key, positions in data.groupby(self.by, sort=False).indices.items():
+            self._sketch(key if isinstance(key, tuple) else (key,)).update(values[positions])
+
+    def merge(self, other: 'GroupedQuantileSketch') -> 'GroupedQuantileSketch':
+        """Incorpora os sketches de outro conjunto com as mesmas colunas de agrupamento.
+
+        Args:
+            other (GroupedQuantileSketch): Conjunto a ser incorporado; não é modificado.
+
+        Returns:
+            GroupedQuantileSketch: O próprio conjunto, para encadear chamadas.
+        """
+        if other.by != self.by or other.value != self.value:
+            raise ValueError("Sketches with different groups or values can't be merged")
+        for key, sketch in other.sketches.items():
+            self._sketch(key).merge(sketch)
+        return self
+
+    def rollup(self, by: list) -> 'GroupedQuantileSketch':
+        """Combina os sketches em grupos mais amplos, ex.: de (Sport, Sex, Year) para Sport.
+
+        Args:
+            by (list): Subconjunto das colunas de agrupamento.
+
+        Returns:
+            GroupedQuantileSketch: Novo conjunto agrupado por by.
+        """
+        by = list(np.atleast_1d(by))
+        positions = [self.by.index(column) for column in by]
+        result = GroupedQuantileSketch(by, self.value, self.k, self.seed)
+        for key, sketch in self.sketches.items():
+            result._sketch(tuple(key[i] for i in positions)).merge(sketch)
+        return result
+
+    def _index(self) -> pd.Index:
+        keys = sorted(self.sketches)
+        if len(self.by) == 1:
+            return pd.Index([key[0] for key in keys], name=self.by[0])
+        return pd.MultiIndex.from_tuples(keys, names=self.by)
+
+    def statistics(self, whisker: float = 1.5) -> pd.DataFrame:
+        """Calcula as estatísticas de cada grupo a partir dos sketches.
+
+        Args:
+            whisker (float, optional): Multiplicador do intervalo interquartil para os limites. Defaults to 1.5.
+
+        Returns:
+            pd.DataFrame: DataFrame indexado pelos grupos, com as colunas de STATISTICS_COLUMNS
+                (mesmo formato de group_statistics.grouped_statistics).
+        """
+        rows = [self.sketches[key].statistics(whisker) for key in sorted(self.sketches)]
+        return pd.DataFrame(rows, index=self._index(), columns=STATISTICS_COLUMNS)
+
+    def outlier_counts(self, whisker: float = 1.5) -> pd.Series:
+        """Estima, pelo rank dos limites, quantos valores de cada grupo estão fora do intervalo interquartil.
+
+        Args:
+            whisker (float, optional): Multiplicador do intervalo interquartil. Defaults to 1.5.
+
+        Returns:
+            pd.Series: Quantidade (inteira) estimada de outliers por grupo.
+        """
+        counts = []
+        for key in sorted(self.sketches):
+            sketch = self.sketches[key]
+            stats = sketch.statistics(whisker)
+            below = sketch.rank(stats['lower_fence'])
+            above = sketch.count - sketch.rank(stats['upper_fence'], inclusive=True)
+            counts.append(int(round(below + above)))
+        return pd.Series(counts, index=self._index(), dtype=int)
+
+
+def sketch_frame(df: pd.DataFrame, by: list = None, values: list = None, k: int = 200, chunksize: int = None, seed: int = None) -> dict:
+    """Resume as colunas numéricas de um DataFrame em sketches por grupo, processando-o em blocos.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados.
+        by (list, optional): Colunas de agrupamento. Defaults to None (['Sport', 'Sex', 'Year']).
+        values (list, optional): Colunas resumidas. Defaults to None (['Age', 'Height', 'Weight']).
+        k (int, optional): Capacidade de cada sketch. Defaults to 200.
+        chunksize (int, optional): Quantidade de linhas por bloco. Defaults to None (um único bloco).
+        seed (int, optional): Semente dos sketches. Defaults to None.
+
+    Returns:
+        dict: GroupedQuantileSketch de cada coluna resumida.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo'] * 4, 'Sex': ['M'] * 4, 'Year': [2016] * 4,
+    ...                    'Age': [20, 30, 25, 35], 'Height': [170, 180, 175, 185], 'Weight': [70, 80, 75, 85]})
+    >>> sketches = sketch_frame(df, chunksize=2)
+    >>> sketches['Height'].statistics().loc[('Judo', 'M', 2016), 'median']
+    177.5
+    """
+    values = values if values is not None else ['Age', 'Height', 'Weight']
+    sketches = {value: GroupedQuantileSketch(by, value, k, seed) for value in values}
+    chunksize = chunksize or max(len(df), 1)
+
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        for sketch in sketches.values():
+            sketch.update(chunk)
+    return sketches
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
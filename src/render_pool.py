@@ -0,0 +1,172 @@
+"""Módulo com o serviço de renderização das figuras em paralelo.
+
+Cada figura é descrita por um FigureSpec (função que cria a figura, seus argumentos e o arquivo de saída).
+As especificações são enviadas a um pool de processos com o backend não interativo Agg, onde cada figura é
+criada, salva (a rasterização do savefig é a etapa mais cara) e fechada. O resultado é um relatório com o
+tempo de criação e de gravação de cada figura.
+"""
+import os
+import time
+import doctest
+import matplotlib
+import pandas as pd
+import matplotlib.pyplot as plt
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from figures import save_figure
+
+REPORT_COLUMNS = ['path', 'build_seconds', 'save_seconds', 'total_seconds', 'worker']
+
+
+@dataclass
+class FigureSpec:
+    """Especificação de uma figura a ser renderizada.
+
+    Args:
+        function (callable): Função de nível de módulo que cria a figura (retornando Figure, Axes ou o módulo plt).
+        path (str, optional): Arquivo de saída; None quando a própria função salva as figuras. Defaults to None.
+        args (tuple, optional): Argumentos posicionais da função. Defaults to ().
+        kwargs (dict, optional): Argumentos nomeados da função. Defaults to {}.
+        savefig (dict, optional): Argumentos do savefig, ex.: {'dpi': 300}. Defaults to {}.
+        inline (bool, optional): Se True, renderiza no processo principal (ex.: argumentos que não podem
+            ser enviados a outro processo). Defaults to False.
+        inputs (tuple, optional): Arquivos lidos pela função além dos argumentos (ex.: CSVs lidos na importação
+            do módulo); entram na impressão digital do build_manifest. Defaults to ().
+    """
+    function: callable
+    path: str = None
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    savefig: dict = field(default_factory=dict)
+    inline: bool = False
+    inputs: tuple = ()
+
+    @property
+    def name(self) -> str:
+        """str: Nome usado no relatório: o arquivo de saída ou, sem ele, o nome da função."""
+        return self.path if self.path is not None else self.function.__name__
+
+
+def figure_of(result) -> Figure:
+    """Obtém a figura a partir do retorno de uma função de gráfico.
+
+    Args:
+        result (Figure | Axes | module): Figura, eixo ou o módulo pyplot (figura atual).
+
+    Returns:
+        Figure: Figura correspondente.
+
+    Example:
+    ----------
+    >>> fig, ax = plt.subplots()
+    >>> figure_of(ax) is fig and figure_of(fig) is fig and figure_of(plt) is fig
+    True
+    >>> plt.close(fig)
+    """
+    if isinstance(result, Figure):
+        return result
+    if isinstance(result, Axes):
+        return result.figure
+    return plt.gcf()
+
+
+def render_figure(spec: FigureSpec) -> dict:
+    """Cria, salva e fecha a figura de uma especificação, medindo o tempo de cada etapa.
+
+    Args:
+        spec (FigureSpec): Especificação da figura.
+
+    Returns:
+        dict: Linha do relatório, com as chaves de REPORT_COLUMNS.
+    """
+    start = time.perf_counter()
+    result = spec.function(*spec.args, **spec.kwargs)
+    built = time.perf_counter()
+
+    if spec.path is not None:
+        save_figure(figure_of(result), spec.path, **spec.savefig)
+    saved = time.perf_counter()
+
+    return {
+        'path': spec.name,
+        'build_seconds': built - start,
+        'save_seconds': saved - built,
+        'total_seconds': saved - start,
+        'worker': os.getpid(),
+    }
+
+
+def _init_render_worker() -> None:
+    matplotlib.use('Agg')
+
+
+def render_figures(specs: list, max_workers: int = None) -> pd.DataFrame:
+    """Renderiza as figuras em paralelo, em um pool de processos com o backend Agg.
+
+    As especificações com inline=True são renderizadas no processo principal enquanto o pool trabalha.
+
+    Args:
+        specs (list): Lista de FigureSpec.
+        max_workers (int, optional): Número de processos; 1 renderiza tudo no processo atual. Defaults to None (número de CPUs).
+
+    Returns:
+        pd.DataFrame: Relatório com o tempo de cada figura (colunas REPORT_COLUMNS), na ordem das especificações.
+
+    Example:
+    ----------
+    >>> render_figures([]).columns.tolist()
+    ['path', 'build_seconds', 'save_seconds', 'total_seconds', 'worker']
+    """
+    pooled = [spec for spec in specs if not spec.inline and max_workers != 1]
+    rows = {}
+
+    if pooled:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker) as executor:
+            futures = {id(spec): executor.submit(render_figure, spec) for spec in pooled}
+            for spec in specs:
+                if id(spec) not in futures:
+                    rows[id(spec)] = render_figure(spec)
+            for key, future in futures.items():
+                rows[key] = future.result()
+    else:
+        for spec in specs:
+            rows[id(spec)] = render_figure(spec)
+
+    return pd.DataFrame([rows[id(spec)] for spec in specs], columns=REPORT_COLUMNS)
+
+
+def format_timing_report(report: pd.DataFrame, wall_seconds: float = None) -> str:
+    """Formata o relatório de tempos das figuras, da mais lenta para a mais rápida.
+
+    Args:
+        report (pd.DataFrame): Relatório retornado por render_figures.
+        wall_seconds (float, optional): Tempo total decorrido da renderização. Defaults to None.
+
+    Returns:
+        str: Relatório em texto.
+
+    Example:
+    ----------
+    >>> report = pd.DataFrame([['a.png', 0.5, 1.5, 2.0, 1], ['b.png', 0.1, 0.4, 0.5, 2]], columns=REPORT_COLUMNS)
+    >>> print(format_timing_report(report, wall_seconds=2.1))
+     total   build    save  figure
+     2.00s   0.50s   1.50s  a.png
+     0.50s   0.10s   0.40s  b.png
+    2 figures, 2.50s of rendering in 2.10s (1.19x)
+    """
+    lines = [f"{'total':>6}  {'build':>6}  {'save':>6}  figure"]
+    for row in report.sort_values('total_seconds', ascending=False).itertuples():
+        lines.append(f'{row.total_seconds:>5.2f}s  {row.build_seconds:>5.2f}s  {row.save_seconds:>5.2f}s  {row.path}')
+
+    busy = report['total_seconds'].sum()
+    summary = f'{len(report)} figures, {busy:.2f}s of rendering'
+    if wall_seconds:
+        summary += f' in {wall_seconds:.2f}s ({busy / wall_seconds:.2f}x)'
+    lines.append(summary)
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
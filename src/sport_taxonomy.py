@@ -0,0 +1,88 @@
+"""Módulo com a taxonomia dos esportes: tabela de classificações (data/sport_taxonomy.csv) indexada pelo esporte.
+
+Cada coluna da tabela é um esquema de classificação (ex.: 'sport_class', com as 7 categorias usadas na análise
+dos atributos físicos, e 'season'). A tabela é consultada uma vez por categoria de esporte, não por linha: os
+esportes das linhas viram códigos categóricos e cada esquema é aplicado com um take sobre esses códigos.
+"""
+import doctest
+import functools
+import numpy as np
+import pandas as pd
+from data_loader import data_path
+
+TAXONOMY_FILE = 'sport_taxonomy.csv'
+
+
+def load_taxonomy(path: str = None) -> pd.DataFrame:
+    """Lê a tabela de taxonomia dos esportes, uma única vez por processo e arquivo.
+
+    Args:
+        path (str, optional): Caminho do CSV, com a coluna 'Sport' e uma coluna por esquema. Defaults to None
+            (sport_taxonomy.csv no diretório dos dados, ver data_loader).
+
+    Returns:
+        pd.DataFrame: Tabela indexada pelo esporte, com uma coluna por esquema de classificação.
+    """
+    return _read_taxonomy(path if path is not None else data_path(TAXONOMY_FILE))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_taxonomy(path: str) -> pd.DataFrame:
+    return pd.read_csv(path).set_index('Sport')
+
+
+def classify(sports: pd.Series, schemes: list = None, taxonomy: pd.DataFrame = None) -> pd.DataFrame:
+    """Classifica os esportes de cada linha em um ou mais esquemas da taxonomia.
+
+    Os esportes são convertidos em códigos categóricos (sem custo se a coluna já for categórica) e a taxonomia é
+    consultada só para as categorias; cada esquema é então aplicado às linhas por indexação dos códigos.
+    Esportes fora da taxonomia ficam sem classificação (NaN).
+
+    Args:
+        sports (pd.Series): Esportes de cada linha.
+        schemes (list, optional): Esquemas de classificação (colunas da taxonomia). Defaults to None (todos).
+        taxonomy (pd.DataFrame, optional): Tabela de taxonomia. Defaults to None (load_taxonomy()).
+
+    Returns:
+        pd.DataFrame: Uma coluna categórica por esquema, com o mesmo índice de sports.
+
+    Example:
+    ----------
+    >>> taxonomy = pd.DataFrame({'sport_class': ['combate', 'precisao'], 'season': ['Summer', 'Summer']},
+    ...                         index=pd.Index(['Judo', 'Golf'], name='Sport'))
+    >>> classify(pd.Series(['Golf', 'Judo', 'Polo', 'Judo']), taxonomy=taxonomy)['sport_class'].tolist()
+    ['precisao', 'combate', nan, 'combate']
+    """
+    taxonomy = taxonomy if taxonomy is not None else load_taxonomy()
+    schemes = list(schemes) if schemes is not None else taxonomy.columns.tolist()
+    sports = pd.Series(sports)
+    categorical = sports.astype('category') if not isinstance(sports.dtype, pd.CategoricalDtype) else sports
+
+    # Linha da taxonomia de cada categoria (-1 fora da taxonomia); o código -1 das linhas ausentes cai no último item
+    positions = taxonomy.index.get_indexer(categorical.cat.categories)
+    codes = categorical.cat.codes.to_numpy()
+
+    result = {}
+    for scheme in schemes:
+        scheme_codes, levels = pd.factorize(taxonomy[scheme])
+        lookup = np.append(np.where(positions >= 0, scheme_codes[positions], -1), -1)
+        result[scheme] = pd.Categorical.from_codes(lookup[codes], categories=levels)
+    return pd.DataFrame(result, index=sports.index)
+
+
+def with_taxonomy(df: pd.DataFrame, schemes: list = None, taxonomy: pd.DataFrame = None) -> pd.DataFrame:
+    """Adiciona ao DataFrame uma coluna por esquema de classificação dos esportes da coluna 'Sport'.
+
+    Args:
+        df (pd.DataFrame): DataFrame com a coluna 'Sport'.
+        schemes (list, optional): Esquemas de classificação. Defaults to None (todos).
+        taxonomy (pd.DataFrame, optional): Tabela de taxonomia. Defaults to None (load_taxonomy()).
+
+    Returns:
+        pd.DataFrame: Cópia do DataFrame com as colunas dos esquemas.
+    """
+    return df.assign(**classify(df['Sport'], schemes, taxonomy))
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
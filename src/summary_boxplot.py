@@ -0,0 +1,126 @@
+"""Módulo com o desenho de boxplots a partir de resumos já calculados.
+
+Em vez de passar todas as linhas para o sns.boxplot (que recalcula quartis e bigodes), os boxplots são
+desenhados com o bxp do matplotlib a partir das estatísticas de group_statistics (ou dos sketches de
+quantile_sketch) e apenas dos valores outliers. O custo do desenho depende da quantidade de grupos e de
+outliers, não da quantidade de linhas.
+"""
+import doctest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from group_statistics import grouped_statistics, iqr_outliers
+
+
+def box_summaries(stats: pd.DataFrame, fliers: dict = None, order: list = None, labels: dict = None) -> list:
+    """Converte as estatísticas por grupo nos resumos usados pelo bxp do matplotlib.
+
+    Args:
+        stats (pd.DataFrame): Estatísticas indexadas pelos grupos, no formato de grouped_statistics.
+        fliers (dict, optional): Outliers (array) de cada grupo. Defaults to None (sem outliers).
+        order (list, optional): Grupos desenhados, na ordem desejada. Defaults to None (todos, na ordem de stats).
+        labels (dict, optional): Rótulo de cada grupo. Defaults to None (o próprio grupo).
+
+    Returns:
+        list: Um dicionário por grupo, com as chaves 'label', 'med', 'q1', 'q3', 'whislo', 'whishi', 'mean' e 'fliers'.
+
+    Example:
+    ----------
+    >>> stats = grouped_statistics(pd.DataFrame({'Sport': ['Judo'] * 5, 'Age': [20, 21, 22, 23, 60]}), 'Sport', 'Age')
+    >>> summary = box_summaries(stats, {'Judo': np.array([60])})[0]
+    >>> summary['label'], summary['q1'], summary['med'], summary['q3'], summary['whislo'], summary['whishi'], summary['fliers'].tolist()
+    ('Judo', 21.0, 22.0, 23.0, 20.0, 23.0, [60.0])
+    """
+    order = stats.index.tolist() if order is None else [group for group in order if group in stats.index]
+    fliers = fliers if fliers is not None else {}
+    labels = labels if labels is not None else {}
+
+    summaries = []
+    for group in order:
+        row = stats.loc[group]
+        summaries.append({
+            'label': labels.get(group, group),
+            'med': float(row['median']),
+            'q1': float(row['q1']),
+            'q3': float(row['q3']),
+            'whislo': float(row['whisker_low']),
+            'whishi': float(row['whisker_high']),
+            'mean': float(row['mean']),
+            'fliers': np.asarray(fliers.get(group, []), dtype=float),
+        })
+    return summaries
+
+
+def grouped_box_summaries(df: pd.DataFrame, by, value: str, order: list = None, labels: dict = None, whisker: float = 1.5, stats: pd.DataFrame = None) -> list:
+    """Calcula os resumos dos boxplots de uma coluna para cada grupo, em uma única passada.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados (usado apenas para os outliers quando stats é dado).
+        by (str | list): Coluna (ou lista de colunas) de agrupamento.
+        value (str): Coluna numérica.
+        order (list, optional): Grupos desenhados, na ordem desejada. Defaults to None (todos).
+        labels (dict, optional): Rótulo de cada grupo. Defaults to None.
+        whisker (float, optional): Multiplicador do intervalo interquartil para os bigodes. Defaults to 1.5.
+        stats (pd.DataFrame, optional): Estatísticas já calculadas (ex.: a partir de sketches). Defaults to None (calcula).
+
+    Returns:
+        list: Resumos no formato de box_summaries.
+
+    Example:
+    ----------
+    >>> df = pd.DataFrame({'Sport': ['Judo'] * 5 + ['Golf'] * 2, 'Age': [20, 21, 22, 23, 60, 40, 41]})
+    >>> [(summary['label'], summary['fliers'].tolist()) for summary in grouped_box_summaries(df, 'Sport', 'Age', order=['Judo', 'Golf'])]
+    [('Judo', [60.0]), ('Golf', [])]
+    """
+    if stats is None:
+        stats = grouped_statistics(df, by, value, whisker)
+    _, mask = iqr_outliers(df, by, value, whisker, stats)
+
+    keys = np.atleast_1d(by).tolist()
+    outliers = df.loc[mask, [*keys, value]]
+    # Com uma única coluna, os grupos são escalares, como no índice de stats
+    fliers = {group: values.to_numpy() for group, values in outliers.groupby(keys[0] if len(keys) == 1 else keys)[value]}
+    return box_summaries(stats, fliers, order, labels)
+
+
+def summary_boxplot(summaries: list, ax: plt.Axes = None, color: str = 'C0', showfliers: bool = True, **kwargs) -> plt.Axes:
+    """Desenha os boxplots a partir dos resumos, com o bxp do matplotlib.
+
+    Args:
+        summaries (list): Resumos no formato de box_summaries.
+        ax (plt.Axes, optional): Eixo do gráfico. Defaults to None (eixo atual).
+        color (str, optional): Cor das caixas. Defaults to 'C0'.
+        showfliers (bool, optional): Se True, desenha os outliers. Defaults to True.
+        **kwargs: Argumentos repassados ao bxp.
+
+    Returns:
+        plt.Axes: Eixo com os boxplots.
+
+    Example:
+    ----------
+    >>> fig, ax = plt.subplots()
+    >>> summaries = [{'label': 'Judo', 'med': 22, 'q1': 21, 'q3': 23, 'whislo': 20, 'whishi': 23, 'fliers': [60]}]
+    >>> ax = summary_boxplot(summaries, ax=ax)
+    >>> [label.get_text() for label in ax.get_xticklabels()]
+    ['Judo']
+    >>> plt.close(fig)
+    """
+    ax = ax if ax is not None else plt.gca()
+    if not summaries:
+        return ax
+
+    ax.bxp(
+        summaries, patch_artist=True, showfliers=showfliers,
+        boxprops={'facecolor': color, 'edgecolor': '0.25'},
+        medianprops={'color': '0.25'},
+        whiskerprops={'color': '0.25'},
+        capprops={'color': '0.25'},
+        flierprops={'marker': 'd', 'markerfacecolor': '0.25', 'markeredgecolor': '0.25', 'markersize': 4},
+        **kwargs
+    )
+    ax.set_xticks(range(1, len(summaries) + 1), [str(summary['label']) for summary in summaries])
+    return ax
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
@@ -2,8 +2,22 @@
 
 import pandas as pd
 from data_cleaner import *
+from data_loader import data_path
 import doctest
 
+# Arquivos lidos por create_dataframes, relativos ao diretório dos dados (ver data_loader)
+DATAFRAMES_FILES = ['athlete_events.csv', 'modified_medal_athlete.csv', 'summer_paralympics.csv', 'winter_paralympics.csv']
+
+
+def dataframes_files() -> list:
+    """Retorna os caminhos dos arquivos lidos por create_dataframes, no diretório dos dados.
+
+    Returns:
+        list: Caminhos dos arquivos de DATAFRAMES_FILES.
+    """
+    return [data_path(name) for name in DATAFRAMES_FILES]
+
+
 def count_athletes(df: pd.DataFrame, *args) -> pd.DataFrame:
     """Função que conta a quantidade de atletas e agrupa pela lista passada.
 
@@ -108,10 +122,7 @@ def create_dataframes() -> tuple:
         tuple: dataframes para análise
     """
     # Preparação dos DataFrames para as análises
-    df1 = pd.read_csv("data/athlete_events.csv")
-    df2 = pd.read_csv("data/modified_medal_athlete.csv")
-    df3 = pd.read_csv("data/summer_paralympics.csv")
-    df4 = pd.read_csv("data/winter_paralympics.csv")
+    df1, df2, df3, df4 = [pd.read_csv(path) for path in dataframes_files()]
     df3 = pd.concat([df3, df4])
     df3.sort_values(by=['Year'], inplace=True)
     df1 = medals_to_int(df1)
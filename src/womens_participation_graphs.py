@@ -1,14 +1,27 @@
 """Módulo para geração de gráficos de dispersão comparando a participação e desempenho de atletas masculinos e femininos nas Olimpíadas e Paralimpíadas."""
 
+import functools
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from data_cleaner import *
 from womens_participation import *
+from chart_spec import ChartSpec, FrameCache, chart, chart_name
+from matplotlib.figure import Figure
 
-olymp_df, olymp_countries_df, paralymp_df, paralymp_countries_df = create_dataframes()
 
-def plot_scatter_graph(df: pd.DataFrame, x: str, y1: str, y2: str, title: str, score_or_amount: str) -> plt:
+
+@functools.lru_cache(maxsize=None)
+def womens_dataframes() -> tuple:
+    """Lê os DataFrames das olimpíadas e paralimpíadas (create_dataframes) na primeira chamada, não na importação do módulo.
+
+    Returns:
+        tuple: olymp_df, olymp_countries_df, paralymp_df e paralymp_countries_df.
+    """
+    return create_dataframes()
+
+
+def plot_scatter_graph(df: pd.DataFrame, x: str, y1: str, y2: str, title: str, score_or_amount: str, cache: FrameCache = None) -> Figure:
     """Função que recebe um DataFrame e plota um gráfico de dispersão com os dados de duas variáveis.
 
     Args:
@@ -18,16 +31,21 @@ def plot_scatter_graph(df: pd.DataFrame, x: str, y1: str, y2: str, title: str, s
         y2 (str): Nome da coluna do DataFrame a ser usada no eixo y para a segunda variável.
         title (str): Título do gráfico.
         score_or_amount (str): Rótulo do eixo y.
+        cache (FrameCache, optional): Cache onde os dados e o spec do gráfico são guardados (nome gerado do título). Defaults to None.
+
+    Returns:
+        Figure: Figura do matplotlib com o gráfico de dispersão.
     """
-    plt.figure(figsize=(12, 6))
-    sns.scatterplot(x=x, y=y1, data=df, label='Women', color='red', s=70)
-    sns.scatterplot(x=x, y=y2, data=df, label='Men', color='blue', s=70)
-
-    plt.xlabel('Year')
-    plt.ylabel(score_or_amount)
-    plt.title(title, fontsize=20)
-    plt.legend(loc='upper left', fontsize='large')
-    return plt
+    spec = ChartSpec(
+        chart_name(title), 'scatter',
+        layers=[
+            {'x': x, 'y': y1, 'label': 'Women', 'color': 'red', 's': 70},
+            {'x': x, 'y': y2, 'label': 'Men', 'color': 'blue', 's': 70},
+        ],
+        title=title, title_size=20, xlabel='Year', ylabel=score_or_amount, figsize=(12, 6),
+        legend={'loc': 'upper left', 'fontsize': 'large'}
+    )
+    return chart(spec, df[[x, y1, y2]], cache)
     
 
 # Funcoes auxiliares para o plot dos graficos de dispersao das paralimpiadas e olimpiadas
@@ -37,6 +55,7 @@ def filter_paralymp_score_bra() -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame filtrado
     """
+    paralymp_countries_df = womens_dataframes()[3]
     df_analysis_aux = paralymp_countries_df[paralymp_countries_df['NOC']=='BRA']
     df_analysis_aux = df_analysis_aux[(df_analysis_aux['M_Score'] > 0) | (df_analysis_aux['F_Score'] > 0)]
     return df_analysis_aux
@@ -48,6 +67,7 @@ def filter_paralymp_score_global() -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame filtrado
     """
+    paralymp_df = womens_dataframes()[2]
     df_analysis_aux = paralymp_df[(paralymp_df['M_Score'] > 0) | (paralymp_df['F_Score'] > 0)]
     return df_analysis_aux
     
@@ -58,6 +78,7 @@ def filter_olympic_score_bra() -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame filtrado
     """
+    olymp_countries_df = womens_dataframes()[1]
     df_analysis_aux = olymp_countries_df[olymp_countries_df['NOC']=='BRA']
     df_analysis_aux = df_analysis_aux[(df_analysis_aux['M_Score'] > 0) | (df_analysis_aux['F_Score'] > 0)]
     return df_analysis_aux
@@ -68,6 +89,7 @@ def filter_olympic_score_global() -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame filtrado
     """
+    olymp_df = womens_dataframes()[0]
     df_analysis_aux = olymp_df[(olymp_df['M_Score'] > 0) | (olymp_df['F_Score'] > 0)]
     return df_analysis_aux
 
@@ -113,14 +135,16 @@ def create_all_graphs(athletes_df: pd.DataFrame, modified_medal_athlete_df: pd.D
     return plots
 
   
-def create_table_of_stds() -> plt:
+def create_table_of_stds(cache: FrameCache = None) -> Figure:
     """Plota uma tabela 4x4 com os desvios padrão dos atletas brasileiros nas olimpiadas e paralimpiadas
 
+    Args:
+        cache (FrameCache, optional): Cache onde a tabela e o spec do gráfico são guardados ('table_stds_bra'). Defaults to None.
+
     Returns:
-        plt: Tabela 4x4
+        Figure: Figura do matplotlib com a tabela 4x4
     """
-    plt.figure()
-
+    _, olymp_countries_df, _, paralymp_countries_df = womens_dataframes()
     df = estimate_statistics(olymp_countries_df[olymp_countries_df['NOC']=='BRA'])
     df = pd.concat([df, estimate_statistics(paralymp_countries_df[paralymp_countries_df['NOC']=='BRA'])])
     df = df.loc['std']
@@ -128,13 +152,6 @@ def create_table_of_stds() -> plt:
     df = df.set_axis(index).reset_index()
     df.rename(columns={'index': ''}, inplace=True)
 
-    sns.set_theme(style='darkgrid') 
-    fig, ax = plt.subplots(figsize=(10, 3))
-    ax.axis('tight')   
-    ax.axis('off')
-    table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
-    table.auto_set_font_size(False)
-    table.set_fontsize(12)
-    table.scale(1.2, 1.2)
+    spec = ChartSpec('table_stds_bra', 'table', figsize=(10, 3), theme={'style': 'darkgrid'}, options={'fontsize': 12, 'scale': (1.2, 1.2)})
     
-    return plt
+    return chart(spec, df, cache)
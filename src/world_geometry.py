@@ -0,0 +1,166 @@
+"""Módulo com o armazenamento das geometrias dos países (Natural Earth) usadas nas visualizações geográficas.
+
+O shapefile é lido uma única vez por processo, reduzido à coluna de nome do país (chave canônica, no padrão
+de map_name_normalization), opcionalmente reprojetado e simplificado, e salvo em cache binário (GeoParquet
+quando o pyarrow está disponível, senão WKB). As chamadas seguintes reutilizam o mesmo GeoDataFrame.
+
+O pyarrow não é uma dependência do projeto (requirements.txt), por isso o cache em WKB (pickle do pandas) é o
+formato padrão; o cache em disco fica na pasta 'cache' do diretório dos dados (ver data_loader), fora do git.
+"""
+import os
+import doctest
+import pandas as pd
+import geopandas as gpd
+from data_loader import data_path
+
+# Shapefile e pasta do cache, relativos ao diretório dos dados (ver data_loader)
+WORLD_SHAPEFILE = 'world_map/ne_110m_admin_0_countries.shp'
+WORLD_CACHE_DIR = 'cache'
+
+# GeoDataFrames já carregados neste processo, por (shapefile, crs, tolerance)
+_loaded_worlds = {}
+
+
+def world_shapefile() -> str:
+    """Retorna o caminho padrão do shapefile do mundo: WORLD_SHAPEFILE no diretório dos dados.
+
+    Returns:
+        str: Caminho do shapefile.
+
+    Example:
+    ----------
+    >>> world_shapefile() == data_path(WORLD_SHAPEFILE)
+    True
+    """
+    return data_path(WORLD_SHAPEFILE)
+
+
+def build_world_geometry(shapefile: str = None, crs: str = None, tolerance: float = 0.0) -> gpd.GeoDataFrame:
+    """Lê o shapefile do mundo e prepara as geometrias indexadas pelo nome do país.
+
+    Args:
+        shapefile (str, optional): Caminho do shapefile. Defaults to None (world_shapefile()).
+        crs (str, optional): Sistema de coordenadas para reprojetar as geometrias. Defaults to None (mantém o original).
+        tolerance (float, optional): Tolerância da simplificação, nas unidades do crs. Defaults to 0.0 (sem simplificação).
+
+    Returns:
+        gpd.GeoDataFrame: Geometrias dos países, indexadas pela coluna 'NAME'.
+    """
+    world = gpd.read_file(shapefile if shapefile is not None else world_shapefile(), columns=['NAME'])
+    world = world.set_index('NAME')[['geometry']]
+
+    if crs is not None:
+        world = world.to_crs(crs)
+    if tolerance > 0:
+        world['geometry'] = world.geometry.simplify(tolerance, preserve_topology=True)
+
+    return world
+
+
+def world_cache_path(cache_dir: str, crs: str = None, tolerance: float = 0.0) -> str:
+    """Retorna o caminho do cache das geometrias para os parâmetros dados.
+
+    Args:
+        cache_dir (str): Diretório do cache.
+        crs (str, optional): Sistema de coordenadas das geometrias. Defaults to None.
+        tolerance (float, optional): Tolerância da simplificação. Defaults to 0.0.
+
+    Returns:
+        str: Caminho do arquivo de cache (sem extensão).
+
+    Example:
+    ----------
+    >>> world_cache_path('data/cache', 'EPSG:3857', 0.5).replace(os.sep, '/')
+    'data/cache/world_geometry_EPSG-3857_0.5'
+    """
+    crs_name = str(crs).replace(':', '-') if crs is not None else 'original'
+    return os.path.join(cache_dir, f'world_geometry_{crs_name}_{tolerance}')
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow
+    except ImportError:
+        return False
+    return True
+
+
+def _write_cache(world: gpd.GeoDataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if _has_pyarrow():
+        world.to_parquet(f'{path}.parquet')
+    else:
+        wkb = pd.DataFrame({'geometry': world.geometry.to_wkb()}, index=world.index)
+        wkb.attrs['crs'] = world.crs.to_string() if world.crs is not None else None
+        wkb.to_pickle(f'{path}.wkb.pkl')
+
+
+def _read_cache(path: str, shapefile: str) -> gpd.GeoDataFrame:
+    for extension in ['.parquet', '.wkb.pkl']:
+        cache_file = f'{path}{extension}'
+        # Cache desatualizado em relação ao shapefile é ignorado
+        if not os.path.exists(cache_file) or os.path.getmtime(cache_file) < os.path.getmtime(shapefile):
+            continue
+        if extension == '.parquet' and _has_pyarrow():
+            return gpd.read_parquet(cache_file)
+        if extension == '.wkb.pkl':
+            wkb = pd.read_pickle(cache_file)
+            return gpd.GeoDataFrame(geometry=gpd.GeoSeries.from_wkb(wkb['geometry']), crs=wkb.attrs['crs'])
+    return None
+
+
+def world_cache_dir() -> str:
+    """Retorna o diretório padrão do cache em disco das geometrias: a pasta WORLD_CACHE_DIR do diretório dos dados.
+
+    Returns:
+        str: Diretório do cache.
+
+    Example:
+    ----------
+    >>> world_cache_dir() == data_path(WORLD_CACHE_DIR)
+    True
+    """
+    return data_path(WORLD_CACHE_DIR)
+
+
+def load_world_geometry(shapefile: str = None, crs: str = None, tolerance: float = 0.0, cache_dir: str = None,
+                        disk_cache: bool = True) -> gpd.GeoDataFrame:
+    """Carrega as geometrias dos países, usando o cache em memória e em disco.
+
+    O GeoDataFrame retornado é compartilhado entre as chamadas e não deve ser modificado;
+    para adicionar colunas, use world.assign(...).
+
+    Args:
+        shapefile (str, optional): Caminho do shapefile. Defaults to None (world_shapefile()).
+        crs (str, optional): Sistema de coordenadas para reprojetar as geometrias. Defaults to None (mantém o original).
+        tolerance (float, optional): Tolerância da simplificação. Defaults to 0.0 (sem simplificação).
+        cache_dir (str, optional): Diretório do cache em disco. Defaults to None (world_cache_dir()).
+        disk_cache (bool, optional): Se False, não lê nem escreve o cache em disco. Defaults to True.
+
+    Returns:
+        gpd.GeoDataFrame: Geometrias dos países, indexadas pela coluna 'NAME'.
+    """
+    shapefile = shapefile if shapefile is not None else world_shapefile()
+    key = (os.path.abspath(shapefile), crs, tolerance)
+    if key in _loaded_worlds:
+        return _loaded_worlds[key]
+
+    world = None
+    if disk_cache:
+        path = world_cache_path(cache_dir if cache_dir is not None else world_cache_dir(), crs, tolerance)
+        try:
+            world = _read_cache(path, shapefile)
+        except Exception:
+            # Cache ilegível (ex.: escrito por outra versão do pandas) é reconstruído
+            world = None
+    if world is None:
+        world = build_world_geometry(shapefile, crs, tolerance)
+        if disk_cache:
+            _write_cache(world, path)
+
+    _loaded_worlds[key] = world
+    return world
+
+
+if __name__ == "__main__":
+     doctest.testmod(verbose=False)
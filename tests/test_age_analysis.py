@@ -94,6 +94,19 @@ class TestStatisticsByAge(unittest.TestCase):
         
         self.assertEqual(result, expected_result)
 
+    # Teste com as estatisticas calculadas a partir dos sketches
+    def test_with_sketches(self):
+        df = pd.DataFrame({
+            'Sport': ['Soccer', 'Basketball', 'Tennis', 'Soccer', 'Basketball', 'Tennis'],
+            'Sex': ['M', 'F', 'M', 'F', 'M', 'F'],
+            'Year': [2012, 2012, 2012, 2016, 2016, 2016],
+            'Age': [20, 35, 25, 21, 45, 19]
+        })
+        sketches = GroupedQuantileSketch()
+        sketches.update(df)
+
+        self.assertEqual(statistics_by_age(df.iloc[:0], sketches), statistics_by_age(df))
+
 
 class HighestAgeAplitudeSports(unittest.TestCase):
     # Teste com algusn esportes diferentes
@@ -157,6 +170,45 @@ class HighestAgeAplitudeSports(unittest.TestCase):
         self.assertEqual(expected_result, highest_age_aplitude_sports(df)) 
 
 
+class TestMostAwardedSports(unittest.TestCase):
+    # Os esportes mais premiados sao os com mais medalhas, sem pesar o tipo da medalha (ouro = 3)
+    def test_counts_medals(self):
+        df_example = pd.DataFrame({
+            'NOC': ['BRA'] * 8,
+            'Sport': ['Judo', 'Judo', 'Soccer', 'Soccer', 'Swimming', 'Swimming', 'Sailing', 'Sailing'],
+            'Medal': [3, 0, 1, 1, 1, 1, 1, 1],
+            'Age': [22, 24, 20, 23, 27, 26, 28, 25]
+        })
+
+        plot = create_boxplot_top_3_esportes_most_awarded(df_example)
+        labels = [label.get_text() for label in plot.axes[0].get_xticklabels()]
+        plt.close(plot)
+
+        self.assertNotIn('Judo', labels)
+        self.assertEqual(sorted(labels), ['Sailing', 'Soccer', 'Swimming'])
+        self.assertEqual(df_example['Medal'].tolist()[0], 3)
+
+
+class TestFigureColumns(unittest.TestCase):
+    # Os graficos de idade funcionam so com as colunas de FIGURE_COLUMNS (as enviadas ao render_pool pelo main)
+    def test_figures_with_figure_columns(self):
+        rng = np.random.default_rng(3)
+        medals = rng.choice([0, 1, 2, 3], 300)
+        df = pd.DataFrame({
+            'NOC': rng.choice(['BRA', 'USA'], 300),
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing', 'Sailing'], 300),
+            'Age': rng.normal(25, 5, 300).round(),
+            'Medal': medals,
+            'is_medalist': medals > 0,
+            'Height': rng.normal(175, 10, 300)
+        })[FIGURE_COLUMNS]
+
+        for function in [create_boxplot_top_3_esportes_outliers, create_boxplot_top_3_esportes_most_awarded, create_boxplot_age_medal_status_brazil]:
+            plot = function(df)
+            self.assertEqual(plot.__class__.__name__, "Figure")
+            plt.close(plot)
+
+
 class CreateBoxplotSportWithTheMosOutliers:
     #  Cria um boxplot de idade  com o espote com mais valores outliers
     def test_create_boxplot(self):
@@ -168,7 +220,7 @@ class CreateBoxplotSportWithTheMosOutliers:
         
         plot = create_boxplot_sport_with_the_most_outliers(data)
     
-        self.assertEqual(plot.__class__.__name__, "module")
+        self.assertEqual(plot.__class__.__name__, "Figure")
 
 
 class CreateBoxplotTop3EsportesOutliers:
@@ -183,7 +235,7 @@ class CreateBoxplotTop3EsportesOutliers:
         plot = create_boxplot_top_3_esportes_outliers(data)
     
         
-        self.assertEqual(plot.__class__.__name__, "module")
+        self.assertEqual(plot.__class__.__name__, "Figure")
     
     
 class CreateBoxplotTop3EsportesMostAwarded:
@@ -198,7 +250,7 @@ class CreateBoxplotTop3EsportesMostAwarded:
         
         plot = create_boxplot_top_3_esportes_most_awarded(df_example)
         
-        self.assertEqual(plot.__class__.__name__, "module")
+        self.assertEqual(plot.__class__.__name__, "Figure")
 
 
 class CreateBoxplotAgeMedalStatusBrazil:
@@ -211,7 +263,7 @@ class CreateBoxplotAgeMedalStatusBrazil:
      })
         plot = create_boxplot_age_medal_status_brazil(df_example)
         
-        self.assertEqual(plot.__class__.__name__, "module")
+        self.assertEqual(plot.__class__.__name__, "Figure")
 
 
 class CreateBoxplotAgeByMedalsAthletesInBrazil:
@@ -224,7 +276,7 @@ class CreateBoxplotAgeByMedalsAthletesInBrazil:
      })
         plot = create_boxplot_age_by_medals_athletes_in_brazil(df_example)
     
-        self.assertEqual(plot.__class__.__name__, "module")     
+        self.assertEqual(plot.__class__.__name__, "Figure")     
 
 
 if __name__ == "__main__":
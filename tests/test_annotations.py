@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.annotations import *
+from matplotlib import pyplot as plt
+
+
+class TestTopK(unittest.TestCase):
+
+    # Teste se os valores NaN são ignorados
+    def test_ignores_nan(self):
+        data = pd.DataFrame({'value': [np.nan, 1.0, 3.0, 2.0]})
+
+        self.assertEqual(top_k(data, 'value', 5).tolist(), [2, 3, 1])
+        self.assertEqual(top_k(data, 'value', 1, largest=False).tolist(), [1])
+
+
+class TestMergeLabelSets(unittest.TestCase):
+
+    # Teste se pontos repetidos em varios conjuntos aparecem uma unica vez
+    def test_deduplicates_with_last_style(self):
+        positions, colors, sizes = merge_label_sets([
+            (np.array([4, 2]), 'green', 7),
+            (np.array([2, 3]), 'red', 7),
+            (np.array([4]), 'blue', 6),
+        ])
+
+        self.assertEqual(positions.tolist(), [2, 3, 4])
+        self.assertEqual(colors.tolist(), ['red', 'red', 'blue'])
+        self.assertEqual(sizes.tolist(), [7, 7, 6])
+
+    def test_empty(self):
+        positions, _, _ = merge_label_sets([])
+
+        self.assertEqual(len(positions), 0)
+
+
+class TestPlaceLabels(unittest.TestCase):
+
+    # Teste se rotulos no mesmo ponto não se sobrepõem
+    def test_no_overlap(self):
+        points = np.zeros((3, 2))
+        offsets = place_labels(points, np.full(3, 10.0), np.full(3, 4.0))
+
+        self.assertEqual(len({tuple(offset) for offset in offsets}), 3)
+
+
+class TestAnnotatePoints(unittest.TestCase):
+
+    def test_annotate_points(self):
+        fig, ax = plt.subplots()
+        ax.scatter([1, 2], [1, 2])
+        texts = annotate_points(ax, np.array([1, 2]), np.array([1, 2]), np.array(['A', 'B']), np.array(['red', 'blue']), np.array([7, 6]))
+        plt.close(fig)
+
+        self.assertEqual([text.get_text() for text in texts], ['A', 'B'])
+        self.assertEqual(texts[1].get_fontsize(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.attributes_report import *
+from src.coeficient_functions import r2, corr
+from matplotlib import pyplot as plt
+
+
+class TestAttributesReport(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.df = pd.DataFrame({
+            'NOC': rng.choice(['BRA', 'USA', 'ARG'], 600),
+            'Sport': rng.choice(['Volleyball', 'Football', 'Judo'], 600),
+            'Medal': rng.choice([0, 1, 2, 3], 600),
+            'Year': rng.integers(1960, 2016, 600),
+            'Age': rng.normal(25, 4, 600),
+            'Height': rng.normal(180, 10, 600),
+            'Weight': rng.normal(75, 10, 600)
+        }, index=rng.permutation(600))
+
+    # Teste do boxplot com uma caixa para os nao premiados e outra para os premiados (qualquer medalha)
+    def test_create_medal_boxplot(self):
+        fig = create_medal_boxplot(self.df, 'Judo', 'Height', 'BRA')
+        labels = [label.get_text() for label in fig.axes[0].get_xticklabels()]
+        plt.close(fig)
+
+        self.assertEqual(labels, ['Not Awarded', 'Awarded'])
+
+    # Teste se as particoes tem as mesmas linhas dos filtros repetidos
+    def test_partition_athletes(self):
+        partitions = partition_athletes(self.df, nocs=['BRA', 'USA'], sports=['Judo'])
+
+        self.assertEqual(list(partitions), [('BRA', 'Judo'), ('USA', 'Judo')])
+        for (noc, sport), positions in partitions.items():
+            expected = self.df[(self.df['NOC'] == noc) & (self.df['Sport'] == sport)]
+            self.assertTrue(self.df.iloc[positions].equals(expected))
+
+    # Teste se os coeficientes de cada particao sao iguais aos de r2 e corr aplicados a particao filtrada
+    def test_attributes_report(self):
+        report = attributes_report(self.df, sports=['Volleyball', 'Judo'])
+
+        self.assertEqual(report.columns.tolist(), REPORT_COLUMNS)
+        self.assertEqual(len(report), 3 * 2 * len(ATTRIBUTES))
+        for row in report.itertuples():
+            partition = self.df[(self.df['NOC'] == row.NOC) & (self.df['Sport'] == row.Sport)]
+            self.assertAlmostEqual(row.r2_medal, r2(partition, 'Medal', row.attribute, False))
+            self.assertAlmostEqual(row.corr_year, corr(partition, 'Year', row.attribute))
+
+    # Teste da tabela gravada e das figuras descritas (sem renderizar), usadas pelo main.py
+    def test_prepare_attributes_report(self):
+        directory = tempfile.mkdtemp()
+        report, specs = prepare_attributes_report(self.df, nocs=['BRA'], sports=['Judo'], attributes=['Height'], directory=directory)
+
+        pd.testing.assert_frame_equal(pd.read_csv(os.path.join(directory, 'attributes_report.csv')), report)
+        self.assertEqual([spec.path for spec in specs], [os.path.join(directory, 'BRA', 'Judo_Height.png')])
+        self.assertEqual([os.path.exists(spec.path) for spec in specs], [False])
+
+    # Teste do relatorio completo, com as figuras renderizadas e puladas na segunda execucao
+    def test_run_attributes_report(self):
+        directory = tempfile.mkdtemp()
+        report, timing, skipped = run_attributes_report(self.df, nocs=['BRA'], sports=['Judo', 'Football'], directory=directory, max_workers=1)
+
+        self.assertTrue(os.path.exists(os.path.join(directory, 'attributes_report.csv')))
+        self.assertEqual(len(timing), 2 * len(ATTRIBUTES))
+        self.assertTrue(os.path.exists(os.path.join(directory, 'BRA', 'Judo_Height.png')))
+
+        _, timing, skipped = run_attributes_report(self.df, nocs=['BRA'], sports=['Judo', 'Football'], directory=directory, max_workers=1)
+        self.assertEqual((len(timing), len(skipped)), (0, 2 * len(ATTRIBUTES)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic_athletes import *
+from benchmarks.run_benchmarks import CASES, BenchmarkCase, compare_with_baseline, run_benchmarks, to_baseline
+
+
+class TestSyntheticAthletes(unittest.TestCase):
+
+    def setUp(self):
+        self.df = synthetic_athletes(50000, seed=3)
+
+    # Teste do esquema e da reprodutibilidade
+    def test_schema(self):
+        self.assertEqual(self.df.columns.tolist(), ATHLETE_COLUMNS)
+        self.assertTrue(self.df.equals(synthetic_athletes(50000, seed=3)))
+        self.assertFalse(self.df.equals(synthetic_athletes(50000, seed=4)))
+        self.assertEqual(set(self.df['Medal'].dropna()), {'Gold', 'Silver', 'Bronze'})
+
+    # Teste das proporcoes de NaN, medalhas e sexo
+    def test_distributions(self):
+        for column, rate in NAN_RATES.items():
+            self.assertAlmostEqual(self.df[column].isna().mean(), rate, delta=0.01)
+        self.assertAlmostEqual(self.df['Medal'].notna().mean(), MEDAL_RATE, delta=0.01)
+        self.assertAlmostEqual((self.df['Sex'] == 'M').mean(), MALE_RATE, delta=0.02)
+        self.assertTrue((self.df.loc[self.df['Sport'] == 'Ice Hockey', 'Season'] == 'Winter').all())
+
+    # Teste se cada atleta tem um unico sexo e NOC
+    def test_athlete_consistency(self):
+        self.assertEqual(self.df.groupby('ID')[['Sex', 'NOC']].nunique().max().tolist(), [1, 1])
+
+    # Teste dos CSVs gravados com os nomes usados pelas analises
+    def test_write_synthetic_data(self):
+        directory = write_synthetic_data(tempfile.mkdtemp(), 1000)
+
+        self.assertEqual(sorted(os.listdir(directory)), ['athlete_events.csv', 'modified_medal_athlete.csv', 'summer_paralympics.csv', 'winter_paralympics.csv'])
+        self.assertEqual(pd.read_csv(os.path.join(directory, 'summer_paralympics.csv')).columns.tolist(), PARALYMPICS_COLUMNS)
+
+
+class TestRunBenchmarks(unittest.TestCase):
+
+    # Teste de uma execucao com um caso em uma escala pequena
+    def test_run(self):
+        cases = [case for case in CASES if case.name in ('medals_to_int', 'create_dataframes')]
+        results = run_benchmarks(cases, scales=(1,), repeat=1)
+
+        self.assertEqual(results['case'].tolist(), ['medals_to_int', 'create_dataframes'])
+        self.assertTrue((results['seconds'] > 0).all() and (results['peak_mb'] > 0).all())
+
+    # Teste da comparacao com o baseline
+    def test_compare_with_baseline(self):
+        results = pd.DataFrame({'case': ['r2', 'r2'], 'rows': [1000, 10000], 'seconds': [0.30, 0.01], 'peak_mb': [1.0, np.nan]})
+        baseline = to_baseline(results)
+
+        self.assertEqual(compare_with_baseline(results, baseline)['status'].tolist(), ['ok', 'ok'])
+        slower = results.assign(seconds=[0.60, 0.03])
+        self.assertEqual(compare_with_baseline(slower, baseline)['status'].tolist(), ['regression', 'ok'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import importlib
+import unittest
+import pandas as pd
+from src.build_manifest import *
+from src.figures import create_figure
+
+
+def create_medal_figure(df: pd.DataFrame, ylim: tuple = None):
+    fig, ax = create_figure()
+    ax.plot(df['Year'], df['Medal'])
+    if ylim:
+        ax.set_ylim(ylim)
+    return fig
+
+
+# Figura que le dados globais, sem DataFrames nos argumentos
+GLOBAL_DF = pd.DataFrame({'Year': [2008, 2012], 'Medal': [1, 2]})
+
+
+def create_global_figure():
+    return create_medal_figure(GLOBAL_DF)
+
+
+class TestBuildFigures(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.output_dir, 'manifest.json')
+        self.df = pd.DataFrame({'Year': [2008, 2012, 2016], 'Medal': [15, 17, 19]})
+
+    def specs(self, df: pd.DataFrame, ylim: tuple = None) -> list:
+        return [
+            FigureSpec(create_medal_figure, os.path.join(self.output_dir, 'medal.png'), (df,), {'ylim': ylim}, savefig={'dpi': 20}),
+            FigureSpec(create_medal_figure, os.path.join(self.output_dir, 'other.png'), (self.df,), savefig={'dpi': 20}),
+        ]
+
+    def build(self, specs: list, force: bool = False) -> tuple:
+        return build_figures(specs, BuildManifest(self.manifest_path), force, max_workers=1)
+
+    # Teste se uma segunda execucao sem mudancas pula todas as figuras
+    def test_skip_up_to_date(self):
+        report, skipped = self.build(self.specs(self.df))
+        self.assertEqual(len(report), 2)
+        self.assertEqual(skipped, [])
+
+        report, skipped = self.build(self.specs(self.df.copy()))
+        self.assertEqual(len(report), 0)
+        self.assertEqual(len(skipped), 2)
+
+    # Teste se mudancas nos dados ou nos parametros regeneram so a figura afetada
+    def test_rebuild_changed(self):
+        self.build(self.specs(self.df))
+
+        report, _ = self.build(self.specs(self.df.assign(Medal=[15, 17, 20])))
+        self.assertEqual([os.path.basename(path) for path in report['path']], ['medal.png'])
+
+        report, _ = self.build(self.specs(self.df.assign(Medal=[15, 17, 20]), ylim=(0, 30)))
+        self.assertEqual([os.path.basename(path) for path in report['path']], ['medal.png'])
+
+    # Teste se figuras apagadas e a opcao force regeneram as figuras
+    def test_missing_output_and_force(self):
+        self.build(self.specs(self.df))
+        os.remove(os.path.join(self.output_dir, 'other.png'))
+
+        report, _ = self.build(self.specs(self.df))
+        self.assertEqual([os.path.basename(path) for path in report['path']], ['other.png'])
+
+        report, skipped = self.build(self.specs(self.df), force=True)
+        self.assertEqual((len(report), skipped), (2, []))
+
+    # Teste se objetos sem representacao estavel nao invalidam a figura
+    def test_unstable_objects(self):
+        first = FigureSpec(create_medal_figure, 'a.png', (self.df,), {'cache': object()})
+        second = FigureSpec(create_medal_figure, 'a.png', (self.df,), {'cache': object()})
+
+        self.assertEqual(spec_fingerprint(first), spec_fingerprint(second))
+
+    # Teste se figuras sem dados nos argumentos so sao puladas com os arquivos de entrada declarados
+    def test_untracked_and_input_files(self):
+        path = os.path.join(self.output_dir, 'global.png')
+        input_file = os.path.join(self.output_dir, 'input.csv')
+        self.df.to_csv(input_file, index=False)
+
+        for _ in range(2):
+            report, skipped = self.build([FigureSpec(create_global_figure, path, savefig={'dpi': 20})])
+            self.assertEqual((len(report), skipped), (1, []))
+
+        spec = FigureSpec(create_global_figure, path, savefig={'dpi': 20}, inputs=(input_file,))
+        self.build([spec])
+        self.assertEqual(self.build([spec])[1], [path])
+
+        self.df.assign(Medal=[1, 2, 3]).to_csv(input_file, index=False)
+        os.utime(input_file, ns=(0, os.stat(input_file).st_mtime_ns + 10 ** 9))
+        self.assertEqual(len(self.build([spec])[0]), 1)
+
+
+class TestSourceFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write('manifest_helper_module', 'def helper():\n    return 1\n')
+        self.write('manifest_figure_module', 'from manifest_helper_module import helper\n\ndef figure():\n    return helper()\n')
+        sys.path.insert(0, self.directory)
+        self.module = importlib.import_module('manifest_figure_module')
+
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        sys.modules.pop('manifest_figure_module', None)
+        sys.modules.pop('manifest_helper_module', None)
+
+    def write(self, name: str, source: str) -> None:
+        with open(os.path.join(self.directory, f'{name}.py'), 'w') as file:
+            file.write(source)
+
+    # Teste se mudancas em um modulo importado pela funcao da figura mudam a impressao digital
+    def test_imported_module_changes(self):
+        self.assertEqual([os.path.basename(path) for path in source_modules(self.module)],
+                         ['manifest_figure_module.py', 'manifest_helper_module.py'])
+
+        before = source_fingerprint(self.module.figure)
+        self.write('manifest_helper_module', 'def helper():\n    return 2\n')
+        self.assertNotEqual(source_fingerprint(self.module.figure), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import matplotlib
+import unittest
+import pandas as pd
+from unittest import mock
+from src.chart_spec import *
+
+
+class TestChartSpec(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({'Year': [2008, 2012, 2016], 'Medal': [15, 17, 19]})
+        self.spec = ChartSpec('medalhas', 'scatter', layers=[{'x': 'Year', 'y': 'Medal', 'color': 'green'}],
+                              title='Medalhas', xlabel='Ano', ylim=(0, 20), legend=None)
+
+    # Teste se o spec sobrevive a serializacao em JSON
+    def test_json_round_trip(self):
+        restored = ChartSpec.from_json(self.spec.to_json())
+
+        self.assertEqual(restored.layers, self.spec.layers)
+        self.assertEqual(restored.title, 'Medalhas')
+        self.assertEqual(list(restored.ylim), [0, 20])
+
+    # Teste se o grafico e regerado de um cache em disco com outro titulo, sem recalcular os dados
+    def test_rerender_from_disk_cache(self):
+        directory = tempfile.mkdtemp()
+        chart(self.spec, self.frame, FrameCache(directory))
+
+        cache = FrameCache(directory)
+        spec = cache.get_spec('medalhas').replace(title='Medalhas do Brasil')
+        with mock.patch.object(FrameCache, 'put') as put:
+            fig = render_spec(spec, cache)
+
+        put.assert_not_called()
+        self.assertEqual(fig.axes[0].get_title(), 'Medalhas do Brasil')
+        self.assertEqual(fig.axes[0].get_xlabel(), 'Ano')
+        self.assertEqual(fig.axes[0].get_ylim(), (0.0, 20.0))
+
+    # Teste com spec e DataFrame que nao estao no cache
+    def test_missing_keys(self):
+        cache = FrameCache(tempfile.mkdtemp())
+
+        with self.assertRaises(KeyError):
+            cache.get_spec('medalhas')
+        with self.assertRaises(KeyError):
+            render_spec(self.spec, cache)
+
+    # Teste com tipo de grafico sem funcao de desenho
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            chart(self.spec.replace(kind='pizza'), self.frame)
+
+    # Teste se o tema de um grafico vale so para ele, sem alterar os graficos seguintes
+    def test_theme_is_scoped(self):
+        before = dict(matplotlib.rcParams)
+        themed = chart(self.spec.replace(name='tema', theme={'style': 'darkgrid'}), self.frame)
+        plain = chart(self.spec, self.frame)
+
+        self.assertNotEqual(themed.axes[0].get_facecolor(), plain.axes[0].get_facecolor())
+        self.assertEqual(plain.axes[0].get_facecolor(), matplotlib.colors.to_rgba(before['axes.facecolor']))
+        self.assertEqual(dict(matplotlib.rcParams), before)
+
+    # Teste com um spec que le o DataFrame de outro grafico
+    def test_shared_source(self):
+        cache = FrameCache()
+        cache.put('anos', self.frame)
+        fig = render_spec(ChartSpec('tabela', 'table', source='anos'), cache)
+
+        self.assertEqual(len(fig.axes), 1)
+        self.assertNotIn('tabela', cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
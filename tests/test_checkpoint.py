@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.checkpoint import *
+
+
+class TestCheckpointWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'Year': [2012, 2016],
+            'NOC': ['BRA', 'USA'],
+            'Medal': [5, 20]
+        })
+
+    # Teste de escrita e leitura de um checkpoint
+    def test_save_and_load(self):
+        with CheckpointWriter(self.directory) as writer:
+            writer.save(self.df, 'medals')
+
+        pd.testing.assert_frame_equal(load_checkpoint(self.directory, 'medals'), self.df)
+
+    # Teste se o checkpoint guarda o DataFrame no momento em que foi agendado
+    def test_save_is_isolated_from_later_changes(self):
+        writer = CheckpointWriter(self.directory)
+        writer.save(self.df, 'medals')
+        self.df.loc[0, 'Medal'] = 100
+        writer.flush()
+
+        self.assertEqual(load_checkpoint(self.directory, 'medals')['Medal'].tolist(), [5, 20])
+        writer.close()
+
+    # Teste se o escritor fechado não aceita novos checkpoints
+    def test_save_after_close(self):
+        writer = CheckpointWriter(self.directory)
+        writer.close()
+
+        with self.assertRaises(RuntimeError):
+            writer.save(self.df, 'medals')
+
+    # Teste se os checkpoints que falharam são avisados e retornados no fechamento
+    def test_close_reports_errors(self):
+        writer = CheckpointWriter(self.directory)
+        writer.save(self.df, 'medals')
+        writer.save(self.df, os.path.join('missing', 'medals'))
+
+        with self.assertWarns(RuntimeWarning):
+            errors = writer.close()
+        self.assertEqual([name for name, _ in errors], [os.path.join('missing', 'medals')])
+        self.assertIsInstance(errors[0][1], OSError)
+
+        writer = CheckpointWriter(self.directory)
+        writer.save(self.df, os.path.join('missing', 'medals'))
+        self.assertEqual(len(writer.close(warn=False)), 1)
+
+    # Teste se o checkpoint é salvo no diretório indicado
+    def test_checkpoint_path(self):
+        path = checkpoint_path(self.directory, 'medals')
+
+        self.assertEqual(os.path.dirname(path), self.directory)
+        self.assertTrue(path.endswith('medals.pkl'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from shapely.geometry import MultiPolygon, Polygon, box
+from src.choropleth import *
+from src import choropleth
+from matplotlib import pyplot as plt
+from matplotlib.patches import PathPatch
+
+# Cache das geometrias em uma pasta temporaria, para os testes nao escreverem no diretorio dos dados
+CACHE_DIR = tempfile.mkdtemp()
+
+
+class TestGeometryPath(unittest.TestCase):
+
+    # Teste com um poligono com buraco
+    def test_polygon_with_hole(self):
+        polygon = Polygon(box(0, 0, 4, 4).exterior.coords, [box(1, 1, 2, 2).exterior.coords])
+        fig, ax = plt.subplots(figsize=(1, 1), dpi=40)
+        ax.add_patch(PathPatch(geometry_path(polygon), facecolor='black', linewidth=0))
+        ax.set_xlim(0, 4)
+        ax.set_ylim(0, 4)
+        ax.set_position([0, 0, 1, 1])
+        fig.canvas.draw()
+        pixels = np.asarray(fig.canvas.buffer_rgba())[::-1, :, 0]
+        plt.close(fig)
+
+        # O buraco não deve ser preenchido
+        self.assertEqual(pixels[30, 30], 0)
+        self.assertEqual(pixels[15, 15], 255)
+
+    # Teste com um multipoligono
+    def test_multipolygon(self):
+        path = geometry_path(MultiPolygon([box(0, 0, 1, 1), box(2, 2, 3, 3)]))
+
+        self.assertEqual(path.get_extents().bounds, (0.0, 0.0, 3.0, 3.0))
+
+
+class TestChoroplethRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.renderer = world_renderer(cache_dir=CACHE_DIR)
+
+    # Teste se os valores são alinhados às geometrias pela chave do país
+    def test_plot_aligns_values(self):
+        fig, ax = plt.subplots()
+        collection = self.renderer.plot(pd.Series({'Brazil': 2.0, 'Chile': 1.0, 'Atlantis': 5.0}), ax=ax)
+        array = collection.get_array()
+        plt.close(fig)
+
+        self.assertEqual(len(array), len(self.renderer.index))
+        self.assertEqual(array[self.renderer.index.get_loc('Brazil')], 2.0)
+        self.assertEqual(array.count(), 2)
+
+    # Teste do atlas renderizado no proprio processo
+    def test_render_atlas(self):
+        output_dir = tempfile.mkdtemp()
+        data = pd.DataFrame({
+            'Country': ['Brazil', 'Brazil', 'China'],
+            'Year': [2012, 2016, 2016],
+            'Medal': [17, 19, 70]
+        })
+        paths = render_atlas(indicator_by_year(data, 'Medal'), output_dir, self.renderer, dpi=20, max_workers=1)
+
+        self.assertEqual([os.path.basename(path) for path in paths], ['Medal_2012.png', 'Medal_2016.png'])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    # Teste do atlas renderizado no pool de processos, sem alterar o estado do processo principal
+    def test_render_atlas_pool(self):
+        output_dir = tempfile.mkdtemp()
+        indicators = pd.DataFrame({'Medal_2012': [17.0, 70.0], 'Medal_2016': [19.0, 88.0]}, index=['Brazil', 'China'])
+        paths = render_atlas(indicators, output_dir, self.renderer, dpi=20, max_workers=2)
+
+        self.assertEqual([os.path.basename(path) for path in paths], ['Medal_2012.png', 'Medal_2016.png'])
+        self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+        render_atlas(indicators, output_dir, self.renderer, dpi=20, max_workers=1)
+        self.assertIsNone(choropleth._worker_renderer)
+
+
+if __name__ == "__main__":
+    unittest.main()
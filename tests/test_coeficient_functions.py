@@ -1,6 +1,9 @@
 import pandas as pd
 from src.coeficient_functions import *
 import numpy as np
+import os
+import pickle
+import tempfile
 import unittest
 
 
@@ -62,6 +65,45 @@ class TestR2(unittest.TestCase):
              r2(df, 'qualitativa', 'quantitativa')
 
 
+class TestR2Matrix(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing', 'Diving'], 500),
+            'Sex': rng.choice(['M', 'F'], 500),
+            'Age': rng.integers(15, 40, 500).astype(float),
+            'Height': rng.normal(175, 10, 500)
+        })
+
+    # Teste se cada coeficiente e igual ao calculado pela funcao r2
+    def test_matches_r2(self):
+        for is_sample in [True, False]:
+            result = r2_matrix(self.df, ['Sport', 'Sex'], ['Age', 'Height'], is_sample)
+            for quali in ['Sport', 'Sex']:
+                for quanti in ['Age', 'Height']:
+                    self.assertAlmostEqual(result.loc[quali, quanti], r2(self.df, quali, quanti, is_sample))
+
+    # Teste com valores ausentes, ignorados par a par
+    def test_missing_values(self):
+        df = self.df.copy()
+        df.loc[::7, 'Height'] = np.nan
+        df.loc[::11, 'Sport'] = np.nan
+        result = r2_matrix(df, ['Sport'], ['Age', 'Height'])
+
+        self.assertAlmostEqual(result.loc['Sport', 'Age'], r2(df, 'Sport', 'Age'))
+        self.assertAlmostEqual(result.loc['Sport', 'Height'], r2(df.dropna(subset=['Height']), 'Sport', 'Height'))
+
+    # Teste com valores nao numericos e colunas ausentes
+    def test_invalid_columns(self):
+        with self.assertRaises(ValueError):
+            r2_matrix(pd.DataFrame({'qualitativa': ['P', 'Q', 'R'], 'quantitativa': [1, 2, 'invalid']}), ['qualitativa'], ['quantitativa'])
+        with self.assertRaises(KeyError):
+            r2_matrix(self.df, ['Sport'], ['Weight'])
+        with self.assertRaises(KeyError):
+            r2_matrix(self.df, ['NOC'], ['Age'])
+
+
 class TestCorr(unittest.TestCase):
     #  Teste correlação igual a 1
     def test_perfect_positive_correlation(self):
@@ -101,6 +143,175 @@ class TestCorr(unittest.TestCase):
         with self.assertRaises(KeyError):
             corr(df, 'x', 'z')
 
+    #  Teste com valores ausentes, ignorados no par
+    def test_missing_values(self):
+        df = pd.DataFrame({'x': [1, 2, 3, np.nan, 5], 'y': [2, 4, 6, 8, np.nan]})
+        self.assertAlmostEqual(corr(df, 'x', 'y'), 1.0)
+
+
+class TestCorrMatrix(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'Year': rng.integers(1896, 2016, 1000).astype(float),
+            'Age': rng.normal(25, 5, 1000),
+            'Height': rng.normal(175, 10, 1000) + 1e6
+        })
+        self.df['Weight'] = 0.2 * self.df['Year'] + rng.normal(0, 10, 1000)
+
+    # Teste se a matriz e igual a do pandas, com e sem valores ausentes
+    def test_matches_pandas(self):
+        df = self.df.copy()
+        for column in df:
+            df.loc[df.sample(frac=0.2, random_state=len(column)).index, column] = np.nan
+        for data in [self.df, df]:
+            result = corr_matrix(data, data.columns.tolist())
+            np.testing.assert_allclose(result.values, data.corr().values, atol=1e-9)
+            self.assertEqual(result.index.tolist(), data.columns.tolist())
+
+    # Teste de uma coluna constante e de colunas invalidas
+    def test_invalid_columns(self):
+        df = self.df.assign(constante=1.0)
+        self.assertTrue(np.isnan(corr_matrix(df, ['Age', 'constante']).loc['Age', 'constante']))
+        with self.assertRaises(ValueError):
+            corr_matrix(df.assign(texto='a'), ['Age', 'texto'])
+        with self.assertRaises(KeyError):
+            corr_matrix(df, ['Age', 'NOC'])
+
+
+
+class TestByGroup(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.df = pd.DataFrame({
+            'NOC': rng.choice(['BRA', 'USA', 'FRA', 'JPN'], 3000),
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing'], 3000),
+            'Medal': rng.choice([0, 1, 2, 3], 3000),
+            'Year': rng.integers(1896, 2016, 3000).astype(float),
+            'Height': rng.normal(175, 10, 3000),
+            'Weight': rng.normal(70, 10, 3000)
+        })
+        self.df.loc[::9, 'Weight'] = np.nan
+        self.df.loc[::50, 'NOC'] = np.nan
+
+    # Teste se cada grupo tem o mesmo R2 da funcao r2 aplicada ao grupo filtrado
+    def test_r2_by_group(self):
+        result = r2_by_group(self.df, ['NOC', 'Sport'], 'Medal', ['Height', 'Weight'], False)
+
+        self.assertEqual(len(result), 4 * 3 * 2)
+        self.assertEqual(result.columns.tolist(), ['NOC', 'Sport', 'quanti', 'qtd', 'r2'])
+        for row in result.itertuples():
+            group = self.df[(self.df['NOC'] == row.NOC) & (self.df['Sport'] == row.Sport)].dropna(subset=[row.quanti])
+            self.assertEqual(row.qtd, len(group))
+            self.assertAlmostEqual(row.r2, r2(group, 'Medal', row.quanti, False))
+
+    # Teste se cada grupo tem a mesma correlacao da funcao corr_matrix aplicada ao grupo filtrado
+    def test_corr_by_group(self):
+        result = corr_by_group(self.df, 'NOC', 'Year', ['Height', 'Weight'])
+
+        self.assertEqual(result['NOC'].tolist(), ['BRA', 'FRA', 'JPN', 'USA'] * 2)
+        for row in result.itertuples():
+            group = self.df[self.df['NOC'] == row.NOC]
+            self.assertAlmostEqual(row.corr, corr_matrix(group, ['Year', row.quanti]).iloc[0, 1])
+
+    # Teste com colunas ausentes
+    def test_missing_columns(self):
+        with self.assertRaises(KeyError):
+            r2_by_group(self.df, 'Event', 'Medal', ['Height'])
+        with self.assertRaises(KeyError):
+            corr_by_group(self.df, 'NOC', 'Year', ['Age'])
+
+
+class TestCategoricalAssociation(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        sports = rng.choice(['Judo', 'Golf', 'Rowing', 'Diving'], 2000)
+        self.df = pd.DataFrame({
+            'Sport': sports,
+            'Event': [f'{sport} {number}' for sport, number in zip(sports, rng.integers(0, 3, 2000))],
+            'Sex': rng.choice(['M', 'F'], 2000),
+            'Medal': rng.choice(['Gold', 'Silver', 'Bronze', None], 2000)
+        })
+
+    # Teste do qui-quadrado e do V de Cramer com a tabela do pd.crosstab
+    def test_matches_crosstab(self):
+        result = categorical_association(self.df, ['Sport', 'Sex', 'Medal']).set_index(['quali_1', 'quali_2'])
+        self.assertEqual(len(result), 6)
+
+        observed = pd.crosstab(self.df['Sport'], self.df['Medal']).to_numpy()
+        expected = observed.sum(axis=1, keepdims=True) * observed.sum(axis=0) / observed.sum()
+        chi2 = ((observed - expected) ** 2 / expected).sum()
+        self.assertAlmostEqual(result.loc[('Sport', 'Medal'), 'chi2'], chi2)
+        self.assertEqual(result.loc[('Sport', 'Medal'), 'dof'], 6)
+        self.assertEqual(result.loc[('Sport', 'Medal'), 'qtd'], self.df['Medal'].notna().sum())
+        self.assertAlmostEqual(result.loc[('Medal', 'Sport'), 'cramers_v'], np.sqrt(chi2 / observed.sum() / 2))
+        self.assertAlmostEqual(cramers_v(self.df, 'Sport', 'Medal'), np.sqrt(chi2 / observed.sum() / 2))
+
+    # Teste do U de Theil: o evento determina o esporte, mas o esporte nao determina o evento
+    def test_theils_u(self):
+        result = categorical_association(self.df, ['Sport', 'Event']).set_index(['quali_1', 'quali_2'])['theils_u']
+        self.assertAlmostEqual(result[('Sport', 'Event')], 1.0)
+        self.assertLess(result[('Event', 'Sport')], 1.0)
+
+    # Teste com colunas ausentes
+    def test_missing_columns(self):
+        with self.assertRaises(KeyError):
+            categorical_association(self.df, ['Sport', 'NOC'])
+
+
+class TestAccumulators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.df = pd.DataFrame({
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing', 'Diving', 'Polo'], 2000),
+            'Year': rng.integers(1896, 2016, 2000).astype(float),
+            'Height': rng.normal(175, 10, 2000),
+            'Weight': rng.normal(70, 10, 2000)
+        })
+        self.df.loc[::37, 'Sport'] = np.nan
+
+    # Teste do R2 calculado com os blocos de um CSV lido em partes
+    def test_r2_csv_chunks(self):
+        path = os.path.join(tempfile.mkdtemp(), 'athletes.csv')
+        self.df.to_csv(path, index=False)
+        for is_sample in [True, False]:
+            accumulator = R2Accumulator('Sport', 'Height', is_sample)
+            for chunk in pd.read_csv(path, chunksize=150):
+                accumulator.update(chunk)
+            self.assertAlmostEqual(accumulator.result(), r2(self.df, 'Sport', 'Height', is_sample))
+
+    # Teste da combinacao de acumuladores de processos diferentes (serializados com pickle)
+    def test_merge(self):
+        columns = ['Year', 'Height', 'Weight']
+        df = self.df.copy()
+        df.loc[::5, 'Height'] = np.nan
+        df.loc[::7, 'Weight'] = np.nan
+
+        r2_parts = [pickle.loads(pickle.dumps(R2Accumulator('Sport', 'Weight').update(part))) for part in [df.iloc[:700], df.iloc[700:1400], df.iloc[1400:]]]
+        corr_parts = [pickle.loads(pickle.dumps(CorrAccumulator(columns).update(part))) for part in [df.iloc[:700], df.iloc[700:1400], df.iloc[1400:]]]
+        for part in r2_parts[1:]:
+            r2_parts[0].merge(part)
+        for part in corr_parts[1:]:
+            corr_parts[0].merge(part)
+
+        self.assertAlmostEqual(r2_parts[0].result(), r2_matrix(df, ['Sport'], ['Weight']).iloc[0, 0])
+        np.testing.assert_allclose(corr_parts[0].result().values, corr_matrix(df, columns).values, atol=1e-12)
+
+    # Teste da combinacao de acumuladores incompativeis e de colunas ausentes
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            R2Accumulator('Sport', 'Height').merge(R2Accumulator('Sport', 'Weight'))
+        with self.assertRaises(ValueError):
+            CorrAccumulator(['Year', 'Height']).merge(CorrAccumulator(['Height', 'Year']))
+        with self.assertRaises(KeyError):
+            R2Accumulator('NOC', 'Height').update(self.df)
+        with self.assertRaises(KeyError):
+            CorrAccumulator(['Year', 'Age']).update(self.df)
+
 
 if __name__ == "__main__":
     unittest.main()
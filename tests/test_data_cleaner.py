@@ -93,6 +93,28 @@ class TestMedalsToInt(unittest.TestCase):
         with self.assertRaises(SystemExit):
             medals_to_int(data)
 
+    # Test the boolean medalist column created by the function
+    def test_is_medalist_column(self):
+        data = pd.DataFrame({'Medal': ['Gold', np.nan, 'Bronze', np.nan]})
+        modified_data = medals_to_int(data)
+
+        self.assertEqual(modified_data['is_medalist'].dtype, bool)
+        self.assertEqual([True, False, True, False], modified_data['is_medalist'].tolist())
+
+
+class TestMedalistMask(unittest.TestCase):
+
+    # Test the mask with the precomputed column
+    def test_uses_is_medalist_column(self):
+        data = pd.DataFrame({'Medal': [0, 3], 'is_medalist': [True, False]})
+        self.assertEqual([True, False], medalist_mask(data).tolist())
+
+    # Test the mask computed from the Medal column, without changing it
+    def test_without_is_medalist_column(self):
+        data = pd.DataFrame({'Medal': [0, 1, 2, 3]})
+        self.assertEqual([False, True, True, True], medalist_mask(data).tolist())
+        self.assertEqual([0, 1, 2, 3], data['Medal'].tolist())
+
             
 class TestUrbanizationRenameCountries(unittest.TestCase):
 
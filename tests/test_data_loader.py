@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import subprocess
+import unittest
+import pandas as pd
+from src.data_loader import *
+
+
+class TestDataLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = os.environ.pop(DATA_ROOT_VARIABLE, None)
+        self.directory = tempfile.mkdtemp()
+        pd.DataFrame({'Name': ['A', 'B'], 'Medal': ['Gold', None]}).to_csv(os.path.join(self.directory, 'athlete_events.csv'), index=False)
+
+    def tearDown(self):
+        os.environ.pop(DATA_ROOT_VARIABLE, None)
+        if self.previous is not None:
+            os.environ[DATA_ROOT_VARIABLE] = self.previous
+
+    # Teste do diretorio padrao e do configurado pela variavel de ambiente
+    def test_data_root(self):
+        self.assertEqual(data_path('gdp', 'gdp.csv'), os.path.join('data', 'gdp', 'gdp.csv'))
+        set_data_root(self.directory)
+        self.assertEqual(data_root(), self.directory)
+        self.assertEqual(os.environ[DATA_ROOT_VARIABLE], self.directory)
+
+    # Teste da leitura dos atletas, com e sem a conversao das medalhas
+    def test_load_athletes(self):
+        set_data_root(self.directory)
+        self.assertEqual(load_athletes()['Medal'].tolist(), [3, 0])
+        self.assertEqual(load_athletes(clean=False)['Medal'].tolist()[0], 'Gold')
+
+        set_data_root(os.path.join(self.directory, 'missing'))
+        with self.assertRaises(FileNotFoundError):
+            load_athletes()
+
+    # Teste se a importacao do main (e de todos os modulos do src que ele usa) nao le nenhum arquivo de dados
+    def test_main_import_without_data(self):
+        code = ('import pandas, geopandas\n'
+                'def fail(*args, **kwargs): raise AssertionError("read at import")\n'
+                'pandas.read_csv = geopandas.read_file = fail\n'
+                'import main')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, env={**os.environ, 'MPLBACKEND': 'Agg', DATA_ROOT_VARIABLE: self.directory},
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.density import *
+from src.chart_spec import ChartSpec, chart
+from src.figures import save_figure
+
+
+class TestDensityGrid(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'Year': rng.choice([2000, 2004, 2008, 2012, 2016], 20000),
+            'Age': rng.normal(25, 5, 20000).round(),
+        })
+        self.df.loc[::10, 'Age'] = np.nan
+
+    # Teste se a grade conta todas as linhas sem NaN, com uma celula por ano e por idade
+    def test_counts(self):
+        grid, xedges, yedges = density_grid(self.df, 'Year', 'Age', bins=[category_edges(self.df['Year']), step_edges(self.df['Age'])])
+
+        self.assertEqual(grid.to_numpy().sum(), self.df['Age'].notna().sum())
+        self.assertEqual(grid.columns.tolist(), [2000.0, 2004.0, 2008.0, 2012.0, 2016.0])
+        self.assertEqual(grid.shape, (len(yedges) - 1, len(xedges) - 1))
+        expected = ((self.df['Year'] == 2008) & (self.df['Age'] == 25)).sum()
+        self.assertEqual(grid.loc[25.0, 2008.0], expected)
+
+    # Teste com DataFrame vazio
+    def test_empty(self):
+        empty = self.df.iloc[:0]
+        grid, _, _ = density_grid(empty, 'Year', 'Age', bins=[category_edges(empty['Year']), step_edges(empty['Age'])])
+
+        self.assertEqual(grid.to_numpy().sum(), 0)
+
+    # Teste se o grafico de densidade tem o tamanho independente da quantidade de linhas
+    def test_density_chart(self):
+        output_dir = tempfile.mkdtemp()
+        sizes = []
+        for rows in [2000, 20000]:
+            df = self.df.iloc[:rows]
+            grid, xedges, yedges = density_grid(df, 'Year', 'Age', bins=[category_edges(df['Year']), step_edges(df['Age'])])
+            spec = ChartSpec(f'idade_{rows}', 'density', title='Idade',
+                             options={'xedges': xedges.tolist(), 'yedges': yedges.tolist(), 'norm': 'log', 'rasterized': True, 'colorbar': 'Atletas'})
+            fig = chart(spec, grid)
+
+            self.assertEqual(len(fig.axes), 2)
+            path = save_figure(fig, os.path.join(output_dir, f'idade_{rows}.svg'))
+            sizes.append(os.path.getsize(path))
+
+        self.assertLess(abs(sizes[1] - sizes[0]) / sizes[0], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import gc
+import os
+import tempfile
+import unittest
+import weakref
+import matplotlib.pyplot as plt
+from src.figures import *
+
+
+class TestFigureLifecycle(unittest.TestCase):
+
+    # Teste se as figuras criadas nao ficam registradas no pyplot
+    def test_create_figure_is_not_global(self):
+        plt.close('all')
+        fig, axes = create_figure(1, 2, figsize=(6, 3), sharey=True)
+
+        self.assertEqual(plt.get_fignums(), [])
+        self.assertEqual(len(axes), 2)
+
+    # Teste se a figura salva e liberada, mesmo em execucoes longas
+    def test_save_figure_releases_figures(self):
+        output_dir = tempfile.mkdtemp()
+        references = []
+        for i in range(50):
+            fig, ax = create_figure()
+            ax.plot([0, i])
+            save_figure(fig, os.path.join(output_dir, 'sub', f'{i}.png'), dpi=10)
+            references.append(weakref.ref(fig))
+            del fig, ax
+        gc.collect()
+
+        self.assertEqual(len(os.listdir(os.path.join(output_dir, 'sub'))), 50)
+        self.assertTrue(all(reference() is None for reference in references))
+
+    # Teste com figura criada pelo pyplot
+    def test_save_pyplot_figure(self):
+        fig = plt.figure()
+        save_figure(fig, os.path.join(tempfile.mkdtemp(), 'figure.png'), dpi=10)
+
+        self.assertNotIn(fig.number, plt.get_fignums())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.group_statistics import *
+
+
+class TestGroupedStatistics(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing'], 200),
+            'Sex': rng.choice(['M', 'F'], 200),
+            'Height': np.where(rng.random(200) < 0.2, np.nan, rng.normal(175, 10, 200)),
+        })
+
+    # Teste comparando com as estatisticas calculadas pelo pandas
+    def test_matches_pandas(self):
+        stats = grouped_statistics(self.df, ['Sport', 'Sex'], 'Height')
+        grouped = self.df.groupby(['Sport', 'Sex'])['Height']
+
+        pd.testing.assert_series_equal(stats['q1'], grouped.quantile(0.25), check_names=False)
+        pd.testing.assert_series_equal(stats['median'], grouped.median(), check_names=False)
+        pd.testing.assert_series_equal(stats['q3'], grouped.quantile(0.75), check_names=False)
+        pd.testing.assert_series_equal(stats['mean'], grouped.mean(), check_names=False)
+        pd.testing.assert_series_equal(stats['std'], grouped.std(), check_names=False)
+        pd.testing.assert_series_equal(stats['min'], grouped.min(), check_names=False)
+        self.assertEqual(stats['count'].tolist(), grouped.count().tolist())
+
+    # Teste com um grupo de um unico valor
+    def test_single_value_group(self):
+        df = pd.DataFrame({'Sport': ['Golf', 'Judo', 'Judo'], 'Age': [40, 20, 30]})
+        stats = grouped_statistics(df, 'Sport', 'Age')
+
+        self.assertEqual(stats.loc['Golf', 'median'], 40)
+        self.assertTrue(np.isnan(stats.loc['Golf', 'std']))
+        self.assertEqual(stats.loc['Judo', 'upper_fence'], 27.5 + 1.5 * 5)
+
+    # Teste com chaves NaN, ignoradas como no groupby do pandas
+    def test_nan_keys(self):
+        df = pd.DataFrame({'Sport': ['A', 'A', None, 'B', 'B'], 'Age': [20, 22, 90, 30, 31]})
+        stats = grouped_statistics(df, 'Sport', 'Age')
+
+        self.assertEqual(stats['count'].to_dict(), {'A': 2, 'B': 2})
+        self.assertEqual(stats['max'].tolist(), [22, 31])
+        counts, mask = iqr_outliers(df, 'Sport', 'Age')
+        self.assertEqual((counts.to_dict(), mask.tolist()), ({'A': 0, 'B': 0}, [False] * 5))
+
+    # Teste com DataFrame vazio
+    def test_empty_dataframe(self):
+        stats = grouped_statistics(pd.DataFrame(columns=['Sport', 'Age']), 'Sport', 'Age')
+
+        self.assertTrue(stats.empty)
+        self.assertEqual(stats.columns.tolist(), STATISTICS_COLUMNS)
+
+    # Teste com coluna ausente
+    def test_missing_column(self):
+        with self.assertRaises(KeyError):
+            grouped_statistics(self.df, 'Sport', 'Age')
+
+
+class TestIqrOutliers(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Sport': ['Judo'] * 5 + ['Golf'] * 5,
+            'Sex': ['M', 'F'] * 5,
+            'Age': [20, 21, 22, 23, 60, 40, 41, 42, np.nan, 10]
+        })
+
+    # Teste das contagens e da mascara por linha
+    def test_counts_and_mask(self):
+        counts, mask = iqr_outliers(self.df, 'Sport', 'Age')
+
+        self.assertEqual(counts.to_dict(), {'Golf': 1, 'Judo': 1})
+        self.assertEqual(self.df.loc[mask, 'Age'].tolist(), [60, 10])
+        self.assertTrue(mask.index.equals(self.df.index))
+
+    # Teste comparando com o calculo feito grupo a grupo
+    def test_matches_loop(self):
+        counts, _ = iqr_outliers(self.df, ['Sport', 'Sex'], 'Age')
+        for (sport, sex), group in self.df.groupby(['Sport', 'Sex']):
+            idade = group['Age']
+            q1, q3 = idade.quantile(0.25), idade.quantile(0.75)
+            esperado = ((idade < q1 - 1.5 * (q3 - q1)) | (idade > q3 + 1.5 * (q3 - q1))).sum()
+            self.assertEqual(counts[(sport, sex)], esperado)
+
+    # Teste do ranking dos grupos com mais outliers
+    def test_top_groups(self):
+        counts = pd.Series({'Boxing': 2, 'Golf': 0, 'Soccer': 3, 'Tennis': 2})
+
+        self.assertEqual(top_groups(counts, 2), ['Soccer', 'Boxing'])
+        self.assertEqual(top_groups(counts, 10), ['Soccer', 'Boxing', 'Tennis'])
+
+
+if __name__ == "__main__":
+    unittest.main()
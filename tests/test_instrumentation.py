@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+import pandas as pd
+from src.instrumentation import *
+
+
+def filter_medalists(df: pd.DataFrame) -> pd.DataFrame:
+    return df[df['Medal'] > 0]
+
+
+def count_medalists(df: pd.DataFrame) -> int:
+    return len(filter_medalists(df))
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({'Medal': [0, 1, 2, 0, 3]})
+        self.profiler = Profiler()
+
+    # Teste das linhas de entrada e de saida e das etapas aninhadas de um modulo instrumentado
+    def test_instrument_module(self):
+        module = types.ModuleType('analise')
+        module.filter_medalists = filter_medalists
+        module.count_medalists = count_medalists
+        filter_medalists.__module__ = count_medalists.__module__ = 'analise'
+        try:
+            names = instrument_module(module, self.profiler)
+            self.assertEqual(sorted(names), ['count_medalists', 'filter_medalists'])
+            self.assertEqual(instrument_module(module, self.profiler), [])
+
+            self.assertEqual(module.count_medalists(self.df), 3)
+        finally:
+            filter_medalists.__module__ = count_medalists.__module__ = __name__
+
+        records = self.profiler.records()
+        self.assertEqual(records['name'].tolist(), ['analise.count_medalists'])
+        self.assertEqual(records.loc[0, 'rows_in'], 5)
+        self.assertIsNone(records.loc[0, 'rows_out'])
+
+        # Chamada direta da outra funcao instrumentada, com as linhas de saida
+        module.filter_medalists(self.df)
+        last = self.profiler.records().iloc[-1]
+        self.assertEqual((last['name'], last['rows_in'], last['rows_out']), ('analise.filter_medalists', 5, 3))
+
+    # Teste se os modulos do src carregados sao instrumentados sem quebrar as funcoes
+    def test_instrument_package(self):
+        from src import group_statistics
+        directory = os.path.dirname(group_statistics.__file__)
+        original = group_statistics.grouped_statistics
+        try:
+            modules = instrument_package(directory, self.profiler)
+            self.assertIn('src.group_statistics', modules)
+            self.assertNotIn('src.instrumentation', modules)
+
+            df = pd.DataFrame({'Sport': ['Judo', 'Judo', 'Golf'], 'Age': [20, 22, 40]})
+            stats = group_statistics.grouped_statistics(df, 'Sport', 'Age')
+            self.assertEqual(stats.loc['Judo', 'median'], 21)
+            self.assertIn('group_statistics.grouped_statistics', self.profiler.records()['name'].tolist())
+        finally:
+            # Desfaz a instrumentacao, para nao afetar os outros testes
+            for module in list(sys.modules.values()):
+                if os.path.dirname(os.path.abspath(getattr(module, '__file__', None) or '')) == directory:
+                    for name, value in list(vars(module).items()):
+                        if getattr(value, '__instrumented__', False):
+                            setattr(module, name, value.__wrapped__)
+        self.assertIs(group_statistics.grouped_statistics, original)
+
+    # Teste do trace JSON e do perfil folded
+    def test_exports(self):
+        with self.profiler.stage('main'):
+            with self.profiler.stage('load', rows_in=5) as info:
+                info['rows_out'] = 3
+            with self.profiler.stage('save'):
+                pass
+
+        trace_path, folded_path = self.profiler.save(tempfile.mkdtemp())
+        with open(trace_path) as file:
+            events = json.load(file)['traceEvents']
+        self.assertEqual([event['name'] for event in events], ['load', 'save', 'main'])
+        self.assertEqual(events[0]['args']['rows_out'], 3)
+
+        with open(folded_path) as file:
+            stacks = [line.split(' ')[0] for line in file.read().splitlines()]
+        self.assertEqual(stacks, ['main', 'main;load', 'main;save'])
+
+        summary = self.profiler.summary()
+        self.assertEqual(summary.loc['load', 'rows_in'], 5)
+        self.assertGreaterEqual(summary.loc['main', 'wall_seconds'], summary.loc['load', 'wall_seconds'])
+
+
+if __name__ == "__main__":
+    unittest.main()
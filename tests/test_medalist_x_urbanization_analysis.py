@@ -1,8 +1,14 @@
+import os
+import tempfile
 import unittest
 import pandas as pd
 from src.medalist_x_urbanization_analysis import *
+from src.checkpoint import CheckpointWriter
 from matplotlib import pyplot as plt
 
+# Cache das geometrias em uma pasta temporaria, para os testes nao escreverem no diretorio dos dados
+CACHE_DIR = tempfile.mkdtemp()
+
 
 class TestMedalistUrbanizationAnalysis(unittest.TestCase):
 
@@ -43,6 +49,13 @@ class TestMedalistUrbanizationAnalysis(unittest.TestCase):
         self.assertAlmostEqual(usa_row['Urban_Pop_Absolute'], 261119999.99999997)
         self.assertAlmostEqual(usa_row['Urban_Medalist_Density'], 1 / (261119999.99999997))
 
+    def test_does_not_modify_athletes_df(self):
+        prepare_2016_medalist_urbanization_analysis(self.athletes_df, self.urbanization_df, self.noc_df)
+        prepare_map_visualization_data(self.athletes_df.assign(Event='100m', Team='Team', Games='2016 Summer', Season='Summer', City='Rio', Sport='Athletics'), self.urbanization_df, self.noc_df)
+
+        # The medal types must be kept for the later stages of the analysis
+        self.assertEqual(self.athletes_df['Medal'].tolist(), [1, 2, 0, 3])
+
 
 class TestCreateScatterplot2016MedalistUrbanization(unittest.TestCase):
 
@@ -57,8 +70,15 @@ class TestCreateScatterplot2016MedalistUrbanization(unittest.TestCase):
     def test_create_scatterplot_2016_medalist_urbanization(self):
         scatterplot = create_scatterplot_2016_medalist_urbanization(self.data_2016)
         
-        # Check if the result is a matplotlib Axes object
-        self.assertIsInstance(scatterplot, plt.Axes)
+        # Check if the result is a matplotlib Figure object
+        self.assertEqual(scatterplot.__class__.__name__, "Figure")
+
+    def test_countries_are_annotated_once(self):
+        scatterplot = create_scatterplot_2016_medalist_urbanization(self.data_2016)
+        labels = [text.get_text() for text in scatterplot.axes[0].texts]
+
+        # Both countries are in every ranking, but each is labeled only once
+        self.assertEqual(sorted(labels), ['Brazil', 'United States'])
 
 
 class TestPrepareMapVisualizationData(unittest.TestCase):
@@ -96,6 +116,14 @@ class TestPrepareMapVisualizationData(unittest.TestCase):
         expected_columns = ['Year', 'NOC', 'Medal', 'Country', 'Pop_Absolute', 'Urban_Pop_Percent']
         self.assertTrue(all(column in result.columns for column in expected_columns))
 
+    def test_prepare_map_visualization_data_checkpoints(self):
+        directory = tempfile.mkdtemp()
+        with CheckpointWriter(directory) as writer:
+            prepare_map_visualization_data(self.athletes_df, self.urbanization_df, self.noc_df, writer)
+
+        # Check if the checkpoints were written only to the given directory
+        self.assertEqual(sorted(os.listdir(directory)), ['athletes_agregados.pkl', 'map_visualization_data_checkpoint.pkl'])
+
 
 class TestCalculateDynamicGrowth(unittest.TestCase):
 
@@ -130,10 +158,20 @@ class TestCreateMapVisualization(unittest.TestCase):
         })
 
     def test_create_map_visualization(self):
-        map_visualization = create_map_visualization(self.data)
+        map_visualization = create_map_visualization(self.data, cache_dir=CACHE_DIR)
         
         # Check if the result is a matplotlib Figure object
-        self.assertEqual(map_visualization.__class__.__name__, "module")
+        self.assertEqual(map_visualization.__class__.__name__, "Figure")
+
+
+class TestFindMismatchedCountries(unittest.TestCase):
+
+    def test_find_mismatched_countries(self):
+        data = pd.DataFrame({'Country': ['Brazil', 'Singapore', 'Brazil', 'Atlantis']})
+        result = find_mismatched_countries(data, cache_dir=CACHE_DIR)
+
+        # Singapore is not in the GeoPandas world dataset
+        self.assertEqual(result['Country'].tolist(), ['Singapore', 'Atlantis'])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,127 @@
+import os
+import sys
+import unittest
+import subprocess
+import numpy as np
+import pandas as pd
+from src.physical_attributes_analysis import *
+from src.render_pool import FigureSpec
+from src.chart_spec import FrameCache, attach_cache
+from matplotlib import pyplot as plt
+
+
+class TestImport(unittest.TestCase):
+
+    # Teste se a importacao do modulo nao le nenhum arquivo de dados
+    def test_import_without_data(self):
+        code = ('import pandas\n'
+                'def fail(*args, **kwargs): raise AssertionError("read at import")\n'
+                'pandas.read_csv = fail\n'
+                'import src.physical_attributes_analysis')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, env={**os.environ, 'MPLBACKEND': 'Agg', 'DATA_ROOT': '/nonexistent'},
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class TestFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = pd.DataFrame({
+            'Sport': ['Judo', 'Judo', 'Golf', 'Golf', 'Boxing', 'Volleyball', 'Volleyball', 'Volleyball'],
+            'NOC': ['BRA', 'USA', 'BRA', 'BRA', 'USA', 'BRA', 'BRA', 'BRA'],
+            'Sex': ['M'] * 8,
+            'Age': [20, 21, np.nan, 30, 25, 22, 23, np.nan],
+            'Height': [170, np.nan, 180, np.nan, 175, 190, 195, 192],
+            'Weight': [70, 80, 80, np.nan, 75, 85, 90, 88],
+            'Medal': [3, 0, 0, 1, 2, 3, 3, 0]
+        })
+        self.df = self.raw.fillna(0)
+
+    # Teste da ordem de completude dos esportes
+    def test_sports_completeness(self):
+        completeness = sports_completeness(self.raw)
+        self.assertEqual(completeness.index.tolist(), ['Boxing', 'Volleyball', 'Judo', 'Golf'])
+        self.assertAlmostEqual(completeness['Golf'], 0.625)
+
+    # Teste dos tres filtros, recalculados apos alteracoes no df
+    def test_get_filters(self):
+        top_complete, top_category, top_brasil = get_filters(self.df, self.raw)
+
+        self.assertEqual(top_complete, ['Boxing', 'Volleyball', 'Judo', 'Golf'])
+        # Um esporte por categoria (combate, precisao e rede/parede), o mais completo de cada
+        self.assertEqual(top_category, ['Boxing', 'Golf', 'Volleyball'])
+        self.assertEqual(top_brasil, ['Volleyball', 'Golf', 'Judo'])
+        self.df.loc[self.df['Sport'] == 'Boxing', 'NOC'] = 'BRA'
+        self.assertEqual(get_filters(self.df, self.raw)[2], ['Volleyball', 'Golf', 'Boxing', 'Judo'])
+        # Sem os dados brutos, a completude e calculada no proprio df (todos completos)
+        self.assertEqual(get_filters(self.df)[0], ['Boxing', 'Golf', 'Judo', 'Volleyball'])
+
+
+class TestAssociations(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.df = pd.DataFrame({
+            'Sport': rng.choice(['Judo', 'Boxing', 'Volleyball', 'Football'], 800),
+            'NOC': rng.choice(['BRA', 'USA'], 800),
+            'Medal': rng.choice([0, 1, 2, 3], 800),
+            'Year': rng.integers(1960, 2016, 800),
+            'Age': rng.normal(25, 4, 800),
+            'Height': rng.normal(180, 10, 800),
+            'Weight': rng.normal(75, 10, 800)
+        })
+
+    # Teste da tabela de R2 dos filtros, com a coluna das categorias dos esportes
+    def test_attributes_r2_table(self):
+        table = attributes_r2_table(self.df, {'lutas': ['Judo', 'Boxing'], 'todos': ['Judo', 'Boxing', 'Volleyball', 'Football']})
+        fights = self.df[self.df['Sport'].isin(['Judo', 'Boxing'])]
+
+        self.assertEqual(table.index.tolist(), [('lutas', 'Sport'), ('lutas', 'sport_class'), ('todos', 'Sport'), ('todos', 'sport_class')])
+        self.assertAlmostEqual(table.loc[('lutas', 'Sport'), 'Height'], r2(fights, 'Sport', 'Height', False))
+        # Judo e Boxe sao da mesma categoria (combate)
+        self.assertAlmostEqual(table.loc[('lutas', 'sport_class'), 'Height'], 0)
+
+    # Teste do R2 entre medalha e atributos no geral e por pais
+    def test_medal_attributes_r2(self):
+        result = medal_attributes_r2(self.df, ['Judo', 'Volleyball'])
+        judo_brasil = self.df[(self.df['Sport'] == 'Judo') & (self.df['NOC'] == 'BRA')]
+        row = result[(result['NOC'] == 'BRA') & (result['Sport'] == 'Judo') & (result['quanti'] == 'Weight')].iloc[0]
+
+        self.assertEqual(sorted(result['NOC'].unique()), ['BRA', 'Geral', 'USA'])
+        self.assertAlmostEqual(row['r2'], r2(judo_brasil, 'Medal', 'Weight', False))
+
+    # Teste da correlacao do ano com os atributos, no geral e no Brasil
+    def test_attributes_year_corr(self):
+        result = attributes_year_corr(self.df)
+        self.assertEqual(result.index.tolist(), ['Geral', 'Brasil'])
+        self.assertAlmostEqual(result.loc['Brasil', 'Age'], corr(self.df[self.df['NOC'] == 'BRA'], 'Year', 'Age'))
+
+
+
+class TestYearsFigures(unittest.TestCase):
+
+    # Teste dos graficos de dispersao com o cache adicionado como no main.py --chart-cache
+    def test_figures_with_chart_cache(self):
+        rng = np.random.default_rng(6)
+        df = pd.DataFrame({
+            'NOC': rng.choice(['BRA', 'USA'], 200),
+            'Year': rng.integers(1960, 2016, 200),
+            'Age': rng.integers(18, 40, 200),
+            'Height': rng.integers(150, 200, 200),
+            'Weight': rng.integers(50, 100, 200)
+        })
+        cache = FrameCache()
+        for density in [True, False]:
+            specs = attach_cache([FigureSpec(function, path, args, kwargs) for path, function, args, kwargs in attributes_years_figures(df, density)], cache)
+            self.assertEqual(len(specs), 6)
+            for spec in specs:
+                fig = spec.function(*spec.args, **spec.kwargs)
+                plt.close(fig)
+
+        self.assertIn('Height_ano_brasil', cache)
+        self.assertEqual(cache.get_spec('Height_ano').kind, 'scatter')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+from src.quantile_sketch import *
+from src.group_statistics import grouped_statistics
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(0).normal(25, 5, 50000)
+
+    def rank_error(self, sketch, q):
+        estimate = sketch.quantile(q)
+        return np.abs(np.searchsorted(np.sort(self.values), estimate) / len(self.values) - q).max()
+
+    # Teste com poucos valores, em que o sketch ainda e exato
+    def test_exact_while_small(self):
+        sketch = QuantileSketch()
+        sketch.update(self.values[:150])
+
+        self.assertTrue(sketch.is_exact)
+        np.testing.assert_allclose(sketch.quantile([0.1, 0.5, 0.9]), np.quantile(self.values[:150], [0.1, 0.5, 0.9]))
+
+    # Teste do erro de rank com muitos valores
+    def test_bounded_rank_error(self):
+        sketch = QuantileSketch(k=200, seed=0)
+        for chunk in np.array_split(self.values, 20):
+            sketch.update(chunk)
+
+        self.assertFalse(sketch.is_exact)
+        self.assertLess(self.rank_error(sketch, np.linspace(0.01, 0.99, 99)), 1.7 / 200)
+        self.assertLess(sum(len(level) for level in sketch.levels), 1000)
+
+    # Teste da combinação de sketches de blocos diferentes
+    def test_merge(self):
+        left, right = QuantileSketch(seed=0), QuantileSketch(seed=1)
+        left.update(self.values[:20000])
+        right.update(self.values[20000:])
+        left.merge(pickle.loads(pickle.dumps(right)))
+
+        self.assertEqual(left.count, len(self.values))
+        self.assertAlmostEqual(left.mean, self.values.mean())
+        self.assertAlmostEqual(left.var, self.values.var(ddof=1))
+        self.assertEqual(left.min, self.values.min())
+        self.assertLess(self.rank_error(left, np.linspace(0.01, 0.99, 99)), 1.7 / 200)
+
+    # Teste com NaN e sketch vazio
+    def test_nan_and_empty(self):
+        sketch = QuantileSketch()
+        sketch.update([np.nan])
+
+        self.assertEqual(sketch.count, 0)
+        self.assertTrue(np.isnan(sketch.quantile(0.5)))
+        self.assertTrue(np.isnan(sketch.statistics()['std']))
+
+
+class TestGroupedQuantileSketch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing'], 300),
+            'Sex': rng.choice(['M', 'F'], 300),
+            'Year': rng.choice([2012, 2016], 300),
+            'Age': np.where(rng.random(300) < 0.1, np.nan, rng.integers(15, 40, 300)),
+        })
+
+    # Teste comparando com as estatisticas exatas
+    def test_matches_grouped_statistics(self):
+        sketches = sketch_frame(self.df, values=['Age'], chunksize=50)['Age']
+        expected = grouped_statistics(self.df, ['Sport', 'Sex', 'Year'], 'Age')
+
+        pd.testing.assert_frame_equal(sketches.statistics(), expected, check_dtype=False, check_names=False)
+
+    # Teste do agrupamento em grupos mais amplos
+    def test_rollup(self):
+        sketches = sketch_frame(self.df, values=['Age'])['Age'].rollup(['Sport'])
+        expected = grouped_statistics(self.df, 'Sport', 'Age')
+
+        pd.testing.assert_series_equal(sketches.statistics()['median'], expected['median'], check_names=False)
+        self.assertEqual(sketches.outlier_counts().tolist(), [0, 0, 0])
+
+    # Teste da combinação de conjuntos com colunas diferentes
+    def test_merge_different_groups(self):
+        with self.assertRaises(ValueError):
+            GroupedQuantileSketch(['Sport']).merge(GroupedQuantileSketch(['Sex']))
+
+
+if __name__ == "__main__":
+    unittest.main()
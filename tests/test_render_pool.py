@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import matplotlib.pyplot as plt
+from src.render_pool import *
+
+
+def create_line_figure(values: list):
+    fig, ax = plt.subplots()
+    ax.plot(values)
+    return fig
+
+
+def create_pyplot_figure(values: list):
+    plt.figure()
+    plt.plot(values)
+    return plt
+
+
+class TestRenderFigures(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def specs(self, inline: bool = False) -> list:
+        return [
+            FigureSpec(create_line_figure, os.path.join(self.output_dir, 'line.png'), ([1, 2, 3],), savefig={'dpi': 20}),
+            FigureSpec(create_pyplot_figure, os.path.join(self.output_dir, 'sub', 'pyplot.png'), ([3, 2, 1],), savefig={'dpi': 20}, inline=inline),
+        ]
+
+    # Teste da renderizacao em um pool de processos
+    def test_render_in_pool(self):
+        report = render_figures(self.specs(inline=True), max_workers=2)
+
+        self.assertEqual(report['path'].tolist(), [spec.path for spec in self.specs()])
+        self.assertTrue(all(os.path.exists(path) for path in report['path']))
+        self.assertEqual(report.loc[1, 'worker'], os.getpid())
+        self.assertNotEqual(report.loc[0, 'worker'], os.getpid())
+
+    # Teste da renderizacao no proprio processo, fechando as figuras
+    def test_render_serial_closes_figures(self):
+        plt.close('all')
+        report = render_figures(self.specs(), max_workers=1)
+
+        self.assertEqual(plt.get_fignums(), [])
+        self.assertTrue((report['total_seconds'] >= report['save_seconds']).all())
+        self.assertIn('2 figures', format_timing_report(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.sport_taxonomy import *
+
+
+class TestSportTaxonomy(unittest.TestCase):
+
+    def setUp(self):
+        self.taxonomy = load_taxonomy()
+        self.sports = pd.Series(['Judo', 'Ice Hockey', 'Cricket', None, 'Golf', 'Judo'], index=[10, 11, 12, 13, 14, 15])
+
+    # Teste da tabela de taxonomia do diretorio data
+    def test_load_taxonomy(self):
+        self.assertEqual(self.taxonomy.columns.tolist(), ['sport_class', 'season'])
+        self.assertTrue(self.taxonomy.index.is_unique)
+        self.assertEqual(self.taxonomy['sport_class'].nunique(), 7)
+        self.assertEqual(self.taxonomy.loc['Ice Hockey'].tolist(), ['invasao', 'Winter'])
+
+    # Teste se a classificacao e igual ao map das linhas, com colunas de texto ou categoricas
+    def test_classify(self):
+        expected = self.sports.map(self.taxonomy['sport_class'])
+        for sports in [self.sports, self.sports.astype('category')]:
+            result = classify(sports)
+            self.assertEqual(result.columns.tolist(), ['sport_class', 'season'])
+            self.assertTrue(result.index.equals(self.sports.index))
+            pd.testing.assert_series_equal(result['sport_class'].astype(object), expected, check_names=False)
+
+        self.assertEqual(classify(self.sports, ['season'])['season'].tolist(), ['Summer', 'Winter', np.nan, np.nan, 'Summer', 'Summer'])
+
+    # Teste da adicao das colunas ao DataFrame, com uma taxonomia propria
+    def test_with_taxonomy(self):
+        taxonomy = pd.DataFrame({'team': ['individual', 'coletivo']}, index=pd.Index(['Judo', 'Ice Hockey'], name='Sport'))
+        df = with_taxonomy(pd.DataFrame({'Sport': self.sports}), taxonomy=taxonomy)
+
+        self.assertEqual(df.columns.tolist(), ['Sport', 'team'])
+        self.assertEqual(df.groupby('team', observed=True).size().to_dict(), {'individual': 2, 'coletivo': 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
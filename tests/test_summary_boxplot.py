@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+import pandas as pd
+from matplotlib import cbook
+from src.summary_boxplot import *
+from src.group_statistics import grouped_statistics
+
+
+class TestGroupedBoxSummaries(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'Sport': rng.choice(['Judo', 'Golf', 'Rowing'], 600),
+            'Age': np.where(rng.random(600) < 0.1, np.nan, np.round(rng.gamma(3, 5, 600))),
+        })
+
+    # Teste comparando com os resumos calculados pelo matplotlib a partir das linhas
+    def test_matches_matplotlib(self):
+        summaries = grouped_box_summaries(self.df, 'Sport', 'Age')
+
+        for summary in summaries:
+            ages = self.df.loc[self.df['Sport'] == summary['label'], 'Age'].dropna().to_numpy()
+            expected = cbook.boxplot_stats(ages)[0]
+            for key in ['med', 'q1', 'q3', 'whislo', 'whishi', 'mean']:
+                self.assertAlmostEqual(summary[key], expected[key])
+            self.assertEqual(sorted(summary['fliers']), sorted(expected['fliers']))
+
+    # Teste da ordem e dos rotulos dos grupos
+    def test_order_and_labels(self):
+        summaries = grouped_box_summaries(self.df, 'Sport', 'Age', order=['Rowing', 'Atlantis', 'Judo'], labels={'Judo': 'Judô'})
+
+        self.assertEqual([summary['label'] for summary in summaries], ['Rowing', 'Judô'])
+
+    # Teste do desenho a partir dos resumos
+    def test_summary_boxplot(self):
+        fig, ax = plt.subplots()
+        summary_boxplot(box_summaries(grouped_statistics(self.df, 'Sport', 'Age')), ax=ax)
+        labels = [label.get_text() for label in ax.get_xticklabels()]
+        plt.close(fig)
+
+        self.assertEqual(labels, ['Golf', 'Judo', 'Rowing'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,7 +24,7 @@ class CreateScatterplot:
         
         plot = plot_scatter_graph(df_example, 'Year', 'F_Medal', 'M_Medal', 'Scatter Plot: Men\'s Score X Women\'s Paralympic Score (Brazil)', 'Score')
         
-        self.assertEqual(plot.__class__.__name__, "module")
+        self.assertEqual(plot.__class__.__name__, "Figure")
 
 
 if __name__ == "__main__":
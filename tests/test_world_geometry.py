@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from src.world_geometry import *
+from src.world_geometry import _read_cache
+
+
+class TestLoadWorldGeometry(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    # Teste se as geometrias são indexadas pelo nome do país
+    def test_indexed_by_country_name(self):
+        world = build_world_geometry()
+
+        self.assertEqual(world.index.name, 'NAME')
+        self.assertIn('Brazil', world.index)
+        self.assertEqual(world.columns.tolist(), ['geometry'])
+
+    # Teste se o cache em disco reproduz as geometrias do shapefile
+    def test_disk_cache_roundtrip(self):
+        world = build_world_geometry(tolerance=0.5)
+        load_world_geometry(tolerance=0.5, cache_dir=self.cache_dir)
+        cached = _read_cache(world_cache_path(self.cache_dir, None, 0.5), world_shapefile())
+
+        self.assertTrue(cached.index.equals(world.index))
+        self.assertTrue(cached.geometry.geom_equals_exact(world.geometry, tolerance=0).all())
+
+    # Teste se o cache em memória retorna o mesmo objeto
+    def test_memory_cache(self):
+        first = load_world_geometry(tolerance=0.25, cache_dir=self.cache_dir)
+        second = load_world_geometry(tolerance=0.25, cache_dir=self.cache_dir)
+
+        self.assertIs(first, second)
+
+    # Teste se o shapefile e o cache padrão ficam no diretório dos dados (DATA_ROOT)
+    def test_default_cache_dir(self):
+        shapefile = os.path.abspath(world_shapefile())
+        previous = os.environ.get('DATA_ROOT')
+        os.environ['DATA_ROOT'] = self.cache_dir
+        try:
+            self.assertEqual(world_cache_dir(), os.path.join(self.cache_dir, WORLD_CACHE_DIR))
+            self.assertEqual(world_shapefile(), os.path.join(self.cache_dir, WORLD_SHAPEFILE))
+            load_world_geometry(shapefile, tolerance=0.75)
+        finally:
+            os.environ.pop('DATA_ROOT')
+            if previous is not None:
+                os.environ['DATA_ROOT'] = previous
+
+        self.assertTrue(os.listdir(os.path.join(self.cache_dir, WORLD_CACHE_DIR)))
+
+    # Teste da reprojeção das geometrias
+    def test_projection(self):
+        world = build_world_geometry(crs='EPSG:3857')
+
+        self.assertEqual(world.crs.to_epsg(), 3857)
+
+
+if __name__ == "__main__":
+    unittest.main()